@@ -4,35 +4,146 @@ Calibration routine for VL53L0X sensors using software offset correction.
 The VL53L0X Adafruit library does not support writing to the hardware offset
 register at runtime. Instead, this module measures the sensor error against a
 known reference distance and saves a software offset that is applied to every
-reading via get_calibrated_reading().
+reading via get_calibrated_reading().  Offsets are kept in the shared
+calibration store (calibration_store.get_store()).
 """
+import contextlib
+import json
 import logging
+import math
+import statistics
 import time
 import config
-import pprint
-from hardware import get_sensor_value
+from calibration_store import get_store
+from hardware import get_sensor_value, continuous_ranging
 
 _log = logging.getLogger(__name__)
 
+# The calibration sampler reads both distance sensors in the same pass and
+# stops sampling a sensor once the standard error of its robust mean is below
+# CALIBRATION_SEM_MM (after at least CALIBRATION_MIN_SAMPLES readings), or
+# after CALIBRATION_SAMPLES readings at most.  Readings further than
+# CALIBRATION_OUTLIER_MADS scaled MADs from the median are rejected.
+#
+# At the default 33 ms timing budget a VL53L0X at the retracted position has
+# a standard deviation of roughly 1.5-2 mm, so a 0.5 mm SEM takes about
+# (σ / SEM)² = 9-16 readings, well inside CALIBRATION_SAMPLES.  It gives a
+# 95 % confidence interval of about ±1 mm, half the ±2 mm move tolerance.
+# Noisier sensors run to CALIBRATION_SAMPLES and store a wider interval.
 CALIBRATION_SAMPLES = 30
-SAMPLE_DELAY = 0.1
+CALIBRATION_MIN_SAMPLES = 8
+CALIBRATION_SEM_MM = 0.5
+CALIBRATION_OUTLIER_MADS = 3.0
+CALIBRATION_MIN_SPREAD_MM = 1.0  # floor for the scaled MAD (integer-mm readings)
+CALIBRATION_CI_Z = 1.96          # 95 % confidence interval
+SAMPLE_DELAY = 0.035             # about one VL53L0X timing budget
+CALIBRATION_TIMEOUT = 5.0        # s, give up on sensors that stop answering
 
 # KNOWN_DISTANCE_MM is the true distance from the sensor face to the target
 # during calibration. Set to 0 when calibrating at the fully retracted position
 # (sensor reads its resting distance naturally; offset corrects that to zero).
 KNOWN_DISTANCE_MM = 0
 
-def _read_raw_average(sensors, sensor_key, num_samples=CALIBRATION_SAMPLES):
-	"""Take multiple readings and return (average, list_of_samples)."""
-	readings = []
-	for i in range(num_samples):
-		reading = get_sensor_value(sensors, sensor_key)
-		readings.append(reading)
-		print(f"  Sample {i + 1}/{num_samples}: {reading} mm")
-		time.sleep(SAMPLE_DELAY)
-	average = sum(readings) / len(readings)
-	print(f"  Average raw reading: {average:.2f} mm")
-	return average, readings
+
+def _robust_stats(readings):
+	"""
+	Median/MAD outlier rejection followed by the mean of the inliers.
+
+	Returns a dict with mean_mm, median_mm, sem_mm (standard error of the
+	mean of the inliers), inliers and rejected.
+	"""
+	median = statistics.median(readings)
+	mad = statistics.median(abs(r - median) for r in readings)
+	spread = max(1.4826 * mad, CALIBRATION_MIN_SPREAD_MM)
+	inliers = [r for r in readings if abs(r - median) <= CALIBRATION_OUTLIER_MADS * spread]
+	mean = sum(inliers) / len(inliers)
+	if len(inliers) > 1:
+		sem = statistics.stdev(inliers) / math.sqrt(len(inliers))
+	else:
+		sem = float("inf")
+	return {
+		"mean_mm": mean,
+		"median_mm": median,
+		"sem_mm": sem,
+		"inliers": len(inliers),
+		"rejected": len(readings) - len(inliers),
+	}
+
+
+def _new_readings(sensors, sensor_key, since):
+	"""
+	Readings of sensor_key taken after `since`, and the new `since`.
+
+	With a running SensorSampler only its fresh samples are used, so a cached
+	value is never counted twice; otherwise the sensor is read directly.
+	"""
+	sampler = sensors.get(config.SENSOR_SAMPLER)
+	if sampler is not None and getattr(sampler, "running", False):
+		samples = sampler.samples_since(sensor_key, since)
+		if samples:
+			return [s.value for s in samples], samples[-1].timestamp
+		return [], since
+	value = get_sensor_value(sensors, sensor_key)
+	return ([] if value is None else [value]), since
+
+
+def _sample_sensors(sensors, sensor_keys):
+	"""
+	Sample several sensors in one interleaved pass with early termination.
+
+	Every round takes one reading from each sensor that is not yet done.
+	With a running SensorSampler the readings are the samples it took since
+	the previous round, so a round costs about one timing budget however
+	many sensors there are; without one each sensor is read in turn.  The
+	sensors range continuously only when config.VL53_RANGING_MODE asks for
+	it (see hardware.continuous_ranging); in the default "single" mode every
+	reading is a fresh measurement, so none is counted twice.
+
+	A sensor is done once its _robust_stats() sem_mm is at most
+	CALIBRATION_SEM_MM with at least CALIBRATION_MIN_SAMPLES readings, or
+	when it has CALIBRATION_SAMPLES.
+
+	Returns {sensor_key: (stats, list_of_samples)}.  Raises RuntimeError if
+	a sensor has produced fewer than two readings after CALIBRATION_TIMEOUT.
+	"""
+	readings = {key: [] for key in sensor_keys}
+	since = dict.fromkeys(sensor_keys, time.monotonic())
+	stats = {}
+	pending = list(sensor_keys)
+	deadline = time.monotonic() + CALIBRATION_TIMEOUT
+
+	sampler = sensors.get(config.SENSOR_SAMPLER)
+	with contextlib.ExitStack() as stack:
+		for key in sensor_keys:
+			stack.enter_context(continuous_ranging(sensors, key))
+		if hasattr(sampler, "prioritised"):
+			stack.enter_context(sampler.prioritised(*sensor_keys))
+
+		while pending and time.monotonic() < deadline:
+			time.sleep(SAMPLE_DELAY)
+			for key in list(pending):
+				new, since[key] = _new_readings(sensors, key, since[key])
+				samples = readings[key]
+				samples.extend(new[:CALIBRATION_SAMPLES - len(samples)])
+				if len(samples) < CALIBRATION_MIN_SAMPLES:
+					continue
+				stats[key] = _robust_stats(samples)
+				if (stats[key]["sem_mm"] <= CALIBRATION_SEM_MM
+						or len(samples) >= CALIBRATION_SAMPLES):
+					pending.remove(key)
+
+	for key in pending:
+		if len(readings[key]) < 2:
+			raise RuntimeError(f"Sensor '{key}' returned no usable readings")
+		stats[key] = _robust_stats(readings[key])
+
+	for key in sensor_keys:
+		s = stats[key]
+		print(
+			f"  {key}: {len(readings[key])} samples ({s['rejected']} rejected) | "
+			f"mean {s['mean_mm']:.2f} mm ± {s['sem_mm']:.2f} mm (SEM)"
+		)
+	return {key: (stats[key], readings[key]) for key in sensor_keys}
 
 
 def calibrate_vl53_sensors(sensors):
@@ -51,23 +162,31 @@ def calibrate_vl53_sensors(sensors):
 		(config.SENSOR_VL53_1, "VL53L0X #2"),
 	]
 
-	for sensor_key, label in sensor_configs:
-		print(f"\nCalibrating {label}...")
-		print(f"  Known distance: {KNOWN_DISTANCE_MM} mm")
+	print(f"\nSampling {', '.join(label for _, label in sensor_configs)}...")
+	print(f"  Known distance: {KNOWN_DISTANCE_MM} mm")
+	results = _sample_sensors(sensors, [key for key, _ in sensor_configs])
 
-		average_raw, samples = _read_raw_average(sensors, sensor_key)
+	for sensor_key, label in sensor_configs:
+		stats, samples = results[sensor_key]
+		average_raw = stats["mean_mm"]
 
 		error = average_raw - KNOWN_DISTANCE_MM
 		offset = -error  # add this to future raw readings to correct them
+		ci = CALIBRATION_CI_Z * stats["sem_mm"]
 
+		print(f"\n{label}:")
 		print(f"  Error vs known distance : {error:+.2f} mm")
-		print(f"  Software offset         : {offset:+.2f} mm")
+		print(f"  Software offset         : {offset:+.2f} mm (± {ci:.2f} mm)")
 
 		calibration_data[sensor_key] = {
 			"known_distance_mm": KNOWN_DISTANCE_MM,
 			"raw_average_mm": round(average_raw, 3),
+			"raw_median_mm": round(stats["median_mm"], 3),
 			"error_mm": round(error, 3),
 			"offset_mm": round(offset, 3),
+			"offset_ci_mm": round(ci, 3),
+			"sem_mm": round(stats["sem_mm"], 3),
+			"rejected": stats["rejected"],
 			"samples": samples,
 			"timestamp": time.time(),
 		}
@@ -81,9 +200,9 @@ def calibrate_vl53_sensors(sensors):
 		print(
 			f"  {sensor_key}: raw avg {data['raw_average_mm']:.2f} mm | "
 			f"error {data['error_mm']:+.3f} mm | "
-			f"offset {data['offset_mm']:+.3f} mm"
+			f"offset {data['offset_mm']:+.3f} ± {data['offset_ci_mm']:.3f} mm"
 		)
-	print(f"  Data saved to config.OFFSET\n")
+	print(f"  Data saved to {config.CALIBRATION_FILE}\n")
 
 	return calibration_data
 
@@ -107,14 +226,16 @@ def calibrate_automatic(sensors, retract_fn=None, max_retries=3):
 
 	Returns
 	-------
-	dict or None
+	dict, CalibrationStore or None
 		Calibration data dictionary (same shape as ``calibrate_vl53_sensors``)
-		on success, or *None* if all attempts failed.
+		on success, the existing calibration store (see ``load_calibration``)
+		when calibration already exists, or *None* if all attempts failed.
 	"""
 	# Skip if calibration data already exists
-	if load_calibration():
+	existing = load_calibration()
+	if existing:
 		_log.info("Calibration data already exists — skipping automatic calibration.")
-		return load_calibration()
+		return existing
 
 	_log.info("Starting automatic calibration routine...")
 
@@ -151,65 +272,168 @@ def calibrate_automatic(sensors, retract_fn=None, max_retries=3):
 
 
 def save_calibration(calibration_data):
-	"""Persists calibration offsets into config.py"""
+	"""Persists calibration offsets and their metadata into the calibration store"""
+	store = get_store()
+	for sensor, data in calibration_data.items():
+		meta = {"source": "calibration"}
+		for key in ("known_distance_mm", "raw_average_mm", "sem_mm", "rejected"):
+			if key in data:
+				meta[key] = data[key]
+		if "offset_ci_mm" in data:
+			meta["ci_mm"] = data["offset_ci_mm"]
+		if "samples" in data:
+			meta["samples"] = len(data["samples"])
+		if "timestamp" in data:
+			meta["updated_at"] = data["timestamp"]
+		store.update(sensor, data["offset_mm"], save=False, **meta)
+
+	if store.save():
+		print(f"\nOffsets written to {store.path}:")
+	else:
+		print("\nOffsets updated (not persisted):")
+	for k, v in store.offsets().items():
+		print(f"	{k}: {v:+.3f} mm")
+
+
+def save_adxl_calibration(cal):
+	"""Persists the ADXL345 per-axis (scale, offset) into the calibration store"""
+	store = get_store()
+	entry = store.update_axes(config.SENSOR_ADXL, cal, save=False, source="calibration")
+
+	if store.save():
+		print(f"\nADXL345 calibration written to {store.path}:")
+	else:
+		print("\nADXL345 calibration updated (not persisted):")
+	for axis, (scale, offset) in entry.axes.items():
+		print(f"	{axis}: scale {scale:.6f} g/count | offset {offset:+.4f} g")
+
+
+def calibrate_adxl345(sensors, samples=50):
+	"""
+	Interactive 2-point (+1 g / -1 g) calibration of the ADXL345 axes.
+
+	Raw counts are captured with hardware.sensors.read_adxl_counts, so the
+	stored scale maps counts straight to g and the tilt hot path applies it
+	without any unit conversion.  The result is saved to the calibration
+	store and returned.
+	"""
+	from calibrationCurveADXL import calibrate_adxl
+	from hardware.sensors import read_adxl_counts
 
-	offsets = {
-		sensor: data["offset_mm"]
-		for sensor, data in calibration_data.items()
+	sensor = sensors[config.SENSOR_ADXL]
+	cal = calibrate_adxl(lambda: read_adxl_counts(sensor), samples=samples)
+	save_adxl_calibration(cal)
+	return get_store().entry(config.SENSOR_ADXL).axes
+
+
+def _log_offset_change(entry):
+	"""Append one end-stop observation to config.OFFSET_CHANGE_LOG."""
+	path = getattr(config, "OFFSET_CHANGE_LOG", None)
+	if not path:
+		return
+	try:
+		with open(path, "a") as f:
+			f.write(json.dumps(entry) + "\n")
+	except OSError as exc:
+		_log.warning("Could not write offset change log %s: %s", path, exc)
+
+
+def observe_endstop(sensor_name, readings):
+	"""
+	Re-estimate a VL53L0X offset from raw readings taken at the end stop.
+
+	At the fully retracted end stop the true distance is KNOWN_DISTANCE_MM,
+	so the median of the readings gives an observed offset exactly as
+	calibrate_vl53_sensors() would.  The stored offset moves towards it by
+	an EMA step (config.OFFSET_LEARNING_RATE) bounded by
+	config.OFFSET_MAX_STEP_MM, so a single bad stop cannot shift it far.
+	Observations that are unsettled (spread over
+	config.OFFSET_ENDSTOP_MAX_SPREAD_MM) or further than
+	config.OFFSET_OUTLIER_MM from the current offset are rejected.  A sensor
+	without an offset takes the observation as is.
+
+	Accepted changes are saved to the calibration store; every observation
+	is appended to config.OFFSET_CHANGE_LOG.
+
+	Parameters
+	----------
+	sensor_name : One of config.SENSOR_VL53_0 / SENSOR_VL53_1.
+	readings    : Raw readings (mm) taken while stopped at the end stop.
+
+	Returns
+	-------
+	The new offset in mm, or None if the observation was rejected.
+	"""
+	readings = [r for r in readings if r is not None]
+	store = get_store()
+	current = store.entry(sensor_name).offset_mm
+	entry = {
+		"timestamp": time.time(),
+		"sensor": sensor_name,
+		"samples": readings,
+		"old_offset_mm": current,
 	}
-	
-	# Read existing config file
-	with open("config.py", "r") as f:
-		lines = f.readlines()
-		
-	# Replace OFFSET line if it exists
-	found = False
-	for i, line in enumerate(lines):
-		if line.startswith("OFFSET"):
-			lines[i] = f"OFFSET = {pprint.pformat(offsets)}\n"
-			found = True
-			break
-	
-	# If not found, append it
-	if not found:
-		lines.append("\n# Calibration Offsets (auto-generated)\n")
-		lines.append(f"OFFSET = {pprint.pformat(offsets)}\n")
-		
-	# Write back safely
-	with open("config.py", "w") as f:
-		f.writelines(lines)
-		
-	print("\nOffsets written to config.py:")
-	for k, v in offsets.items():
-		print(f"	{k}: {v:+.3f} mm")
-	
-	# Also update runtime values
-	config.OFFSET = offsets
-	
 
-def load_calibration():
-	"""Load calibration data from config.OFFSET, or return None if not set."""
-	if not hasattr(config, "OFFSET") or not config.OFFSET:
+	if not readings:
+		reason = "no readings"
+	elif max(readings) - min(readings) > config.OFFSET_ENDSTOP_MAX_SPREAD_MM:
+		reason = "unsettled"
+	else:
+		observed = round(KNOWN_DISTANCE_MM - statistics.median(readings), 3)
+		entry["observed_offset_mm"] = observed
+		if current is not None and abs(observed - current) > config.OFFSET_OUTLIER_MM:
+			reason = "outlier"
+		else:
+			reason = None
+
+	if reason is not None:
+		entry.update(accepted=False, reason=reason)
+		_log_offset_change(entry)
+		_log.info("End-stop offset observation for %s rejected (%s)", sensor_name, reason)
 		return None
-	# Reconstruct calibration_data shape from the flat offset dict
-	data = {}
-	for sensor_name, offset_mm in config.OFFSET.items():
-		data[sensor_name] = {"offset_mm": offset_mm}
-	return data
+
+	if current is None:
+		new = observed
+	else:
+		step = config.OFFSET_LEARNING_RATE * (observed - current)
+		step = max(-config.OFFSET_MAX_STEP_MM, min(config.OFFSET_MAX_STEP_MM, step))
+		new = round(current + step, 3)
+
+	entry.update(accepted=True, new_offset_mm=new)
+	_log_offset_change(entry)
+
+	if new != current:
+		store.update(sensor_name, new, source="endstop", observed_offset_mm=observed)
+		_log.info("Offset for %s: %s -> %+.3f mm (observed %+.3f mm)",
+		          sensor_name, current, new, observed)
+	return new
+
+
+def load_calibration():
+	"""
+	Return the shared calibration store, or None if no sensor is calibrated.
+
+	The store maps sensor names to SensorCalibration entries (offset_mm and
+	metadata) and is the same instance on every call.
+	"""
+	store = get_store()
+	return store if store else None
 
 
-def get_calibrated_reading(sensors, sensor_name, calibration_data):
+def get_calibrated_reading(sensors, sensor_name, calibration_data=None):
 	"""Return raw and offset-corrected reading for sensor_name."""
-	if not hasattr(config, "OFFSET") or not config.OFFSET:
+	store = calibration_data if calibration_data is not None else get_store()
+	if not store:
 		raise RuntimeError("No calibration data available. Run calibration first.")
-	
-	if sensor_name not in config.OFFSET:
-		raise RuntimeError(f"Sensor '{sensor_name}' not found in config.OFFSET")
-	
+
+	calibration = store.get(sensor_name)
+	if calibration is None:
+		raise RuntimeError(f"Sensor '{sensor_name}' not found in calibration data")
+
 	raw = get_sensor_value(sensors, sensor_name)
-	offset = config.OFFSET[sensor_name]
+	offset = calibration.offset_mm
 	corrected = raw + offset
-	
+
 	return {
 		"raw_mm": raw,
 		"corrected_mm": round(corrected, 3),
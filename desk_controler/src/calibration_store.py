@@ -0,0 +1,247 @@
+"""
+Persistent store for the sensor calibration: VL53L0X software offsets and
+the ADXL345 per-axis scale/offset.
+
+Both used to be written back into config.py (the `OFFSET = {...}` and
+`ADXL_CALIBRATION = {...}` lines, relative to the working directory,
+non-atomically) and every consumer rebuilt dicts from config.OFFSET on each
+call.  CalibrationStore keeps them in config.CALIBRATION_FILE instead:
+
+    {
+        "schema": 1,
+        "saved_at": 1760000000.0,
+        "sensors": {
+            "vl53l0x_0": {"offset_mm": -47.433, "ci_mm": 0.27,
+                          "source": "calibration", "updated_at": ..., ...},
+            "adxl345": {"axes": {"x": [0.003922, 0.0196], ...},
+                        "source": "calibration", "updated_at": ...},
+            ...
+        }
+    }
+
+Writes are atomic: the JSON goes to a temporary file in the same directory,
+which is flushed, fsync'ed and renamed over the old file, so a power cut
+leaves either the old or the new calibration, never a truncated one.
+
+get_store() returns the single process-wide instance, parsed once.  Each
+sensor has one SensorCalibration entry that is updated in place; the motor
+loops, calibration.get_calibrated_reading() and the wrapper hold on to the
+entry and read entry.offset_mm, so a corrected reading costs one attribute
+access and new offsets (full calibration or end-stop re-estimation) are seen
+immediately.  hardware.sensors reads the ADXL345 axes the same way.
+
+On first use without a calibration file the legacy config.OFFSET and
+config.ADXL_CALIBRATION values are imported (source "config"); they are
+written to the file with the next update.
+"""
+
+import json
+import os
+import threading
+import time
+
+import config
+from utils import atomic_write_json
+
+
+SCHEMA_VERSION = 1
+
+
+class SensorCalibration:
+    """
+    Calibration and metadata of one sensor.
+
+    offset_mm : VL53L0X software offset, None if uncalibrated.
+    axes      : ADXL345 {"x": (scale, offset), ...} mapping raw counts to g,
+                None if uncalibrated.
+    """
+
+    __slots__ = ("sensor_name", "offset_mm", "axes", "meta")
+
+    def __init__(self, sensor_name, offset_mm=None, axes=None, meta=None):
+        self.sensor_name = sensor_name
+        self.offset_mm = offset_mm
+        self.axes = axes
+        self.meta = dict(meta or {})
+
+    @property
+    def calibrated(self):
+        return self.offset_mm is not None or self.axes is not None
+
+    def to_dict(self):
+        data = {}
+        if self.offset_mm is not None:
+            data["offset_mm"] = self.offset_mm
+        if self.axes is not None:
+            data["axes"] = {axis: list(values) for axis, values in self.axes.items()}
+        data.update(self.meta)
+        return data
+
+    def __repr__(self):
+        return f"SensorCalibration({self.sensor_name!r}, offset_mm={self.offset_mm})"
+
+
+class CalibrationStore:
+    """Calibration entries of all sensors, persisted to one JSON file."""
+
+    def __init__(self, path=None):
+        """
+        Parameters
+        ----------
+        path : JSON file to load from and save to; None keeps the store in
+               memory only.
+        """
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def entry(self, sensor_name):
+        """
+        Return the SensorCalibration of sensor_name, creating an
+        uncalibrated one on first use.  The same object is returned for the
+        lifetime of the store.
+        """
+        entry = self._entries.get(sensor_name)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.setdefault(sensor_name,
+                                                 SensorCalibration(sensor_name))
+        return entry
+
+    def get(self, sensor_name):
+        """Return the SensorCalibration of sensor_name, or None if uncalibrated."""
+        entry = self._entries.get(sensor_name)
+        if entry is None or entry.offset_mm is None:
+            return None
+        return entry
+
+    def __getitem__(self, sensor_name):
+        entry = self.get(sensor_name)
+        if entry is None:
+            raise KeyError(sensor_name)
+        return entry
+
+    def __contains__(self, sensor_name):
+        return self.get(sensor_name) is not None
+
+    def __bool__(self):
+        return any(e.offset_mm is not None for e in self._entries.values())
+
+    def offsets(self):
+        """{sensor_name: offset_mm} of every calibrated sensor."""
+        return {name: e.offset_mm for name, e in self._entries.items()
+                if e.offset_mm is not None}
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def update(self, sensor_name, offset_mm, save=True, **meta):
+        """
+        Set the offset of sensor_name and merge meta into its metadata.
+
+        updated_at is set to the current time unless given.  The store is
+        saved unless save=False.  Returns the SensorCalibration.
+        """
+        entry = self.entry(sensor_name)
+        meta.setdefault("updated_at", time.time())
+        with self._lock:
+            entry.meta.update(meta)
+            entry.offset_mm = offset_mm
+        if save:
+            self.save()
+        return entry
+
+    def update_axes(self, sensor_name, axes, save=True, **meta):
+        """
+        Set the per-axis {"x": (scale, offset), ...} calibration of an
+        accelerometer; otherwise like update().
+        """
+        axes = {axis: (float(axes[axis][0]), float(axes[axis][1])) for axis in ("x", "y", "z")}
+        entry = self.entry(sensor_name)
+        meta.setdefault("updated_at", time.time())
+        with self._lock:
+            entry.meta.update(meta)
+            entry.axes = axes
+        if save:
+            self.save()
+        return entry
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def load(self):
+        """
+        Load entries from self.path, updating existing entries in place.
+
+        Returns True if a file with the current schema version was loaded.
+        """
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[calibration] Could not load calibration from {self.path}: {e}")
+            return False
+        if not isinstance(data, dict) or data.get("schema") != SCHEMA_VERSION:
+            print(f"[calibration] Ignoring {self.path}: unsupported schema version")
+            return False
+        for sensor_name, sensor_data in data.get("sensors", {}).items():
+            sensor_data = dict(sensor_data)
+            offset_mm = sensor_data.pop("offset_mm", None)
+            axes = sensor_data.pop("axes", None)
+            if axes is not None:
+                axes = {axis: tuple(values) for axis, values in axes.items()}
+            entry = self.entry(sensor_name)
+            with self._lock:
+                entry.meta = sensor_data
+                entry.offset_mm = offset_mm
+                entry.axes = axes
+        return True
+
+    def save(self):
+        """Atomically write all calibrated entries to self.path.  Returns True if written."""
+        if not self.path:
+            return False
+        with self._lock:
+            data = {
+                "schema": SCHEMA_VERSION,
+                "saved_at": time.time(),
+                "sensors": {name: e.to_dict() for name, e in sorted(self._entries.items())
+                            if e.calibrated},
+            }
+            try:
+                atomic_write_json(self.path, data)
+            except OSError as e:
+                print(f"[calibration] Could not save calibration to {self.path}: {e}")
+                return False
+        return True
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Return the process-wide CalibrationStore, loading it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = CalibrationStore(config.CALIBRATION_FILE)
+                if not store.load():
+                    for sensor_name, offset_mm in (getattr(config, "OFFSET", None) or {}).items():
+                        store.update(sensor_name, offset_mm, save=False,
+                                     source="config", updated_at=None)
+                    adxl = getattr(config, "ADXL_CALIBRATION", None)
+                    if adxl:
+                        store.update_axes(config.SENSOR_ADXL, adxl, save=False,
+                                          source="config", updated_at=None)
+                _store = store
+    return _store
@@ -1,15 +1,64 @@
+import os
+
+# =============================================================================
+# Data Files
+#   Learned and persisted state is kept next to this file, so the same files
+#   are used whatever directory the service is started from.
+# =============================================================================
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # =============================================================================
 # I2C Configuration
 # =============================================================================
 I2C_RETRIES = 3
 RETRY_DELAY = 0.2
 OPERATION_TIMEOUT = 5
-READ_TIMEOUT = 1.0
+# Per-read deadline in seconds (sub-second values are honoured; see
+# utils.timeout).  It was 1.0 when only whole seconds could be expressed.
+# An ADXL345 read is a sub-millisecond transaction, so 0.1 s is already two
+# orders of magnitude of headroom and lets a hung bus be noticed within one
+# control cycle instead of stalling the move loop for a second.  VL53L0X
+# reads are always allowed at least two timing budgets (see
+# sensors._vl53_read_timeout), so a single-shot measurement is never cut
+# short by this value.
+READ_TIMEOUT = 0.1
+# Worker threads available to utils.timeout.call_with_timeout.  A hung I2C
+# transaction occupies one (and its sensor lock) until it returns; nested
+# calls run inline on the outer worker and do not take another.
+TIMEOUT_WORKERS = 4
 
 # =============================================================================
 # Sensor Offsets (auto-generated by calibration)
 # =============================================================================
+# VL53L0X offsets, the ADXL345 axis calibration and their metadata
+# (confidence interval, source, time) are kept in CALIBRATION_FILE (see
+# calibration_store.py), written atomically.  Set CALIBRATION_FILE = None to
+# keep them in memory only.
+CALIBRATION_FILE = os.path.join(DATA_DIR, "calibration.json")
+# Legacy values, imported into the calibration store when CALIBRATION_FILE
+# does not exist yet.  ADXL_CALIBRATION is the ADXL345 per-axis
+# {"x": (scale, offset), ...} mapping raw counts to g; None: uncalibrated
+# (equal scale on every axis, which the atan2 tilt is insensitive to).
 OFFSET = {'vl53l0x_0': -47.433, 'vl53l0x_1': -91.333}
+ADXL_CALIBRATION = None
+
+# Online offset re-estimation (calibration.observe_endstop): each time a
+# retraction (retract_fully(), move_to_distance(), move_to_targets()) stops on
+# the end stop, OFFSET_ENDSTOP_SAMPLES raw readings are taken and the median
+# moves that sensor's offset by an EMA step of at most OFFSET_MAX_STEP_MM.
+# Observations further than OFFSET_OUTLIER_MM from the current offset, or
+# spread over more than OFFSET_ENDSTOP_MAX_SPREAD_MM (actuator still
+# moving), are rejected.  Accepted offsets are saved to
+# CALIBRATION_FILE; every observation is appended to OFFSET_CHANGE_LOG
+# (JSON lines; None disables the log).
+OFFSET_ONLINE_LEARNING       = True
+OFFSET_LEARNING_RATE         = 0.2     # EMA weight of each end-stop observation
+OFFSET_MAX_STEP_MM           = 2.0     # largest change per observation
+OFFSET_OUTLIER_MM            = 15.0    # rejection threshold vs current offset
+OFFSET_ENDSTOP_SAMPLES       = 5
+OFFSET_ENDSTOP_SAMPLE_DELAY  = 0.05    # s between end-stop readings
+OFFSET_ENDSTOP_MAX_SPREAD_MM = 6.0
+OFFSET_CHANGE_LOG            = os.path.join(DATA_DIR, "offset_changes.log")
 
 # =============================================================================
 # TCA9548A Multiplexer Channel Assignments
@@ -28,6 +77,31 @@ ADXL345_CHANNEL = 2  # ADXL345 Accelerometer on Multiplexer Channel 2
 VL53_ADDRESS  = 0x29
 ADXL_ADDRESS  = 0x53
 
+# Identity registers checked by require_address(): {address: (register, value)}
+#   VL53L0X  IDENTIFICATION_MODEL_ID (0xC0) = 0xEE
+#   ADXL345  DEVID (0x00)                    = 0xE5
+I2C_DEVICE_IDS = {
+    VL53_ADDRESS: (0xC0, 0xEE),
+    ADXL_ADDRESS: (0x00, 0xE5),
+}
+
+# Scan every mux channel at start-up and print what answers.  Slow (several
+# seconds); only needed when debugging wiring.
+I2C_DIAGNOSTIC_SCAN = False
+
+# Manage the TCA9548A through hardware.bus_scheduler.BusScheduler: a channel
+# is selected only when it is not already active (and left selected after
+# each access), instead of a select + deselect write around every access.
+# Per-channel counters appear under "bus" in get_system_status().
+I2C_BUS_SCHEDULER = True
+
+# Warm start (see hardware/warm_start.py): after a successful init the
+# channel/address topology, VL53L0X driver state and last motor positions are
+# cached here.  The next start restores sensors from the cache after one ID
+# probe each and falls back to the full init on any mismatch.  Set
+# HARDWARE_CACHE_FILE = None to always run the full init.
+HARDWARE_CACHE_FILE = os.path.join(DATA_DIR, "hardware_cache.json")
+
 # =============================================================================
 # Sensor Name Constants
 #   Use these everywhere instead of bare string literals.
@@ -36,10 +110,18 @@ SENSOR_VL53_0 = "vl53l0x_0"
 SENSOR_VL53_1 = "vl53l0x_1"
 SENSOR_ADXL   = "adxl345"
 SENSOR_MUX    = "mux"
+SENSOR_SAMPLER = "sampler"   # sensors-dict key of the background SensorSampler
 
 # Convenience tuple for iterating over distance sensors only
 DISTANCE_SENSORS = (SENSOR_VL53_0, SENSOR_VL53_1)
 
+# Mux channel of every sensor (used to group reads by channel)
+SENSOR_CHANNELS = {
+    SENSOR_VL53_0: VL53_CHANNEL_0,
+    SENSOR_VL53_1: VL53_CHANNEL_1,
+    SENSOR_ADXL:   ADXL345_CHANNEL,
+}
+
 # =============================================================================
 # VL53L0X Sensor Configuration
 # =============================================================================
@@ -49,6 +131,31 @@ DISTANCE_SENSORS = (SENSOR_VL53_0, SENSOR_VL53_1)
 VL53_TIMING_BUDGET = 33000    # microseconds
 VL53_RATE_LIMIT    = 0.25     # MCPS
 VL53_SIGMA_LIMIT   = 9        # millimetres
+# Ranging mode (opt-in continuous ranging via the Adafruit driver's
+# start_continuous()/stop_continuous()):
+#   "single"     — every read triggers its own single-shot measurement and
+#                  blocks for a full timing budget (default).
+#   "moves"      — continuous ranging is switched on for the duration of each
+#                  distance move and off again afterwards.
+#   "continuous" — continuous ranging is started at init and left running.
+# In continuous mode a read returns the most recent completed measurement
+# instead of waiting for a new one to finish.
+VL53_RANGING_MODE  = "single"
+# Read ranges with hardware.sensors._read_range_fast(): the start sequence
+# under one bus lock, a sleep for most of the timing budget, then one burst
+# read of status + result per poll.  False (default) uses the driver's range
+# property (about a dozen separately locked transactions per reading), which
+# follows the driver's own sequencing and is the tested path.
+VL53_FAST_READ     = False
+# Adaptive timing budget in move_to_distance() / move_to_targets(): a short
+# budget (fast, coarser samples) while the actuator is more than
+# VL53_APPROACH_BAND_MM from its target, a long one (less ranging noise) for
+# the final approach.  Reprogrammed only when the band changes, and put back
+# to VL53_TIMING_BUDGET after every move.  False keeps VL53_TIMING_BUDGET.
+VL53_ADAPTIVE_BUDGET  = True
+VL53_BUDGET_FAST      = 20000     # microseconds (driver minimum)
+VL53_BUDGET_PRECISE   = 100000    # microseconds
+VL53_APPROACH_BAND_MM = 15
 # Number of consecutive VL53L0X readings to average inside the closed-loop
 # control and calibration helpers.  Averaging suppresses the per-reading noise
 # (typically ±2–5 mm) so that the calibration offset is applied to a stable
@@ -58,12 +165,99 @@ VL53_SIGMA_LIMIT   = 9        # millimetres
 # favour responsiveness over noise immunity.
 SENSOR_AVERAGE_SAMPLES = 3
 
+# Streaming filter used by motor_control._read_corrected().  The filter is
+# primed with SENSOR_FILTER_WINDOW readings at the start of a move and then
+# consumes one new reading per control cycle, so steady-state noise
+# suppression matches an N-sample average at 1/N of the per-cycle latency.
+#   "mean"   — running mean over the window (same result as plain averaging)
+#   "median" — running median over the window (rejects single-sample spikes,
+#              but slightly noisier than "mean" on ordinary Gaussian noise)
+#   "ema"    — exponential moving average, smoothing factor SENSOR_FILTER_EMA_ALPHA
+#   "kalman" — 1-D Kalman filter tuned by the two variances below
+SENSOR_FILTER           = "mean"
+SENSOR_FILTER_WINDOW    = SENSOR_AVERAGE_SAMPLES
+SENSOR_FILTER_EMA_ALPHA = 0.5
+SENSOR_FILTER_KALMAN_Q  = 4.0     # process variance (mm² per sample)
+SENSOR_FILTER_KALMAN_R  = 9.0     # measurement variance (mm², ≈ ±3 mm noise)
+
+# =============================================================================
+# ADXL345 Accelerometer Configuration
+# =============================================================================
+# Read the tilt with one 6-byte burst of DATAX0–DATAZ1 kept as raw int16
+# counts, converted to degrees through a lookup table indexed by the Z count
+# (hardware.sensors.read_adxl_counts / adxl_counts_to_degrees).  False uses
+# the driver's acceleration property and utils.z_axis_to_degrees().
+ADXL_FAST_READ         = True
+ADXL_MS2_PER_COUNT     = 0.004 * 9.80665   # driver scale: 4 mg per LSB
+# Tilt from all three axes (utils.tilt_degrees): the ADXL345 calibration
+# from the calibration store is applied and the angle is atan2 over the
+# gravity vector, which keeps its resolution near 0° and 180° and ignores
+# gain error common to all axes.  False uses the Z-only lookup table above.
+ADXL_TILT_3AXIS        = True
+# Default tilt tolerance (±degrees) for move_to_angle / move_to_targets.
+# The calibrated 3-axis angle is steady enough to settle inside ±0.5°
+# without hunting; use 1.0 with ADXL_TILT_3AXIS = False.
+TILT_TOLERANCE_DEG     = 0.5
+# FIFO streaming (opt-in): the ADXL345 samples continuously at
+# ADXL_DATA_RATE_HZ into its 32-entry FIFO (stream mode); every tilt read
+# drains the FIFO under one bus lock and returns the mean angle of the batch
+# (NumPy-vectorised when installed).  Averaging the samples taken since the
+# previous read suppresses vibration from the running actuator.  Supported
+# rates: 6.25, 12.5, 25, 50, 100, 200, 400, 800, 1600, 3200 Hz.
+ADXL_STREAM_MODE       = False
+ADXL_DATA_RATE_HZ      = 200
+
+# =============================================================================
+# Background Sensor Sampler
+#   The SensorSampler thread polls every sensor on a fixed schedule and caches
+#   the latest value so that the motor loops, MQTT handlers and feedback
+#   publishers read memory instead of blocking on the I2C bus.
+# =============================================================================
+SAMPLER_ENABLED     = True
+# Poll period per sensor in seconds.  A VL53L0X read blocks for roughly one
+# timing budget (33 ms), so the distance sensors cannot usefully be polled
+# faster than ~30 Hz; the ADXL345 read is a few hundred microseconds.
+SAMPLER_PERIODS = {
+    SENSOR_VL53_0: 0.04,
+    SENSOR_VL53_1: 0.04,
+    SENSOR_ADXL:   0.02,
+}
+SAMPLER_BUFFER_SIZE = 32      # samples kept per sensor in the ring buffer
+# Cached samples older than this (seconds) are ignored; get_sensor_value()
+# then has the sampler poll the sensor at once and waits up to
+# SAMPLER_WAIT_TIMEOUT for the new sample instead of reading the bus itself
+# (TimeoutError, e.g. when the sampler thread is stalled in a read).
+SAMPLER_MAX_AGE      = 0.25
+SAMPLER_WAIT_TIMEOUT = 0.5
+# Motion-aware priority: while an axis moves, its sensor is polled at
+# SAMPLER_ACTIVE_PERIODS and every other sensor at SAMPLER_IDLE_PERIOD, which
+# frees the bus for the control loop but still catches manual bumps of idle
+# axes.  With no move running every sensor is at the idle rate.  Keep the
+# idle period below SAMPLER_MAX_AGE so idle reads are still served from the
+# cache.  None polls every sensor at SAMPLER_PERIODS all the time.
+SAMPLER_IDLE_PERIOD = 0.2
+SAMPLER_ACTIVE_PERIODS = {
+    SENSOR_VL53_0: 0.035,     # back-to-back single-shot measurements
+    SENSOR_VL53_1: 0.035,
+    SENSOR_ADXL:   0.01,
+}
+
 # =============================================================================
 # Serial / UART Configuration
 # =============================================================================
 SERIAL_PORT     = '/dev/serial0'
 SERIAL_BAUDRATE = 2400
 SERIAL_TIMEOUT  = 1           # seconds
+# Motor packets are written only when the command changes (CommandSerial);
+# CMD_ALL_OFF is always written.  Set a keep-alive interval in seconds if the
+# controller board needs an unchanged command refreshed periodically.
+SERIAL_DEDUPLICATE        = True
+SERIAL_KEEPALIVE_INTERVAL = None
+# Serial writes go through a dedicated writer thread (SerialWriter) so they
+# never block the caller; CMD_ALL_OFF jumps the queue and drops pending
+# packets.  The last SERIAL_STOP_LATENCY_HISTORY stop latencies are kept.
+SERIAL_ASYNC_WRITER         = True
+SERIAL_STOP_LATENCY_HISTORY = 50
 
 # =============================================================================
 # MQTT Configuration
@@ -78,6 +272,15 @@ MQTT_PASSWORD = "eceMos1"
 MQTT_PRESET_FILE = "desk_presets.json"
 MQTT_HEARTBEAT_INTERVAL = 60  # seconds
 
+# Move all preset axes at once (motor_control.move_to_targets) instead of
+# one after another.  False restores the sequential M2 → M3 → M1 order.
+PRESET_SIMULTANEOUS_MOVES = True
+
+# Commands received while the service is still initializing the hardware are
+# queued (at most this many) and run once it is ready; further commands are
+# rejected with a JSON status.  Emergency stop clears the queue.
+STARTUP_COMMAND_QUEUE_SIZE = 10
+
 # =============================================================================
 # Motor Control Commands  (3-byte packets: header, command, checksum)
 # =============================================================================
@@ -99,6 +302,58 @@ SENSOR_MOTOR_COMMANDS = {
     SENSOR_VL53_1: {"extend": CMD_M3_EXTEND, "retract": CMD_M3_RETRACT},
 }
 
+# =============================================================================
+# Motion Control  (see motion_controller.py)
+#   Predictive stop: OFF is sent early when the predicted rest position
+#   (position + velocity × learned coast time) reaches the tolerance band.
+#   Near the target the drive command is pulse-width modulated.
+# =============================================================================
+CONTROL_PREDICTIVE_STOP     = True    # False → plain bang-bang control
+CONTROL_VELOCITY_WINDOW     = 4       # samples in the velocity estimate
+CONTROL_COAST_TIME_DEFAULT  = 0.05    # s, initial coast estimate (distance = speed × time)
+CONTROL_COAST_TIME_MAX      = 0.5     # s, upper bound on a learned coast time
+CONTROL_COAST_LEARNING_RATE = 0.3     # EMA weight of each newly observed coast
+CONTROL_SETTLE_TIMEOUT      = 0.5     # s, max wait after OFF for the actuator to stop
+CONTROL_PWM_PERIOD          = 0.2     # s, drive-pulse period near the target
+CONTROL_PWM_MIN_DUTY        = 0.3     # lowest duty cycle that still moves the actuator
+CONTROL_PWM_BAND_MM         = 10.0    # error below which distance moves are pulsed
+CONTROL_PWM_BAND_DEG        = 3.0     # error below which tilt moves are pulsed
+CONTROL_SETTLE_SPEED_MM     = 2.0     # mm/s, distance actuator counts as stopped
+CONTROL_SETTLE_SPEED_DEG    = 0.5     # deg/s, tilt actuator counts as stopped
+
+# Stall / end-stop detection (motion_controller.StallDetector): a distance
+# move ends as soon as the actuator, while powered in one direction, has
+# moved less than STALL_MIN_PROGRESS_MM over the last STALL_WINDOW_S seconds.
+# extend_fully() / retract_fully() treat that as reaching the end stop; in
+# move_to_distance() and move_to_targets() it is an end stop within
+# STALL_ENDSTOP_MARGIN_MM of MIN_POSITION / MAX_POSITION and a stall anywhere
+# else.  The window only opens STALL_STARTUP_LAG_S after power-on (or once
+# the actuator has moved), so a slow start is not mistaken for a stall.
+STALL_DETECTION             = True
+STALL_WINDOW_S              = 0.5     # s of no progress before the move ends
+STALL_MIN_PROGRESS_MM       = 2.0     # mm over the window that counts as moving
+STALL_STARTUP_LAG_S         = 0.3     # s after power-on before the window opens
+STALL_ENDSTOP_MARGIN_MM     = 10.0
+
+# =============================================================================
+# Actuator Motion Model  (see motion_model.py)
+#   Speeds, start-up lag and coast time are fitted from the traces of past
+#   moves.  With MOTION_OPEN_LOOP enabled and a trained model, long moves
+#   drive open-loop until they are expected to be MOTION_OPEN_LOOP_APPROACH_*
+#   short of the target, then switch to closed-loop control.  The open-loop
+#   phase takes no sensor samples, so stall detection cannot see it; it is
+#   off by default.  Set MOTION_MODEL_FILE = None to keep models in memory
+#   only.
+# =============================================================================
+MOTION_MODEL_FILE                 = os.path.join(DATA_DIR, "actuator_model.json")
+MOTION_MODEL_MIN_RUNS             = 3       # fitted moves before the model is trusted
+MOTION_MODEL_LEARNING_RATE        = 0.3     # EMA weight of each newly fitted move
+MOTION_MODEL_MIN_SEGMENT_SAMPLES  = 5       # shortest drive segment used for fitting
+MOTION_MODEL_MOVE_THRESHOLD       = 3.0     # position change that counts as "moving"
+MOTION_OPEN_LOOP                  = False   # True → drive blind for the modelled part
+MOTION_OPEN_LOOP_APPROACH_MM      = 30.0    # closed-loop band before a distance target
+MOTION_OPEN_LOOP_APPROACH_DEG     = 8.0     # closed-loop band before a tilt target
+
 # =============================================================================
 # Position Limits  (millimetres) — VL53L0X actuators
 # =============================================================================
@@ -10,6 +10,8 @@ import sys
 import time
 import signal
 import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import config
 from desk_controller_wrapper import DeskControllerWrapper
 
@@ -48,24 +50,41 @@ class DeskControllerService:
                 log_file="/var/log/desk_controller.log"
             )
             
-            # Initialize hardware
-            print("\n[Service] Initializing hardware...")
-            if not self.controller.initialize_hardware():
+            # Staged start-up: the MQTT connection, preset loading and the
+            # serial port do not depend on the I2C sensors, so they run
+            # alongside sensor bring-up.  Commands that arrive before the
+            # hardware is ready are queued by the controller.
+            self.controller.begin_startup()
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix="startup") as pool:
+                mqtt_future = pool.submit(self.controller.mqtt_connect)
+                presets_future = pool.submit(self.controller.load_presets_from_file)
+                serial_future = pool.submit(self.controller.open_serial_port)
+
+                print("\n[Service] Initializing hardware...")
+                hardware_ok = self.controller.initialize_hardware(open_serial=False)
+
+                if not serial_future.result():
+                    print("⚠ Serial port unavailable - motor commands will fail")
+                presets_future.result()
+                print("✓ Presets loaded")
+                if not mqtt_future.result():
+                    print("⚠ MQTT connection failed - will retry periodically")
+                else:
+                    print("✓ MQTT connected")
+
+            self.controller.finish_startup(hardware_ok)
+            if not hardware_ok:
                 print("✗ Hardware initialization failed")
+                self.controller.mqtt_disconnect()
                 return False
             print("✓ Hardware initialized")
-            
-            # Load presets
-            print("[Service] Loading presets...")
-            self.controller.load_presets_from_file()
-            print("✓ Presets loaded")
-            
-            # Connect to MQTT
-            print("[Service] Connecting to MQTT broker...")
-            if not self.controller.mqtt_connect():
-                print("⚠ MQTT connection failed - will retry periodically")
-            else:
-                print("✓ MQTT connected")
+
+            metrics = self.controller.startup_metrics
+            print(
+                "[Service] Startup: "
+                f"online={self._format_seconds(metrics['time_to_online'])}, "
+                f"ready={self._format_seconds(metrics['time_to_ready'])}"
+            )
             
             self.running = True
             self.controller.publish_status("service_running")
@@ -101,6 +120,10 @@ class DeskControllerService:
                 self.controller.logger.error(f"Service start failed: {e}")
             return False
     
+    @staticmethod
+    def _format_seconds(value):
+        return "n/a" if value is None else f"{value:.2f}s"
+
     def _heartbeat_loop(self):
         """Run periodic heartbeat and status updates."""
         while self.running:
@@ -19,6 +19,7 @@ import time
 import json
 import os
 import queue
+import collections
 import threading
 from typing import Dict, Optional, Tuple
 from enum import Enum
@@ -32,7 +33,16 @@ from hardware import (
     init_vl53l0x,
     init_adxl345,
     init_serial,
+    CommandSerial,
+    SerialWriter,
     get_sensor_value,
+    SensorSampler,
+    load_hardware_cache,
+    save_hardware_cache,
+    save_motor_positions,
+    cached_motor_positions,
+    warm_init_vl53l0x,
+    warm_init_adxl345,
 )
 from motor_control import (
     move_to_distance,
@@ -41,21 +51,35 @@ from motor_control import (
     extend_tilt,
     retract_fully,
     retract_tilt,
+    move_to_targets,
     emergency_stop,
+    last_outcome,
 )
+import motion_model
 from calibration import (
     calibrate_vl53_sensors,
     calibrate_automatic,
     load_calibration,
-    get_calibrated_reading,
 )
 
-try:
-    import paho.mqtt.client as mqtt
-    MQTT_AVAILABLE = True
-except ImportError:
-    MQTT_AVAILABLE = False
-    print("⚠ paho-mqtt not installed. MQTT features will be unavailable.")
+# paho-mqtt is imported by mqtt_connect() on first use so that importing this
+# module (and starting the service) does not pay for it up front.
+mqtt = None
+MQTT_AVAILABLE = True   # until an import attempt proves otherwise
+
+
+def _load_mqtt():
+    """Import paho.mqtt.client on first use; returns None if not installed."""
+    global mqtt, MQTT_AVAILABLE
+    if mqtt is None and MQTT_AVAILABLE:
+        try:
+            import paho.mqtt.client as client
+        except ImportError:
+            MQTT_AVAILABLE = False
+            print("⚠ paho-mqtt not installed. MQTT features will be unavailable.")
+        else:
+            mqtt = client
+    return mqtt
 
 
 ################################################################################
@@ -71,6 +95,7 @@ class MotorDirection(Enum):
 
 class SystemState(Enum):
     """System operational state."""
+    INITIALIZING = "initializing"
     IDLE = "idle"
     MOVING = "moving"
     CALIBRATING = "calibrating"
@@ -218,6 +243,8 @@ class DeskControllerWrapper:
         # Hardware state
         self.sensors = {}
         self.serial_port = None
+        self.serial_writer = None
+        self.sampler = None
         self.is_initialized = False
         
         # Motor state (M1 stores angle degrees, M2/M3 store distance millimetres)
@@ -283,16 +310,59 @@ class DeskControllerWrapper:
         )
         self._cmd_dispatcher_thread.start()
 
+        # Staged start-up (begin_startup/finish_startup): commands that arrive
+        # while the hardware is still initializing are held here and
+        # dispatched once it is ready.  _deferred_lock also guards the
+        # INITIALIZING → IDLE/ERROR transition so no command slips between.
+        self._deferred_commands = collections.deque()
+        self._deferred_lock = threading.Lock()
+        self._startup_t0 = time.monotonic()
+        self.startup_metrics = {
+            "time_to_online": None,
+            "time_to_ready": None,
+            "time_to_first_move": None,
+        }
+
         self.logger.info("DeskControllerWrapper initialized")
     
     ################################################################################
     #                           HARDWARE INITIALIZATION
     ################################################################################
     
-    def initialize_hardware(self) -> bool:
+    def open_serial_port(self) -> bool:
+        """
+        Open the motor controller serial port.
+
+        SerialWriter moves the blocking writes onto their own thread and lets
+        CMD_ALL_OFF jump the queue.  Motor loops re-send their command every
+        cycle; CommandSerial forwards only direction changes (and every
+        CMD_ALL_OFF) so the 2400-baud line is not saturated.  Independent of
+        the I2C sensors, so the service opens it while they initialize.
+
+        Returns
+        -------
+        bool
+            True if the port is open
+        """
+        serial_port = init_serial()
+        if serial_port is not None and config.SERIAL_ASYNC_WRITER:
+            self.serial_writer = SerialWriter(serial_port).start()
+            serial_port = self.serial_writer
+        if serial_port is not None and config.SERIAL_DEDUPLICATE:
+            serial_port = CommandSerial(serial_port)
+        self.serial_port = serial_port
+        return serial_port is not None
+
+    def initialize_hardware(self, open_serial: bool = True) -> bool:
         """
         Initialize all hardware components.
         
+        Parameters
+        ----------
+        open_serial : bool
+            Also open the serial port.  False when the caller opens it
+            separately with open_serial_port().
+
         Returns
         -------
         bool
@@ -308,22 +378,53 @@ class DeskControllerWrapper:
             tca = init_mux(i2c)
             self.sensors[config.SENSOR_MUX] = tca
             
-            # Scan I2C channels
-            scan_i2c_channels(tca)
+            # Full channel scan is a slow, opt-in diagnostic; each sensor's
+            # init probes only its own address.
+            if config.I2C_DIAGNOSTIC_SCAN:
+                scan_i2c_channels(tca)
             
+            # Warm start: restore sensors from the last successful init and
+            # fall back to the full init for any device that does not match.
+            cache = load_hardware_cache()
+
             # Initialize VL53L0X sensors
             # Channel 0 → SENSOR_VL53_0 → Motor 2
             # Channel 1 → SENSOR_VL53_1 → Motor 3
-            self.sensors[config.SENSOR_VL53_0] = init_vl53l0x(
-                tca, config.VL53_CHANNEL_0, "VL53L0X #0"
-            )
-            self.sensors[config.SENSOR_VL53_1] = init_vl53l0x(
-                tca, config.VL53_CHANNEL_1, "VL53L0X #1"
-            )
+            for sensor_name, channel, name in (
+                (config.SENSOR_VL53_0, config.VL53_CHANNEL_0, "VL53L0X #0"),
+                (config.SENSOR_VL53_1, config.VL53_CHANNEL_1, "VL53L0X #1"),
+            ):
+                sensor = warm_init_vl53l0x(tca, channel, name, sensor_name, cache)
+                if sensor is None:
+                    sensor = init_vl53l0x(tca, channel, name)
+                self.sensors[sensor_name] = sensor
 
             # Initialize ADXL345
             # Channel 2 → SENSOR_ADXL → Motor 1
-            self.sensors[config.SENSOR_ADXL] = init_adxl345(tca)
+            sensor = warm_init_adxl345(tca, cache)
+            if sensor is None:
+                sensor = init_adxl345(tca)
+            self.sensors[config.SENSOR_ADXL] = sensor
+
+            # Last-known positions until the first move or feedback read
+            with self.position_lock:
+                for motor_id, position in cached_motor_positions(cache).items():
+                    if self.motor_positions.get(motor_id) is None:
+                        self.motor_positions[motor_id] = position
+            save_hardware_cache(self.sensors, self.motor_positions)
+
+            # Start background sampling.  Registering the sampler in the
+            # sensors dict makes get_sensor_value() serve every consumer
+            # (motor loops, MQTT handlers, feedback) from its cache.
+            if config.SAMPLER_ENABLED:
+                self.sampler = SensorSampler(
+                    self.sensors, idle_period=config.SAMPLER_IDLE_PERIOD)
+                self.sampler.start()
+                self.sensors[config.SENSOR_SAMPLER] = self.sampler
+
+            # Restore the learned actuator models (speeds, lag, coast)
+            if motion_model.load_models():
+                self.logger.info(f"Loaded actuator motion models from {config.MOTION_MODEL_FILE}")
 
             # Log sensor-channel-motor mapping for easy verification at startup
             self.logger.info(
@@ -333,8 +434,10 @@ class DeskControllerWrapper:
                 f"{config.SENSOR_ADXL}→ch{config.ADXL345_CHANNEL}→Motor1"
             )
             
-            # Initialize serial port
-            self.serial_port = init_serial()
+            # Initialize serial port (unless the start-up pipeline already
+            # opened it concurrently)
+            if open_serial and self.serial_port is None:
+                self.open_serial_port()
             
             # Load calibration data
             self.calibration_data = load_calibration()
@@ -405,12 +508,14 @@ class DeskControllerWrapper:
                 self.logger.warning("Hardware not initialized")
                 return None
             
-            if not self.calibration_data:
+            # Shared store entry, kept current by the calibration routines
+            calibration = self.calibration_data.get(sensor_name) if self.calibration_data else None
+            if calibration is None:
                 self.logger.warning("No calibration data available")
                 return self.read_sensor_raw(sensor_name)
             
-            reading = get_calibrated_reading(self.sensors, sensor_name, self.calibration_data)
-            return reading["corrected_mm"]
+            raw = get_sensor_value(self.sensors, sensor_name)
+            return round(raw + calibration.offset_mm, 3)
         
         except Exception as e:
             self.logger.error(f"Error reading calibrated sensor {sensor_name}: {e}")
@@ -432,6 +537,19 @@ class DeskControllerWrapper:
         """Return minimum allowed target for motor_id in its native unit."""
         return config.MIN_ANGLE_DEG if motor_id == 1 else config.MIN_POSITION
 
+    def _outcome_reason(self, outcome, unit: str) -> str:
+        """Return " (<result> at <position> <unit> after <t> s)" for a MoveOutcome, or ""."""
+        if outcome is None or outcome.position is None:
+            return ""
+        return (f" ({outcome.result} at {outcome.position:.1f} {unit} "
+                f"after {outcome.elapsed:.1f} s)")
+
+    def _sensor_for_motor(self, motor_id: int) -> Optional[str]:
+        """Return the feedback sensor name for motor_id (M1 tilt, M2/M3 distance)."""
+        if motor_id == 1:
+            return config.SENSOR_ADXL
+        return self._distance_sensor_for_motor(motor_id)
+
     def _distance_sensor_for_motor(self, motor_id: int) -> Optional[str]:
         """Return VL53 sensor name for distance motors (M2/M3), else None."""
         return {
@@ -456,9 +574,26 @@ class DeskControllerWrapper:
             self.logger.error(f"Motor worker '{task_name}' failed: {e}")
         finally:
             self._motor_worker_context.active = False
+            # Persist whatever the move taught the actuator models
+            motion_model.save_models()
+            self._save_cached_positions()
             self.motor_command_lock.release()
             self.logger.debug(f"Motor command lock released by worker '{task_name}'")
     
+    def _motor_serial(self):
+        """Return the interruptible serial proxy used by a single move."""
+        if self.startup_metrics["time_to_first_move"] is None:
+            elapsed = time.monotonic() - self._startup_t0
+            self.startup_metrics["time_to_first_move"] = elapsed
+            self.logger.info(f"Startup: first move {elapsed:.2f}s after start")
+        return _InterruptibleSerialProxy(self.serial_port, self.motor_stop_event)
+
+    def _save_cached_positions(self):
+        """Record the last-known motor positions in the warm-start cache."""
+        with self.position_lock:
+            positions = self.motor_positions.copy()
+        save_motor_positions(positions)
+
     def _reject_if_calibrating(self, publish_status: bool = False) -> bool:
         """Return True when movement should be rejected due to calibration state."""
         if self.system_state != SystemState.CALIBRATING:
@@ -562,7 +697,8 @@ class DeskControllerWrapper:
         return success
     
     def move_motor_to_position(self, motor_id: int, target_value: float,
-                               tolerance: int = 2, timeout: float = 30) -> bool:
+                               tolerance: Optional[float] = None,
+                               timeout: float = 30) -> bool:
         """
         Move a motor to a specific position.
         
@@ -572,8 +708,9 @@ class DeskControllerWrapper:
             Motor ID (1-3)
         target_value : float
             Target value (degrees for M1, millimeters for M2/M3)
-        tolerance : int
-            Acceptable error (degrees for M1, mm for M2/M3)
+        tolerance : float, optional
+            Acceptable error (degrees for M1, mm for M2/M3).  Defaults to
+            config.TILT_TOLERANCE_DEG for M1 and 2 mm for M2/M3.
         timeout : float
             Maximum movement time in seconds
         
@@ -596,17 +733,19 @@ class DeskControllerWrapper:
             
             unit = self._motor_unit(motor_id)
             self.logger.info(f"Moving motor {motor_id} to {target_value} {unit}")
+            self.publish_eta(motor_id, target_value)
             self.motor_status[motor_id] = "moving"
             self.system_state = SystemState.MOVING
             self.logger.debug(f"M{motor_id} status: {self.motor_status[motor_id]}")
             
-            serial_port = _InterruptibleSerialProxy(self.serial_port, self.motor_stop_event)
+            serial_port = self._motor_serial()
             if motor_id == 1:
                 success = move_to_angle(
                     self.sensors,
                     target_value,
                     serial_port,
-                    tolerance=tolerance,
+                    tolerance=(config.TILT_TOLERANCE_DEG
+                               if tolerance is None else tolerance),
                     timeout=timeout,
                 )
             else:
@@ -619,7 +758,7 @@ class DeskControllerWrapper:
                     sensor_name,
                     target_value,
                     serial_port,
-                    tolerance=tolerance,
+                    tolerance=2 if tolerance is None else tolerance,
                     timeout=timeout,
                 )
             
@@ -641,7 +780,10 @@ class DeskControllerWrapper:
             else:
                 self.motor_status[motor_id] = "error"
                 self.system_state = SystemState.ERROR
-                self.logger.error(f"✗ Motor {motor_id} failed to reach {target_value} {unit}")
+                reason = self._outcome_reason(
+                    last_outcome(self._sensor_for_motor(motor_id)), unit)
+                self.logger.error(f"✗ Motor {motor_id} failed to reach "
+                                  f"{target_value} {unit}{reason}")
                 self.logger.debug(f"M{motor_id} status: {self.motor_status[motor_id]}")
                 return False
         
@@ -660,6 +802,98 @@ class DeskControllerWrapper:
             self.logger.debug(f"M{motor_id} status: {self.motor_status[motor_id]}")
             return False
     
+    def move_motors_simultaneously(self, targets: Dict[int, float],
+                                   timeout: float = 30) -> bool:
+        """
+        Move several motors to their targets at the same time.
+
+        All motors share one control loop and one command packet per cycle
+        (see motor_control.move_to_targets); each motor drops out of the
+        packet as soon as it reaches its target.  A motor that fails is
+        logged with the reason from motor_control.last_outcome, and its
+        position is set to where the move left it when that was measured.
+
+        Parameters
+        ----------
+        targets : dict
+            {motor_id: target_value} (degrees for M1, millimeters for M2/M3)
+        timeout : float
+            Maximum movement time in seconds for the whole move
+
+        Returns
+        -------
+        bool
+            True if every motor reached its target, False otherwise
+        """
+        try:
+            if not self.is_initialized:
+                self.logger.warning("Hardware not initialized")
+                return False
+
+            if self._reject_if_calibrating():
+                return False
+
+            invalid = [motor_id for motor_id in targets if motor_id not in [1, 2, 3]]
+            if invalid:
+                self.logger.error(f"Invalid motor ID(s): {invalid}")
+                return False
+
+            sensor_targets = {}
+            for motor_id, target_value in targets.items():
+                unit = self._motor_unit(motor_id)
+                self.logger.info(f"Moving motor {motor_id} to {target_value} {unit}")
+                self.publish_eta(motor_id, target_value)
+                self.motor_status[motor_id] = "moving"
+                sensor_targets[self._sensor_for_motor(motor_id)] = target_value
+            self.system_state = SystemState.MOVING
+
+            # Outcomes left over from earlier moves must not be reported
+            previous = {name: last_outcome(name) for name in sensor_targets}
+            serial_port = self._motor_serial()
+            results = move_to_targets(self.sensors, sensor_targets, serial_port, timeout=timeout)
+
+            all_success = True
+            for motor_id, target_value in targets.items():
+                unit = self._motor_unit(motor_id)
+                sensor_name = self._sensor_for_motor(motor_id)
+                if results.get(sensor_name):
+                    with self.position_lock:
+                        self.motor_positions[motor_id] = target_value
+                    self.motor_status[motor_id] = "idle"
+                    self.logger.info(f"✓ Motor {motor_id} reached {target_value} {unit}")
+                    self.publish_position_feedback(motor_id)
+                else:
+                    all_success = False
+                    self.motor_status[motor_id] = "error"
+                    outcome = last_outcome(sensor_name)
+                    if outcome is previous[sensor_name]:
+                        outcome = None
+                    if outcome is not None and outcome.position is not None:
+                        with self.position_lock:
+                            self.motor_positions[motor_id] = outcome.position
+                    self.logger.error(f"✗ Motor {motor_id} failed to reach "
+                                      f"{target_value} {unit}"
+                                      f"{self._outcome_reason(outcome, unit)}")
+                self.logger.debug(f"M{motor_id} status: {self.motor_status[motor_id]}")
+
+            self.system_state = SystemState.IDLE if all_success else SystemState.ERROR
+            return all_success
+
+        except InterruptedError:
+            for motor_id in targets:
+                if self.motor_status.get(motor_id) == "moving":
+                    self.motor_status[motor_id] = "stopped"
+            self.system_state = SystemState.IDLE
+            self.logger.warning("Simultaneous movement interrupted")
+            return False
+
+        except Exception as e:
+            self.logger.error(f"Error in simultaneous movement: {e}")
+            for motor_id in targets:
+                self.motor_status[motor_id] = "error"
+            self.system_state = SystemState.ERROR
+            return False
+
     def retract_motor_fully(self, motor_id: int, timeout: float = 30) -> bool:
         """
         Retract a motor to minimum position.
@@ -689,11 +923,12 @@ class DeskControllerWrapper:
                 return False
             
             self.logger.info(f"Retracting motor {motor_id} to minimum position")
+            self.publish_eta(motor_id, self._motor_min_target(motor_id))
             self.motor_status[motor_id] = "moving"
             self.system_state = SystemState.MOVING
             self.logger.debug(f"M{motor_id} status: {self.motor_status[motor_id]}")
             
-            serial_port = _InterruptibleSerialProxy(self.serial_port, self.motor_stop_event)
+            serial_port = self._motor_serial()
             if motor_id == 1:
                 success = retract_tilt(self.sensors, serial_port, timeout=timeout)
             else:
@@ -774,11 +1009,12 @@ class DeskControllerWrapper:
                 return False
 
             self.logger.info(f"Extending motor {motor_id} to maximum position")
+            self.publish_eta(motor_id, self._motor_max_target(motor_id))
             self.motor_status[motor_id] = "moving"
             self.system_state = SystemState.MOVING
             self.logger.debug(f"M{motor_id} status: {self.motor_status[motor_id]}")
 
-            serial_port = _InterruptibleSerialProxy(self.serial_port, self.motor_stop_event)
+            serial_port = self._motor_serial()
             if motor_id == 1:
                 success = extend_tilt(self.sensors, serial_port, timeout=timeout)
             else:
@@ -830,9 +1066,11 @@ class DeskControllerWrapper:
 
         Sets motor_stop_event, which causes _InterruptibleSerialProxy to raise
         InterruptedError on the very next serial write inside any running motor
-        worker thread.  The hardware CMD_ALL_OFF command is then sent directly
-        on the real serial port (bypassing the proxy) so the actuators halt
-        even if no worker thread is currently active.
+        worker thread.  The hardware CMD_ALL_OFF command is then sent on the
+        serial port itself (bypassing the proxy) so the actuators halt even if
+        no worker thread is currently active.  With the SerialWriter in place
+        the stop packet jumps ahead of any queued motor packets and discards
+        them, so stop latency no longer depends on what a worker was writing.
 
         Returns
         -------
@@ -842,6 +1080,12 @@ class DeskControllerWrapper:
         try:
             self.logger.warning("EMERGENCY STOP - All motors disabled")
             self.motor_stop_event.set()
+            # Commands held during start-up must not run after a stop
+            with self._deferred_lock:
+                dropped = len(self._deferred_commands)
+                self._deferred_commands.clear()
+            if dropped:
+                self.logger.warning(f"Discarded {dropped} queued start-up command(s)")
             emergency_stop(self.serial_port)
             
             for motor_id in [1, 2, 3]:
@@ -966,7 +1210,10 @@ class DeskControllerWrapper:
         """
         Load and execute a preset.
 
-        Motors are moved one at a time in the required order:
+        With config.PRESET_SIMULTANEOUS_MOVES (the default) all three motors
+        move at once through move_motors_simultaneously(), so the preset takes
+        roughly as long as the longest single move.  Otherwise motors are
+        moved one at a time in the required order:
           1. Motor 2 – keyboard height  (VL53L0X #0)
           2. Motor 3 – monitor height   (VL53L0X #1)
           3. Motor 1 – monitor tilt     (ADXL345)
@@ -998,6 +1245,28 @@ class DeskControllerWrapper:
             self.logger.info(f"Loading preset {preset_id}: {preset}")
             self.system_state = SystemState.MOVING
 
+            if config.PRESET_SIMULTANEOUS_MOVES:
+                if not self._wait_for_motor_ready():
+                    self.logger.error("Timeout waiting for motors to be ready")
+                    self.system_state = SystemState.ERROR
+                    return False
+
+                all_success = self.move_motors_simultaneously(
+                    {motor_id: preset[motor_id] for motor_id in [2, 3, 1]}
+                )
+                if self.motor_stop_event.is_set():
+                    self.logger.warning(f"Preset {preset_id} interrupted by emergency stop")
+                    self.system_state = SystemState.IDLE
+                    return False
+
+                if all_success:
+                    self.logger.info(f"✓ Preset {preset_id} executed successfully")
+                    self.system_state = SystemState.IDLE
+                else:
+                    self.logger.error(f"✗ Preset {preset_id} execution failed")
+                    self.system_state = SystemState.ERROR
+                return all_success
+
             # Required movement order: keyboard height → monitor height → monitor tilt
             all_success = True
             for motor_id in [2, 3, 1]:
@@ -1102,7 +1371,7 @@ class DeskControllerWrapper:
         )
 
         if calibration_data is not None:
-            self.calibration_data = calibration_data
+            self.calibration_data = load_calibration()
             self.logger.info("✓ Auto-calibration complete.")
             self.system_state = SystemState.IDLE
             self.publish_status("Auto-calibration complete")
@@ -1140,8 +1409,8 @@ class DeskControllerWrapper:
             self.system_state = SystemState.CALIBRATING
             self.logger.info("Starting sensor calibration...")
             
-            calibration_data = calibrate_vl53_sensors(self.sensors)
-            self.calibration_data = calibration_data
+            calibrate_vl53_sensors(self.sensors)
+            self.calibration_data = load_calibration()
             
             self.logger.info("✓ Calibration complete")
             self.system_state = SystemState.IDLE
@@ -1152,6 +1421,114 @@ class DeskControllerWrapper:
             self.system_state = SystemState.ERROR
             return False
     
+    ################################################################################
+    #                           STAGED STARTUP
+    ################################################################################
+    
+    def begin_startup(self):
+        """
+        Enter the INITIALIZING state at the start of a staged start-up.
+
+        Until finish_startup() is called, motor, preset and calibration
+        commands are queued (up to config.STARTUP_COMMAND_QUEUE_SIZE) and
+        answered with a JSON "initializing" status; heartbeat, feedback and
+        emergency stop are handled immediately.  Start-up metrics are
+        measured from this call.
+        """
+        with self._deferred_lock:
+            self._deferred_commands.clear()
+            self.system_state = SystemState.INITIALIZING
+        self._startup_t0 = time.monotonic()
+        for key in self.startup_metrics:
+            self.startup_metrics[key] = None
+
+    def finish_startup(self, success: bool):
+        """
+        Leave the INITIALIZING state and release or discard queued commands.
+
+        Parameters
+        ----------
+        success : bool
+            True if the hardware came up; queued commands are then dispatched
+            in arrival order.  False drops them and enters the ERROR state.
+        """
+        elapsed = time.monotonic() - self._startup_t0
+        self.startup_metrics["time_to_ready"] = elapsed
+        with self._deferred_lock:
+            pending = list(self._deferred_commands)
+            self._deferred_commands.clear()
+            if self.system_state == SystemState.INITIALIZING:
+                self.system_state = SystemState.IDLE if success else SystemState.ERROR
+            # Re-queue while still holding the lock so the commands run
+            # before anything that arrives after the state change
+            if success:
+                for payload in pending:
+                    self._cmd_queue.put(payload)
+
+        if success:
+            self.logger.info(
+                f"Startup: hardware ready {elapsed:.2f}s after start, "
+                f"dispatching {len(pending)} queued command(s)"
+            )
+        else:
+            self.logger.error(
+                f"Startup failed after {elapsed:.2f}s, "
+                f"discarding {len(pending)} queued command(s)"
+            )
+        self.publish_startup_status(dropped=0 if success else len(pending))
+
+    def publish_startup_status(self, command: Optional[str] = None,
+                               dropped: int = 0) -> bool:
+        """
+        Publish a JSON start-up status on the status topic.
+
+        Example::
+
+            {"state": "initializing", "queued": 1, "command": "m1 -> up",
+             "startup": {"time_to_online": 0.41, "time_to_ready": null,
+                         "time_to_first_move": null}}
+        """
+        with self._deferred_lock:
+            status = {
+                "state": self.system_state.value,
+                "queued": len(self._deferred_commands),
+            }
+        if command is not None:
+            status["command"] = command
+        if dropped:
+            status["dropped"] = dropped
+        status["startup"] = {
+            key: None if value is None else round(value, 3)
+            for key, value in self.startup_metrics.items()
+        }
+        return self.publish_status(json.dumps(status))
+
+    def _defer_if_initializing(self, payload: str) -> bool:
+        """Queue payload if start-up is still in progress.  True if handled."""
+        if payload == "Heartbeat" or payload.startswith("Feedback"):
+            return False
+        if payload == "emergency_stop" or payload.replace(" ", "").lower().endswith("->stop"):
+            return False
+        with self._deferred_lock:
+            if self.system_state != SystemState.INITIALIZING:
+                return False
+            if len(self._deferred_commands) >= config.STARTUP_COMMAND_QUEUE_SIZE:
+                self.logger.warning(f"Start-up command queue full, rejecting: {payload}")
+                accepted = False
+            else:
+                self._deferred_commands.append(payload)
+                self.logger.info(f"Hardware initializing, queued command: {payload}")
+                accepted = True
+        if accepted:
+            self.publish_startup_status(command=payload)
+        else:
+            self.publish_status(json.dumps({
+                "state": SystemState.INITIALIZING.value,
+                "rejected": payload,
+                "reason": "queue_full",
+            }))
+        return True
+
     ################################################################################
     #                           MQTT INTEGRATION
     ################################################################################
@@ -1165,7 +1542,7 @@ class DeskControllerWrapper:
         bool
             True if successful, False otherwise
         """
-        if not MQTT_AVAILABLE:
+        if _load_mqtt() is None:
             self.logger.warning("MQTT not available (paho-mqtt not installed)")
             return False
         
@@ -1228,6 +1605,12 @@ class DeskControllerWrapper:
             self.logger.info(f"✓ MQTT connected (return code: {rc})")
             # QoS 0 — fire-and-forget; eliminates ACK round-trip latency on local LAN
             client.subscribe(self.mqtt_config["command_topic"], 0)
+            if self.startup_metrics["time_to_online"] is None:
+                elapsed = time.monotonic() - self._startup_t0
+                self.startup_metrics["time_to_online"] = elapsed
+                self.logger.info(f"Startup: online {elapsed:.2f}s after start")
+            if self.system_state == SystemState.INITIALIZING:
+                self.publish_startup_status()
         else:
             self.logger.error(f"✗ MQTT connection refused (return code: {rc})")
     
@@ -1259,6 +1642,10 @@ class DeskControllerWrapper:
     def _dispatch_command(self, payload: str):
         """Route a decoded MQTT payload to the appropriate handler.
 
+        While start-up is in progress (begin_startup) commands other than
+        heartbeat, feedback and stops are queued instead; see
+        _defer_if_initializing.
+
         Routing order (first match wins):
           "Heartbeat"           – publish heartbeat_ok status.
           "Feedback{N}:{v}"    – update cached motor position under position_lock.
@@ -1273,6 +1660,9 @@ class DeskControllerWrapper:
         try:
             self.logger.debug(f"MQTT message received: {payload}")
 
+            if self._defer_if_initializing(payload):
+                return
+
             # Handle different command types
             if payload == "Heartbeat":
                 self.publish_status("heartbeat_ok")
@@ -1465,6 +1855,51 @@ class DeskControllerWrapper:
             self.logger.error(f"Error publishing feedback for M{motor_id}: {e}")
             return False
     
+    def publish_eta(self, motor_id: int, target_value: float) -> bool:
+        """
+        Publish the model-estimated travel time for an upcoming move.
+
+        The estimate comes from the actuator's learned motion model
+        (motion_model.estimate_move_time) and is published on
+        ``{feedback_topic}/motor{N}/eta`` as ``ETA{N}:{seconds}``.  Nothing
+        is published until the model is trained or while the motor's current
+        position is unknown.
+
+        Parameters
+        ----------
+        motor_id : int
+            Motor ID (1-3)
+        target_value : float
+            Target value (degrees for M1, millimeters for M2/M3)
+
+        Returns
+        -------
+        bool
+            True if an ETA was published, False otherwise
+        """
+        if not self.mqtt_connected or self.mqtt_client is None:
+            return False
+
+        try:
+            sensor_name = self._sensor_for_motor(motor_id)
+            with self.position_lock:
+                current = self.motor_positions.get(motor_id)
+
+            eta = motion_model.estimate_move_time(sensor_name, current, target_value)
+            if eta is None:
+                return False
+
+            topic = f"{self.mqtt_config['feedback_topic']}/motor{motor_id}/eta"
+            payload = f"ETA{motor_id}:{eta:.1f}"
+
+            with self.mqtt_lock:
+                self.mqtt_client.publish(topic, payload)
+
+            return True
+        except Exception as e:
+            self.logger.error(f"Error publishing ETA for M{motor_id}: {e}")
+            return False
+
     def publish_all_position_feedback(self) -> bool:
         """
         Publish position feedback for all motors.
@@ -1482,6 +1917,8 @@ class DeskControllerWrapper:
         try:
             if not self.mqtt_connected or self.mqtt_client is None:
                 return False
+
+            self._refresh_idle_positions()
             
             all_success = True
             for motor_id in [1, 2, 3]:
@@ -1494,6 +1931,31 @@ class DeskControllerWrapper:
             self.logger.error(f"Error publishing all position feedback: {e}")
             return False
     
+    def _refresh_idle_positions(self):
+        """Update cached positions of idle motors from the sensor sampler.
+
+        Only motors that are not currently moving are refreshed, and only
+        when the sampler holds a fresh sample, so this never touches the I2C
+        bus and never races the motor worker's own position bookkeeping.
+        """
+        if self.sampler is None or not self.sampler.running:
+            return
+
+        for motor_id in [1, 2, 3]:
+            if self.motor_status[motor_id] == "moving":
+                continue
+            sensor_name = self._sensor_for_motor(motor_id)
+            if self.sampler.latest(sensor_name) is None:
+                continue
+            # The tilt angle carries no software offset
+            if motor_id == 1:
+                value = self.read_sensor_raw(sensor_name)
+            else:
+                value = self.read_sensor_calibrated(sensor_name)
+            if value is not None:
+                with self.position_lock:
+                    self.motor_positions[motor_id] = value
+    
     ################################################################################
     #                           STATUS & MONITORING
     ################################################################################
@@ -1509,6 +1971,7 @@ class DeskControllerWrapper:
         """
         with self.position_lock:
             positions = self.motor_positions.copy()
+        mux = self.sensors.get(config.SENSOR_MUX)
         
         return {
             "initialized": self.is_initialized,
@@ -1517,6 +1980,12 @@ class DeskControllerWrapper:
             "motor_status": self.motor_status.copy(),
             "mqtt_connected": self.mqtt_connected,
             "motor_lock_held": self.motor_command_lock.locked(),
+            "startup": dict(self.startup_metrics),
+            "serial_stop_latency": (
+                self.serial_writer.stop_latency_stats()
+                if self.serial_writer is not None else None
+            ),
+            "bus": mux.stats() if hasattr(mux, "stats") else None,
             "timestamp": datetime.now().isoformat(),
         }
     
@@ -1557,6 +2026,14 @@ class DeskControllerWrapper:
             
             # Stop motors
             self.emergency_stop_all()
+
+            if self.is_initialized:
+                self._save_cached_positions()
+
+            # Stop background sensor sampling
+            if self.sampler is not None:
+                self.sampler.stop()
+                self.sensors.pop(config.SENSOR_SAMPLER, None)
             
             # Disconnect MQTT
             if self.mqtt_connected:
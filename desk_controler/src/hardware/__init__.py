@@ -1,14 +1,56 @@
-from .i2c_utils import init_i2c, init_mux, scan_i2c_channels
-from .sensors import init_vl53l0x, init_adxl345, get_sensor_value
-from .serial_comm import init_serial
-
-__all__ = [
-    'init_i2c',
-    'init_mux',
-    'scan_i2c_channels',
-    'init_vl53l0x',
-    'init_adxl345',
-    'get_sensor_value',
-    'init_serial'
-
-]
+"""
+Hardware access: I2C bus and multiplexer, sensors, serial port, sampler.
+
+Submodules are imported on first attribute access (PEP 562), and the driver
+libraries (board, busio, adafruit_*, serial) only inside the init functions
+that need them, so importing this package is cheap and does not require the
+Raspberry Pi stack to be installed.
+"""
+
+# public name → submodule that defines it
+_EXPORTS = {
+    'init_i2c': 'i2c_utils',
+    'init_mux': 'i2c_utils',
+    'scan_i2c_channels': 'i2c_utils',
+    'probe_address': 'i2c_utils',
+    'BusScheduler': 'bus_scheduler',
+    'init_vl53l0x': 'sensors',
+    'init_adxl345': 'sensors',
+    'get_sensor_value': 'sensors',
+    'read_sensor': 'sensors',
+    'continuous_ranging': 'sensors',
+    'set_timing_budget': 'sensors',
+    'init_serial': 'serial_comm',
+    'CommandSerial': 'serial_comm',
+    'SerialWriter': 'serial_comm',
+    'SensorSampler': 'sampler',
+    'Sample': 'sampler',
+    'PacketError': 'protocol',
+    'encode': 'protocol',
+    'decode': 'protocol',
+    'combine': 'protocol',
+    'load_hardware_cache': 'warm_start',
+    'save_hardware_cache': 'warm_start',
+    'save_motor_positions': 'warm_start',
+    'cached_motor_positions': 'warm_start',
+    'warm_init_vl53l0x': 'warm_start',
+    'warm_init_adxl345': 'warm_start',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # __import__ rather than importlib.import_module so that
+    # python -X importtime (tests/bench_import_time.py) records the cost
+    module = __import__(f"{__name__}.{submodule}", fromlist=[name])
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,188 @@
+"""
+Channel-affinity access to the TCA9548A multiplexer.
+
+The adafruit_tca9548a channel objects write the channel-select byte to the
+mux every time they are locked and write 0x00 (all channels off) every time
+they are unlocked, so each group of transactions costs two extra bus writes
+even when consecutive reads go to the same channel.
+
+BusScheduler owns the TCA9548A and hands out drop-in channel objects
+(tca[channel] works as before) that:
+
+  * select a channel only when it is not already the active one,
+  * leave it selected on unlock, so the next access to the same channel
+    needs no select at all, and
+  * count locks, selects, skipped selects, transactions and errors per
+    channel (stats()).
+
+Leaving a channel enabled is safe because every device on the mux is reached
+through the scheduler; on any I2C error the active channel is forgotten and
+re-selected on the next lock, in case the mux itself was reset.
+
+order() arranges pending reads so that those on the active channel run
+first and the rest are grouped channel by channel; the SensorSampler uses it
+to drain all sensors that are due in one pass.
+"""
+
+import time
+
+
+class _ChannelStats:
+    __slots__ = ("locks", "selects", "skipped_selects", "transactions", "errors")
+
+    def __init__(self):
+        self.locks = 0
+        self.selects = 0
+        self.skipped_selects = 0
+        self.transactions = 0
+        self.errors = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ScheduledChannel:
+    """One mux channel; the I2C interface expected by the Adafruit drivers."""
+
+    def __init__(self, scheduler, channel):
+        self._scheduler = scheduler
+        self.channel = channel
+
+    def try_lock(self):
+        """
+        Lock the bus and select this channel if needed.
+
+        Waits for the bus like the adafruit_tca9548a channel does, so it
+        always returns True.
+        """
+        return self._scheduler._acquire(self.channel)
+
+    def unlock(self):
+        """Release the bus; the channel stays selected."""
+        self._scheduler._release()
+
+    def readfrom_into(self, address, buffer, **kwargs):
+        return self._scheduler._transfer(self.channel, "readfrom_into",
+                                         address, buffer, **kwargs)
+
+    def writeto(self, address, buffer, **kwargs):
+        return self._scheduler._transfer(self.channel, "writeto",
+                                         address, buffer, **kwargs)
+
+    def writeto_then_readfrom(self, address, buffer_out, buffer_in, **kwargs):
+        return self._scheduler._transfer(self.channel, "writeto_then_readfrom",
+                                         address, buffer_out, buffer_in, **kwargs)
+
+    def scan(self):
+        """Addresses answering on this channel (excluding the mux itself)."""
+        found = self._scheduler._transfer(self.channel, "scan")
+        return [addr for addr in found if addr != self._scheduler.address]
+
+    def __repr__(self):
+        return f"ScheduledChannel({self.channel})"
+
+
+class BusScheduler:
+    """Owns a TCA9548A and skips channel selects that would change nothing."""
+
+    def __init__(self, tca):
+        """
+        Parameters
+        ----------
+        tca : adafruit_tca9548a.TCA9548A (or any object with .i2c and
+              .address) — the multiplexer to manage.
+        """
+        self.tca = tca
+        self.i2c = tca.i2c
+        self.address = tca.address
+        self._active = None          # selected channel, None = unknown
+        self._channels = {}
+        self._stats = {}
+
+    def __len__(self):
+        return 8
+
+    def __getitem__(self, channel):
+        if not 0 <= channel <= 7:
+            raise IndexError("Channel must be an integer in the range: 0-7.")
+        scheduled = self._channels.get(channel)
+        if scheduled is None:
+            scheduled = self._channels[channel] = ScheduledChannel(self, channel)
+            self._stats[channel] = _ChannelStats()
+        return scheduled
+
+    @property
+    def active_channel(self):
+        """Channel currently enabled on the mux, or None if unknown."""
+        return self._active
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def order(self, items, channel_of):
+        """
+        Return items in the order that needs the fewest channel selects.
+
+        Items on the active channel come first, then the others grouped by
+        channel (ascending); the relative order within a channel is kept.
+        channel_of maps an item to its mux channel (None for items not on
+        the mux, which go last).
+        """
+        active = self._active
+
+        def key(item):
+            channel = channel_of(item)
+            if channel is None:
+                return (2, 0)
+            return (0, 0) if channel == active else (1, channel)
+
+        return sorted(items, key=key)
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    def stats(self):
+        """{channel: {locks, selects, skipped_selects, transactions, errors}}"""
+        return {channel: s.as_dict() for channel, s in sorted(self._stats.items())}
+
+    def reset_stats(self):
+        for channel in self._stats:
+            self._stats[channel] = _ChannelStats()
+
+    # ------------------------------------------------------------------
+    # Bus access (called by ScheduledChannel)
+    # ------------------------------------------------------------------
+
+    def _acquire(self, channel):
+        while not self.i2c.try_lock():
+            time.sleep(0)
+        stats = self._stats[channel]
+        stats.locks += 1
+        if self._active == channel:
+            stats.skipped_selects += 1
+            return True
+        try:
+            self.i2c.writeto(self.address, bytes((1 << channel,)))
+        except Exception:
+            self._active = None
+            stats.errors += 1
+            self.i2c.unlock()
+            raise
+        self._active = channel
+        stats.selects += 1
+        return True
+
+    def _release(self):
+        self.i2c.unlock()
+
+    def _transfer(self, channel, method, *args, **kwargs):
+        stats = self._stats[channel]
+        stats.transactions += 1
+        try:
+            return getattr(self.i2c, method)(*args, **kwargs)
+        except Exception:
+            stats.errors += 1
+            self._active = None
+            raise
@@ -1,40 +1,48 @@
 import time
-import board
-import busio
-import adafruit_tca9548a
 
-from utils.timeout import timeout, TimeoutError
+from utils.timeout import TimeoutError, Deadline, call_with_timeout
 import config
 
 
 def init_i2c(init_timeout=3.0):
     """Initialize I2C bus with timeout protection"""
+    import board
+    import busio
+
     print("Initializing I2C bus...")
     
-    with timeout(init_timeout, "I2C bus initialization timed out"):
-        i2c = busio.I2C(board.SCL, board.SDA)
-        start = time.monotonic()
-        while not i2c.try_lock():
-            if time.monotonic() - start > 2.0:
-                raise TimeoutError("I2C bus lock timeout")
-            time.sleep(0.01)
-        i2c.unlock()
+    deadline = Deadline(init_timeout)
+    i2c = call_with_timeout(lambda: busio.I2C(board.SCL, board.SDA),
+                            init_timeout, "I2C bus initialization timed out")
+    lock_deadline = Deadline(min(2.0, deadline.remaining))
+    while not i2c.try_lock():
+        lock_deadline.check("I2C bus lock timeout")
+        time.sleep(0.01)
+    i2c.unlock()
     
     print("I2C Bus opened successfully")
     return i2c
 
 
 def init_mux(i2c, retries=config.I2C_RETRIES, retry_delay=config.RETRY_DELAY):
-    """Initialize TCA9548A multiplexer"""
+    """
+    Initialize TCA9548A multiplexer.
+
+    Returned wrapped in a BusScheduler when config.I2C_BUS_SCHEDULER is set;
+    either way tca[channel] gives the bus object for that channel.
+    """
+    import adafruit_tca9548a
+    from hardware.bus_scheduler import BusScheduler
+
     print("Initializing TCA9548A multiplexer...")
     
     last_exc = None
     for attempt in range(1, retries + 1):
         try:
-            with timeout(3, "TCA9548A initialization timed out"):
-                tca = adafruit_tca9548a.TCA9548A(i2c)
-                print("TCA9548A initialized successfully")
-                return tca
+            tca = call_with_timeout(lambda: adafruit_tca9548a.TCA9548A(i2c),
+                                    3, "TCA9548A initialization timed out")
+            print("TCA9548A initialized successfully")
+            return BusScheduler(tca) if config.I2C_BUS_SCHEDULER else tca
         except Exception as e:
             last_exc = e
             print(f"TCA9548A attempt {attempt}/{retries} failed: {e}")
@@ -45,37 +53,82 @@ def init_mux(i2c, retries=config.I2C_RETRIES, retry_delay=config.RETRY_DELAY):
 
 
 def scan_i2c_channels(tca, timeout_per_channel=1.0):
-    """Scan all TCA9548A channels for I2C devices"""
+    """
+    Scan all TCA9548A channels for I2C devices.
+
+    Diagnostic only: probing all 112 addresses on 8 channels takes seconds,
+    so start-up runs it only when config.I2C_DIAGNOSTIC_SCAN is set.
+    """
     print("\nScanning I2C channels...")
+    def _scan(channel):
+        if tca[channel].try_lock():
+            try:
+                addresses = tca[channel].scan()
+                devices = [hex(addr) for addr in addresses if addr != 0x70]
+                print(f"Channel {channel}: {devices if devices else 'No devices'}")
+            finally:
+                tca[channel].unlock()
+
     for channel in range(8):
         try:
-            with timeout(timeout_per_channel, f"Channel {channel} scan timeout"):
-                if tca[channel].try_lock():
-                    try:
-                        addresses = tca[channel].scan()
-                        devices = [hex(addr) for addr in addresses if addr != 0x70]
-                        print(f"Channel {channel}: {devices if devices else 'No devices'}")
-                    finally:
-                        tca[channel].unlock()
+            call_with_timeout(lambda: _scan(channel), timeout_per_channel,
+                              f"Channel {channel} scan timeout")
         except TimeoutError as e:
             print(f"Channel {channel}: {e}")
 
 
+def _as_address(addr):
+    """Accept an address as int or hex string ('0x29')."""
+    return int(addr, 16) if isinstance(addr, str) else int(addr)
+
+
+def probe_address(tca, channel, addr, id_register=None, expected_id=None):
+    """
+    Check for one device on a mux channel without scanning the bus.
+
+    Sends a single zero-length write to addr (falling back to a one-byte
+    read for adapters that cannot do zero-length writes).  When id_register
+    is given, that register is read instead and must equal expected_id.
+    The caller must hold the channel lock.
+
+    Returns True if the device acknowledged (and identified correctly).
+    """
+    bus = tca[channel]
+    addr = _as_address(addr)
+    try:
+        if id_register is not None:
+            result = bytearray(1)
+            bus.writeto_then_readfrom(addr, bytes([id_register]), result)
+            return expected_id is None or result[0] == expected_id
+        try:
+            bus.writeto(addr, b"")
+        except OSError:
+            bus.readfrom_into(addr, bytearray(1))
+        return True
+    except OSError:
+        return False
+
+
 def require_address(tca, channel, addr, name, retries=config.I2C_RETRIES, retry_delay=config.RETRY_DELAY):
-    """Verify sensor address on specific channel"""
+    """
+    Verify sensor address on specific channel.
+
+    Only the expected address is probed (see probe_address); devices listed
+    in config.I2C_DEVICE_IDS are also identified by their ID register.
+    addr may be an int or a hex string.
+    """
+    address = _as_address(addr)
+    id_register, expected_id = config.I2C_DEVICE_IDS.get(address, (None, None))
+
     def _check():
         if tca[channel].try_lock():
             try:
-                addresses = tca[channel].scan()
-                found = [hex(address) for address in addresses if address != 0x70]
-            
-                if addr not in found:
+                if not probe_address(tca, channel, address, id_register, expected_id):
                     raise RuntimeError(
                         f"{name} not found on channel {channel} "
-                        f"(expected {addr}, found {found})"
+                        f"(expected {hex(address)})"
                     )
-                else:
-                    print(f"{name} found at {addr} on channel {channel}")
+                print(f"{name} found at {hex(address)} on channel {channel}")
             finally:
                 tca[channel].unlock()
         else:
@@ -84,9 +137,8 @@ def require_address(tca, channel, addr, name, retries=config.I2C_RETRIES, retry_
     last_exc = None
     for attempt in range(1, retries + 1):
         try:
-            with timeout(2, f"{name} address check timed out"):
-                _check()
-                return
+            call_with_timeout(_check, 2, f"{name} address check timed out")
+            return
         except Exception as e:
             last_exc = e
             if attempt < retries:
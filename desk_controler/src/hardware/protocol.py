@@ -0,0 +1,159 @@
+"""
+Motor controller serial protocol.
+
+Every command is a 3-byte packet:
+
+    byte 0  header    0x5A
+    byte 1  command   one extend bit and one retract bit per motor
+    byte 2  checksum  (header + command) & 0xFF
+
+    Motor   extend  retract
+    M1      0x01    0x02
+    M2      0x04    0x08
+    M3      0x10    0x20
+
+A motor may be extending, retracting or off, but never both at once, so
+there are exactly 3³ = 27 valid packets.  They are all encoded once at
+import time; encode(), encode_command() and combine() only look packets up,
+so nothing is allocated in the motor control loop.
+"""
+
+import itertools
+
+
+HEADER = 0x5A
+
+EXTEND = "extend"
+RETRACT = "retract"
+OFF = "off"
+
+# Command bits per motor
+MOTOR_BITS = {
+    1: {EXTEND: 0x01, RETRACT: 0x02},
+    2: {EXTEND: 0x04, RETRACT: 0x08},
+    3: {EXTEND: 0x10, RETRACT: 0x20},
+}
+
+_VALID_BITS = 0
+for _bits in MOTOR_BITS.values():
+    _VALID_BITS |= _bits[EXTEND] | _bits[RETRACT]
+
+
+class PacketError(ValueError):
+    """Raised for malformed packets or impossible motor combinations."""
+
+
+def checksum(command: int) -> int:
+    """Return the checksum byte for a command byte."""
+    return (HEADER + command) & 0xFF
+
+
+def _check_command(command: int) -> None:
+    if not 0 <= command <= 0xFF:
+        raise PacketError(f"Command byte out of range: {command!r}")
+    if command & ~_VALID_BITS:
+        raise PacketError(f"Unknown command bits: 0x{command & ~_VALID_BITS:02x}")
+    for motor_id, bits in MOTOR_BITS.items():
+        if command & bits[EXTEND] and command & bits[RETRACT]:
+            raise PacketError(f"Motor {motor_id} cannot extend and retract at once")
+
+
+def _build_tables():
+    packets = {}
+    directions = {}
+    motors = sorted(MOTOR_BITS)
+    for combo in itertools.product((OFF, EXTEND, RETRACT), repeat=len(motors)):
+        command = 0
+        for motor_id, direction in zip(motors, combo):
+            if direction != OFF:
+                command |= MOTOR_BITS[motor_id][direction]
+        packet = bytes((HEADER, command, checksum(command)))
+        packets[command] = packet
+        directions[packet] = dict(zip(motors, combo))
+    return packets, directions
+
+
+# command byte → packet, and packet → {motor_id: direction}
+_PACKETS, _DIRECTIONS = _build_tables()
+
+ALL_OFF = _PACKETS[0]
+
+
+def encode_command(command: int) -> bytes:
+    """Return the cached packet for a raw command byte."""
+    packet = _PACKETS.get(command)
+    if packet is None:
+        _check_command(command)
+    return packet
+
+
+def encode(directions: dict) -> bytes:
+    """
+    Encode per-motor directions into a packet.
+
+    Parameters
+    ----------
+    directions : {motor_id: "extend" | "retract" | "off"}.  Motors that are
+                 not listed are off.
+
+    Returns
+    -------
+    The cached 3-byte packet.
+    """
+    command = 0
+    for motor_id, direction in directions.items():
+        if direction == OFF:
+            continue
+        try:
+            command |= MOTOR_BITS[motor_id][direction]
+        except KeyError:
+            raise PacketError(
+                f"Invalid motor/direction: {motor_id!r}/{direction!r}"
+            ) from None
+    return _PACKETS[command]
+
+
+def validate(packet: bytes) -> None:
+    """Raise PacketError unless packet is a well-formed command packet."""
+    packet = bytes(packet)
+    if packet in _DIRECTIONS:
+        return
+    if len(packet) != 3:
+        raise PacketError(f"Packet must be 3 bytes, got {len(packet)}")
+    header, command, check = packet
+    if header != HEADER:
+        raise PacketError(f"Bad header 0x{header:02x} (expected 0x{HEADER:02x})")
+    if check != checksum(command):
+        raise PacketError(
+            f"Bad checksum 0x{check:02x} (expected 0x{checksum(command):02x})"
+        )
+    _check_command(command)
+
+
+def decode(packet: bytes) -> dict:
+    """
+    Decode a packet into {motor_id: "extend" | "retract" | "off"}.
+
+    Raises PacketError if the packet is malformed.
+    """
+    directions = _DIRECTIONS.get(bytes(packet))
+    if directions is None:
+        validate(packet)  # always raises: every valid packet is cached
+    return dict(directions)
+
+
+def combine(packets) -> bytes:
+    """
+    Merge several packets into one by OR-ing their command bytes.
+
+    Each motor owns separate bits, so drive commands for different motors
+    combine into a single multi-motor packet.  An empty sequence yields
+    ALL_OFF.  Raises PacketError if an input is malformed or the result
+    would drive one motor both ways.
+    """
+    command = 0
+    for packet in packets:
+        if bytes(packet) not in _DIRECTIONS:
+            validate(packet)
+        command |= packet[1]
+    return encode_command(command)
@@ -0,0 +1,315 @@
+"""
+Background sensor sampler.
+
+SensorSampler runs on its own daemon thread and polls every configured sensor
+(both VL53L0X distance sensors and the ADXL345, all behind the TCA9548A) on a
+fixed schedule.  For each sensor it keeps:
+
+  * the latest Sample(timestamp, value), and
+  * a fixed-size ring buffer of the most recent samples.
+
+Only the sampler thread writes to these structures.  Readers never take a
+lock: replacing a dict entry and appending to a bounded deque are atomic
+under the GIL, so a reader always sees either the previous or the new sample.
+
+Motion-aware priority (optional, see idle_period): every sensor is polled at
+a slow background rate that still catches manual bumps, except the sensors
+of the axes that are moving, which are polled at their active rate.  Motor
+loops raise the rate for the duration of a move with prioritised(); the
+change takes effect immediately, so the first control cycle already sees
+fresh samples.
+
+When several sensors fall due together they are read in one pass, ordered by
+the mux's BusScheduler so that the fewest channel selects are needed.
+
+Consumers normally do not talk to the sampler directly.  It is registered in
+the sensors dict under config.SENSOR_SAMPLER and get_sensor_value() serves
+reads from its cache transparently, which keeps the MQTT thread and the motor
+worker thread from colliding on the I2C bus.  When the cached sample is
+stale, get_sensor_value() asks the sampler for an immediate poll with
+wait_for() instead of reading the sensor itself.
+"""
+
+import collections
+import contextlib
+import threading
+import time
+
+import config
+from hardware.sensors import read_sensor
+
+
+Sample = collections.namedtuple("Sample", ["timestamp", "value"])
+
+
+class SensorSampler:
+    """Poll sensors on a background thread and cache the latest readings."""
+
+    def __init__(self, sensors, periods=None,
+                 buffer_size=config.SAMPLER_BUFFER_SIZE,
+                 max_age=config.SAMPLER_MAX_AGE,
+                 idle_period=None, active_periods=None):
+        """
+        Parameters
+        ----------
+        sensors        : dict  — dictionary of initialised sensor objects.
+        periods        : dict  — {sensor_name: poll period in seconds}.
+                                 Sensors missing from the sensors dict are
+                                 skipped.  Defaults to config.SAMPLER_PERIODS.
+        buffer_size    : int   — number of samples kept per sensor.
+        max_age        : float — samples older than this (seconds) are
+                                 considered stale by latest() and window().
+        idle_period    : float — enables motion-aware priority: sensors not
+                                 prioritised() are polled this often (never
+                                 faster than their entry in periods).  None
+                                 polls every sensor at periods.
+        active_periods : dict  — {sensor_name: period} while prioritised.
+                                 Defaults to config.SAMPLER_ACTIVE_PERIODS;
+                                 sensors missing from it use periods.
+        """
+        if periods is None:
+            periods = config.SAMPLER_PERIODS
+        if active_periods is None:
+            active_periods = config.SAMPLER_ACTIVE_PERIODS
+        self._sensors = sensors
+        self._periods = {
+            name: period for name, period in periods.items() if name in sensors
+        }
+        self._max_age = max_age
+        self._latest = {name: None for name in self._periods}
+        self._buffers = {
+            name: collections.deque(maxlen=buffer_size) for name in self._periods
+        }
+        self._errors = {name: 0 for name in self._periods}
+        self._next_due = {name: 0.0 for name in self._periods}
+        self._last_poll = {}
+        self._idle_period = idle_period
+        self._active_periods = dict(active_periods)
+        self._boosts = collections.Counter()
+        self._priority_lock = threading.Lock()
+        self._reschedule = False
+        self._requested = set()
+        self._published = threading.Condition()
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Start the sampling thread (no-op if already running)."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._wake.clear()
+        now = time.monotonic()
+        self._next_due = {name: now for name in self._periods}
+        self._thread = threading.Thread(
+            target=self._run,
+            daemon=True,
+            name="sensor-sampler",
+        )
+        self._thread.start()
+        print(f"[sampler] Sampling {sorted(self._periods)}")
+
+    def stop(self, timeout=1.0):
+        """Stop the sampling thread and wait up to timeout seconds for it."""
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        with self._published:
+            self._published.notify_all()
+
+    @property
+    def running(self):
+        """True while the sampling thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    # ------------------------------------------------------------------
+    # Readers (callable from any thread; lock-free except wait_for())
+    # ------------------------------------------------------------------
+
+    def samples(self, sensor_name):
+        """True if sensor_name is polled by this sampler."""
+        return sensor_name in self._periods
+
+    def latest(self, sensor_name, max_age=None):
+        """
+        Return the newest Sample for sensor_name, or None if there is no
+        sample younger than max_age (default: the sampler's max_age).
+        """
+        sample = self._latest.get(sensor_name)
+        if sample is None or not self.running:
+            return None
+        if max_age is None:
+            max_age = self._max_age
+        if time.monotonic() - sample.timestamp > max_age:
+            return None
+        return sample
+
+    def window(self, sensor_name, n, max_age=None):
+        """
+        Return the values of the newest n samples for sensor_name, oldest
+        first, dropping any sample older than max_age.  May return fewer than
+        n values (or an empty list) when not enough fresh samples exist.
+        """
+        buffer = self._buffers.get(sensor_name)
+        if buffer is None or not self.running:
+            return []
+        if max_age is None:
+            max_age = self._max_age
+        cutoff = time.monotonic() - max_age
+        samples = list(buffer)[-n:]
+        return [s.value for s in samples if s.timestamp >= cutoff]
+
+    def samples_since(self, sensor_name, timestamp, max_age=None):
+        """
+        Return the fresh Samples for sensor_name taken strictly after
+        timestamp, oldest first.  Lets a consumer feed every new reading into
+        a streaming filter exactly once.
+        """
+        buffer = self._buffers.get(sensor_name)
+        if buffer is None or not self.running:
+            return []
+        if max_age is None:
+            max_age = self._max_age
+        cutoff = max(timestamp, time.monotonic() - max_age)
+        return [s for s in list(buffer) if s.timestamp > cutoff]
+
+    def wait_for(self, sensor_name, timeout):
+        """
+        Poll sensor_name as soon as the sampling thread is free and return
+        the new Sample.
+
+        Returns None if no new sample arrived within timeout seconds, or at
+        once if the sampler is not running or does not sample sensor_name.
+        Blocks on the sampler, never on the I2C bus.
+        """
+        if sensor_name not in self._periods or not self.running:
+            return None
+        with self._published:
+            previous = self._latest.get(sensor_name)
+            with self._priority_lock:
+                self._requested.add(sensor_name)
+            self._wake.set()
+            self._published.wait_for(
+                lambda: self._latest.get(sensor_name) is not previous or not self.running,
+                timeout,
+            )
+            sample = self._latest.get(sensor_name)
+        return sample if sample is not previous else None
+
+    def error_count(self, sensor_name):
+        """Return the number of consecutive failed reads for sensor_name."""
+        return self._errors.get(sensor_name, 0)
+
+    # ------------------------------------------------------------------
+    # Motion-aware priority
+    # ------------------------------------------------------------------
+
+    def period(self, sensor_name):
+        """Current poll period of sensor_name in seconds."""
+        base = self._periods[sensor_name]
+        if self._idle_period is None:
+            return base
+        if self._boosts[sensor_name]:
+            return self._active_periods.get(sensor_name, base)
+        return max(self._idle_period, base)
+
+    @contextlib.contextmanager
+    def prioritised(self, *sensor_names):
+        """
+        Poll sensor_names at their active rate for the duration of the block.
+
+        Nests and overlaps safely (e.g. a coordinated move and a single-axis
+        move of the same sensor).  A no-op without idle_period.
+        """
+        names = [n for n in sensor_names if n in self._periods]
+        self._set_priority(names, +1)
+        try:
+            yield
+        finally:
+            self._set_priority(names, -1)
+
+    def _set_priority(self, sensor_names, delta):
+        if self._idle_period is None or not sensor_names:
+            return
+        with self._priority_lock:
+            for name in sensor_names:
+                self._boosts[name] += delta
+                if self._boosts[name] <= 0:
+                    del self._boosts[name]
+            self._reschedule = True
+        self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Sampling thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        """Serve the sensors as they fall due until stop() is called."""
+        while not self._stop_event.is_set():
+            if not self._next_due:
+                return
+            now = time.monotonic()
+            if self._reschedule:
+                self._apply_priority(now)
+            due = [name for name, t in self._next_due.items() if t <= now]
+            if self._requested:
+                with self._priority_lock:
+                    requested, self._requested = self._requested, set()
+                due += [name for name in requested if name not in due]
+            if not due:
+                self._wake.wait(min(self._next_due.values()) - now)
+                self._wake.clear()
+                continue
+
+            for sensor_name in self._poll_order(due):
+                self._last_poll[sensor_name] = time.monotonic()
+                self._poll(sensor_name)
+
+                # Fixed schedule: the next slot is one period after the previous
+                # slot, but never in the past if a slow read made us fall behind.
+                self._next_due[sensor_name] = max(
+                    self._next_due[sensor_name] + self.period(sensor_name),
+                    time.monotonic(),
+                )
+
+    def _apply_priority(self, now):
+        """Re-plan every sensor from its last poll after a priority change."""
+        with self._priority_lock:
+            self._reschedule = False
+            for name in self._next_due:
+                self._next_due[name] = self._last_poll.get(name, now) + self.period(name)
+
+    def _poll_order(self, sensor_names):
+        """Order due sensors by mux channel when a BusScheduler is in use."""
+        mux = self._sensors.get(config.SENSOR_MUX)
+        if not hasattr(mux, "order"):
+            return sensor_names
+        return mux.order(sensor_names, config.SENSOR_CHANNELS.get)
+
+    def _poll(self, sensor_name):
+        """Read one sensor and publish the result to the cache."""
+        try:
+            value = read_sensor(self._sensors, sensor_name)
+        except Exception as e:
+            self._errors[sensor_name] += 1
+            if self._errors[sensor_name] == 1:
+                print(f"[sampler] {sensor_name} read failed: {e}")
+            return
+
+        if self._errors[sensor_name]:
+            print(f"[sampler] {sensor_name} recovered after "
+                  f"{self._errors[sensor_name]} failed read(s)")
+            self._errors[sensor_name] = 0
+
+        sample = Sample(time.monotonic(), value)
+        self._buffers[sensor_name].append(sample)
+        with self._published:
+            self._latest[sensor_name] = sample
+            self._published.notify_all()
@@ -1,22 +1,39 @@
+import math
+import threading
 import time
-import adafruit_vl53l0x
-import adafruit_adxl34x
+from contextlib import contextmanager
 
-from utils.timeout import timeout, TimeoutError
+from utils.timeout import TimeoutError, Deadline, call_with_timeout
 from hardware.i2c_utils import require_address
 import config
-from utils import vector_to_degrees, z_axis_to_degrees
+from calibration_store import get_store
+from utils import (vector_to_degrees, z_axis_to_degrees, z_axis_to_degrees_batch,
+                   tilt_degrees, tilt_degrees_batch)
+
+
+VL53_SENSORS = (config.SENSOR_VL53_0, config.SENSOR_VL53_1)
+
+# Most recent completed measurement per VL53L0X, used in continuous mode to
+# answer reads that arrive before the next measurement has finished.
+_last_range = {}
+
+# {sensor_name: (driver object, timing budget in µs)} as last programmed by
+# set_timing_budget(), so an unchanged budget costs no bus traffic.
+_timing_budget = {}
+# Serialises set_timing_budget() against range reads of the same VL53L0X
+# (the sampler thread reads while the motor thread retunes).
+_vl53_locks = {name: threading.Lock() for name in VL53_SENSORS}
 
 
 def retry_with_timeout(fn, name, retries=config.I2C_RETRIES,
                        retry_delay=config.RETRY_DELAY,
                        timeout_seconds=config.OPERATION_TIMEOUT):
-    """Retry a function with timeout protection."""
+    """Retry a function with timeout protection (safe on any thread)."""
     last_exc = None
     for attempt in range(1, retries + 1):
         try:
-            with timeout(timeout_seconds, f"{name} timed out after {timeout_seconds}s"):
-                return fn()
+            return call_with_timeout(fn, timeout_seconds,
+                                     f"{name} timed out after {timeout_seconds}s")
         except (TimeoutError, Exception) as e:
             last_exc = e
             print(f"{name} attempt {attempt}/{retries} failed: {e}")
@@ -25,29 +42,54 @@ def retry_with_timeout(fn, name, retries=config.I2C_RETRIES,
     raise RuntimeError(f"{name} failed after {retries} attempts: {last_exc}")
 
 
-def read_with_timeout(fn, name, timeout_seconds=config.READ_TIMEOUT):
-    """Read from sensor with timeout protection."""
-    start = time.monotonic()
+def read_with_timeout(fn, name, timeout_seconds=config.READ_TIMEOUT, lock=None):
+    """
+    Read from sensor with timeout protection.
+
+    Failed reads are retried until the deadline; a read that hangs is
+    abandoned as soon as the deadline passes instead of stalling the caller.
+    With lock (the sensor's lock) the read holds it while it runs, also once
+    abandoned, so nothing else touches the sensor until the hung transaction
+    has returned.
+    """
+    deadline = Deadline(timeout_seconds)
     while True:
         try:
-            return fn()
+            return call_with_timeout(fn, deadline.remaining,
+                                     f"{name} read timed out after {timeout_seconds}s",
+                                     lock=lock)
+        except TimeoutError:
+            raise
         except Exception as e:
-            if time.monotonic() - start > timeout_seconds:
+            if deadline.expired:
                 raise TimeoutError(f"{name} read timed out after {timeout_seconds}s: {e}")
-            time.sleep(0.01)
+            time.sleep(min(0.01, deadline.remaining))
+
+
+def _vl53_read_timeout(sensor=None):
+    """Read deadline for a VL53L0X: READ_TIMEOUT, but never under two budgets."""
+    budget_us = getattr(sensor, "_measurement_timing_budget_us", None)
+    if not isinstance(budget_us, int):
+        budget_us = config.VL53_TIMING_BUDGET
+    return max(config.READ_TIMEOUT, 2 * budget_us / 1_000_000)
 
 
 def init_vl53l0x(tca, channel, name):
     """Initialize VL53L0X time-of-flight sensor."""
+    import adafruit_vl53l0x
+
     print(f"Initializing {name}...")
-    require_address(tca, channel, hex(config.VL53_ADDRESS), name)
+    require_address(tca, channel, config.VL53_ADDRESS, name)
 
     def _init():
         sensor = adafruit_vl53l0x.VL53L0X(tca[channel])
         sensor.measurement_timing_budget = config.VL53_TIMING_BUDGET
         sensor.signal_rate_limit = config.VL53_RATE_LIMIT
         sensor.sigma_limit = config.VL53_SIGMA_LIMIT
-        read_with_timeout(lambda: sensor.range, f"{name} range validation")
+        read_with_timeout(lambda: sensor.range, f"{name} range validation",
+                          timeout_seconds=_vl53_read_timeout(sensor))
+        if config.VL53_RANGING_MODE == "continuous":
+            sensor.start_continuous()
         return sensor
 
     sensor = retry_with_timeout(_init, name)
@@ -57,12 +99,16 @@ def init_vl53l0x(tca, channel, name):
 
 def init_adxl345(tca):
     """Initialize ADXL345 accelerometer."""
+    import adafruit_adxl34x
+
     print("Initializing ADXL345 accelerometer...")
-    require_address(tca, config.ADXL345_CHANNEL, hex(config.ADXL_ADDRESS), "ADXL345")
+    require_address(tca, config.ADXL345_CHANNEL, config.ADXL_ADDRESS, "ADXL345")
 
     def _init():
         sensor = adafruit_adxl34x.ADXL345(tca[config.ADXL345_CHANNEL])
         read_with_timeout(lambda: sensor.acceleration, "ADXL345 acceleration validation")
+        if config.ADXL_STREAM_MODE:
+            configure_adxl_stream(sensor)
         return sensor
 
     sensor = retry_with_timeout(_init, "ADXL345")
@@ -74,6 +120,40 @@ def get_sensor_value(sensors, sensor_name):
     """
     Get the current value from a named sensor.
 
+    When a running SensorSampler is registered under config.SENSOR_SAMPLER the
+    cached value is returned without touching the I2C bus.  If the cached
+    value is older than config.SAMPLER_MAX_AGE the sampler is asked for an
+    immediate poll, so the bus is still only ever read by the sampler thread;
+    TimeoutError is raised when none arrives within
+    config.SAMPLER_WAIT_TIMEOUT.  Without a running sampler, or for a sensor
+    it does not sample, a direct read is performed instead.
+
+    Parameters
+    ----------
+    sensors     : dict  — dictionary of initialised sensor objects.
+    sensor_name : str   — one of the config.SENSOR_* constants.
+
+    Returns
+    -------
+    Same as read_sensor().
+    """
+    sampler = sensors.get(config.SENSOR_SAMPLER)
+    if sampler is not None and sampler.running:
+        sample = sampler.latest(sensor_name)
+        if sample is None and sampler.samples(sensor_name):
+            sample = sampler.wait_for(sensor_name, config.SAMPLER_WAIT_TIMEOUT)
+            if sample is None:
+                raise TimeoutError(f"{sensor_name}: no sample from the sampler "
+                                   f"within {config.SAMPLER_WAIT_TIMEOUT}s")
+        if sample is not None:
+            return sample.value
+    return read_sensor(sensors, sensor_name)
+
+
+def read_sensor(sensors, sensor_name):
+    """
+    Read a named sensor directly over I2C, bypassing the sampler cache.
+
     Parameters
     ----------
     sensors     : dict  — dictionary of initialised sensor objects.
@@ -84,28 +164,33 @@ def get_sensor_value(sensors, sensor_name):
     int   : Distance in millimetres for VL53L0X sensors.
     float : Tilt angle in degrees for the ADXL345.
 
-              Convention (Z-axis only):
+              Convention (angle of the gravity vector from −Z; see
+              config.ADXL_TILT_3AXIS):
                   0°   → sensor upside down   (Z ≈ −g)
                   90°  → sensor perpendicular  (Z ≈  0)
                   180° → sensor right-side up  (Z ≈ +g)
     """
-    if sensor_name == config.SENSOR_VL53_0:
-        return read_with_timeout(
-            lambda: sensors[config.SENSOR_VL53_0].range,
-            f"{config.SENSOR_VL53_0} range read",
-        )
-
-    elif sensor_name == config.SENSOR_VL53_1:
-        return read_with_timeout(
-            lambda: sensors[config.SENSOR_VL53_1].range,
-            f"{config.SENSOR_VL53_1} range read",
-        )
+    if sensor_name in VL53_SENSORS:
+        return _read_range(sensors[sensor_name], sensor_name)
 
     elif sensor_name == config.SENSOR_ADXL:
+        sensor = sensors[config.SENSOR_ADXL]
+        if config.ADXL_STREAM_MODE and _supports_adxl_fast_read(sensor):
+            return _read_tilt_stream(sensor)
+        if config.ADXL_FAST_READ and _supports_adxl_fast_read(sensor):
+            counts = read_with_timeout(
+                lambda: read_adxl_counts(sensor),
+                f"{config.SENSOR_ADXL} acceleration read",
+            )
+            return adxl_counts_to_tilt(*counts)
         x, y, z = read_with_timeout(
             lambda: sensors[config.SENSOR_ADXL].acceleration,
             f"{config.SENSOR_ADXL} acceleration read",
         )
+        if config.ADXL_TILT_3AXIS:
+            # The calibration is in counts; undo the driver's m/s² scaling
+            scale = config.ADXL_MS2_PER_COUNT
+            return adxl_counts_to_tilt(x / scale, y / scale, z / scale)
         return z_axis_to_degrees(z)
 
     else:
@@ -114,3 +199,361 @@ def get_sensor_value(sensors, sensor_name):
             f"Valid names: {config.SENSOR_VL53_0!r}, "
             f"{config.SENSOR_VL53_1!r}, {config.SENSOR_ADXL!r}."
         )
+
+
+def _read_range(sensor, sensor_name):
+    """
+    Read a VL53L0X range in millimetres.
+
+    In continuous mode the sensor measures back-to-back on its own, so if no
+    new measurement has completed since the last read the previous result is
+    returned immediately instead of blocking until the next one is ready.
+    """
+    def _read():
+        last = _last_range.get(sensor_name)
+        if config.VL53_FAST_READ and _supports_fast_read(sensor):
+            value = _read_range_fast(sensor, sensor_name, last)
+        elif (getattr(sensor, "is_continuous_mode", False) is True
+                and last is not None and not sensor.data_ready):
+            return last
+        else:
+            value = sensor.range
+        _last_range[sensor_name] = value
+        return value
+
+    # The whole read runs under the sensor lock on the timeout worker, so a
+    # read abandoned on timeout still excludes set_timing_budget() and the
+    # next read until it has finished with the sensor.
+    return read_with_timeout(_read, f"{sensor_name} range read",
+                             timeout_seconds=_vl53_read_timeout(sensor),
+                             lock=_vl53_locks[sensor_name])
+
+
+def set_timing_budget(sensors, sensor_name, budget_us):
+    """
+    Set a VL53L0X measurement timing budget, skipping unchanged values.
+
+    Reprogramming the budget costs a dozen register transactions, so the
+    value last written is cached and repeated calls with the same budget do
+    not touch the bus.  A sensor that is ranging continuously is stopped for
+    the change (the budget may only be written in standby) and restarted.
+
+    Parameters
+    ----------
+    sensors     : dict  — dictionary of initialised sensor objects.
+    sensor_name : str   — config.SENSOR_VL53_0 or config.SENSOR_VL53_1.
+    budget_us   : int   — timing budget in microseconds (20000 minimum).
+
+    Returns
+    -------
+    bool : True if the sensor was reprogrammed.
+    """
+    sensor = sensors.get(sensor_name)
+    if sensor is None or sensor_name not in VL53_SENSORS:
+        return False
+    cached = _timing_budget.get(sensor_name)
+    if cached is not None and cached[0] is sensor:
+        current = cached[1]
+    else:
+        current = getattr(sensor, "_measurement_timing_budget_us", config.VL53_TIMING_BUDGET)
+    if current == budget_us:
+        return False
+
+    lock = _vl53_locks[sensor_name]
+    # A hung read still holds the lock; leave the budget for the next call
+    if not lock.acquire(timeout=_vl53_read_timeout(sensor)):
+        print(f"{sensor_name}: timing budget not changed, sensor busy")
+        return False
+    try:
+        continuous = getattr(sensor, "is_continuous_mode", False) is True
+        if continuous:
+            sensor.stop_continuous()
+        try:
+            sensor.measurement_timing_budget = budget_us
+        finally:
+            if continuous:
+                sensor.start_continuous()
+    finally:
+        lock.release()
+    _timing_budget[sensor_name] = (sensor, budget_us)
+    return True
+
+
+# VL53L0X registers used by the fast range reader
+_VL53_SYSRANGE_START = 0x00
+_VL53_SYSTEM_INTERRUPT_CLEAR = 0x0B
+_VL53_RESULT_INTERRUPT_STATUS = 0x13
+# RESULT_INTERRUPT_STATUS (0x13) through the range result (0x1E-0x1F)
+_VL53_RESULT_BLOCK_LENGTH = 13
+_VL53_INTERRUPT_CLEAR = bytes((_VL53_SYSTEM_INTERRUPT_CLEAR, 0x01))
+_VL53_RESULT_BLOCK_START = bytes((_VL53_RESULT_INTERRUPT_STATUS,))
+
+
+def _single_shot_start(stop_variable):
+    """Register writes that start one measurement (driver's do_range_measurement)."""
+    return tuple(bytes(pair) for pair in (
+        (0x80, 0x01), (0xFF, 0x01), (0x00, 0x00), (0x91, stop_variable),
+        (0x00, 0x01), (0xFF, 0x00), (0x80, 0x00), (_VL53_SYSRANGE_START, 0x01),
+    ))
+
+
+def _supports_fast_read(sensor):
+    """True for an initialized Adafruit VL53L0X driver object."""
+    return (isinstance(getattr(sensor, "_stop_variable", None), int)
+            and hasattr(getattr(sensor, "_device", None), "device_address"))
+
+
+@contextmanager
+def _bus_locked(bus, deadline, name):
+    """Hold one mux channel for a group of transactions (one channel select)."""
+    while not bus.try_lock():
+        deadline.check(f"{name} I2C bus lock timed out")
+        time.sleep(0)
+    try:
+        yield bus
+    finally:
+        bus.unlock()
+
+
+def _read_range_fast(sensor, sensor_name, last=None):
+    """
+    Read a VL53L0X range with the fewest I2C transactions.
+
+    The driver's range property locks the bus (and so re-selects the mux
+    channel) for every register access: eight writes to start, a start-bit
+    poll, data-ready polls, the result read and the interrupt clear.  Here
+    the start sequence is sent under a single lock, the caller sleeps for
+    most of the timing budget instead of polling, and each poll is one burst
+    read of the interrupt status and result block together, followed by
+    the interrupt clear.  Uses the tuning already applied by init_vl53l0x.
+
+    In continuous mode no measurement is started; if none has completed and
+    a previous result exists, that result is returned.
+
+    Returns the range in millimetres (int).
+    """
+    bus = sensor._device.i2c
+    address = sensor._device.device_address
+    deadline = Deadline(_vl53_read_timeout(sensor))
+    block = bytearray(_VL53_RESULT_BLOCK_LENGTH)
+    continuous = getattr(sensor, "_continuous_mode", False) is True
+
+    if not continuous:
+        with _bus_locked(bus, deadline, sensor_name):
+            for packet in _single_shot_start(sensor._stop_variable):
+                bus.writeto(address, packet)
+        # The result cannot be ready before most of the timing budget is spent
+        time.sleep(sensor._measurement_timing_budget_us * 0.9 / 1_000_000)
+
+    while True:
+        with _bus_locked(bus, deadline, sensor_name):
+            bus.writeto_then_readfrom(address, _VL53_RESULT_BLOCK_START, block)
+            if block[0] & 0x07:
+                bus.writeto(address, _VL53_INTERRUPT_CLEAR)
+                return (block[11] << 8) | block[12]
+        if continuous and last is not None:
+            return last
+        deadline.check(f"{sensor_name} range read timed out")
+        time.sleep(0.001)
+
+
+# ADXL345 data registers DATAX0..DATAZ1: three little-endian int16 values
+_ADXL_DATAX0 = bytes((0x32,))
+
+
+def _build_z_angle_table():
+    """Tilt angle for every Z count from -1 g to +1 g (clamped beyond)."""
+    limit = math.ceil(9.81 / config.ADXL_MS2_PER_COUNT)
+    table = tuple(z_axis_to_degrees(count * config.ADXL_MS2_PER_COUNT)
+                  for count in range(-limit, limit + 1))
+    return limit, table
+
+
+_Z_ANGLE_LIMIT, _Z_ANGLE_TABLE = _build_z_angle_table()
+
+
+def _supports_adxl_fast_read(sensor):
+    """True for an initialized Adafruit ADXL345 driver object."""
+    return isinstance(getattr(getattr(sensor, "_i2c", None), "device_address", None), int)
+
+
+def _int16(low, high):
+    value = low | (high << 8)
+    return value - 0x10000 if value & 0x8000 else value
+
+
+def read_adxl_counts(sensor):
+    """
+    Read raw ADXL345 acceleration counts in one 6-byte burst.
+
+    Returns
+    -------
+    (x, y, z) : int16 counts; multiply by config.ADXL_MS2_PER_COUNT for m/s².
+    """
+    device = sensor._i2c
+    bus = device.i2c
+    data = bytearray(6)
+    deadline = Deadline(config.READ_TIMEOUT)
+    with _bus_locked(bus, deadline, config.SENSOR_ADXL):
+        bus.writeto_then_readfrom(device.device_address, _ADXL_DATAX0, data)
+    return (_int16(data[0], data[1]), _int16(data[2], data[3]),
+            _int16(data[4], data[5]))
+
+
+def adxl_counts_to_degrees(z_counts):
+    """
+    Convert a Z count (int, or float for averaged counts) to a tilt angle.
+
+    Same convention and result as utils.z_axis_to_degrees() on the value in
+    m/s², but a table lookup (linear interpolation for fractional counts)
+    instead of a division and acos per sample.
+    """
+    position = min(max(z_counts, -_Z_ANGLE_LIMIT), _Z_ANGLE_LIMIT) + _Z_ANGLE_LIMIT
+    index = int(position)
+    fraction = position - index
+    if fraction == 0 or index + 1 >= len(_Z_ANGLE_TABLE):
+        return _Z_ANGLE_TABLE[index]
+    low = _Z_ANGLE_TABLE[index]
+    return low + (_Z_ANGLE_TABLE[index + 1] - low) * fraction
+
+
+# SensorCalibration of the ADXL345 in the calibration store, bound on first
+# use; the store updates it in place when calibrate_adxl345() runs.
+_adxl_calibration = None
+
+
+def _adxl_axes():
+    """Per-axis ADXL345 calibration from the calibration store, or None."""
+    global _adxl_calibration
+    if _adxl_calibration is None:
+        _adxl_calibration = get_store().entry(config.SENSOR_ADXL)
+    return _adxl_calibration.axes
+
+
+def adxl_counts_to_tilt(x_counts, y_counts, z_counts):
+    """
+    Convert one (x, y, z) count sample to a tilt angle in degrees.
+
+    With config.ADXL_TILT_3AXIS the stored axis calibration (see
+    calibration.calibrate_adxl345) is applied and the angle comes from all
+    three axes (utils.tilt_degrees); otherwise from Z alone via
+    adxl_counts_to_degrees().
+    """
+    if config.ADXL_TILT_3AXIS:
+        return tilt_degrees(x_counts, y_counts, z_counts, _adxl_axes())
+    return adxl_counts_to_degrees(z_counts)
+
+
+# ADXL345 FIFO streaming
+_ADXL_BW_RATE = 0x2C
+_ADXL_FIFO_CTL = 0x38
+_ADXL_FIFO_STATUS = bytes((0x39,))
+_ADXL_FIFO_MODE_STREAM = 0x80
+_ADXL_FIFO_ENTRIES_MASK = 0x3F
+# Output data rate (Hz) → BW_RATE rate code
+_ADXL_RATE_CODES = {
+    3200: 0x0F, 1600: 0x0E, 800: 0x0D, 400: 0x0C, 200: 0x0B,
+    100: 0x0A, 50: 0x09, 25: 0x08, 12.5: 0x07, 6.25: 0x06,
+}
+
+# Mean angle of the most recent non-empty FIFO batch
+_last_tilt = {}
+
+
+def configure_adxl_stream(sensor, rate_hz=None):
+    """
+    Set the ADXL345 output data rate and put its FIFO in stream mode.
+
+    In stream mode the FIFO always holds the newest (up to) 32 samples;
+    read_adxl_fifo() drains them.
+    """
+    rate_hz = config.ADXL_DATA_RATE_HZ if rate_hz is None else rate_hz
+    try:
+        rate_code = _ADXL_RATE_CODES[rate_hz]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported ADXL345 data rate {rate_hz!r} Hz; "
+            f"choose one of {sorted(_ADXL_RATE_CODES)}"
+        ) from None
+    device = sensor._i2c
+    bus = device.i2c
+    with _bus_locked(bus, Deadline(config.READ_TIMEOUT), config.SENSOR_ADXL):
+        bus.writeto(device.device_address, bytes((_ADXL_BW_RATE, rate_code)))
+        bus.writeto(device.device_address, bytes((_ADXL_FIFO_CTL, _ADXL_FIFO_MODE_STREAM)))
+    _last_tilt.pop(config.SENSOR_ADXL, None)
+
+
+def read_adxl_fifo(sensor):
+    """
+    Drain the ADXL345 FIFO under a single bus lock.
+
+    Each entry is popped with one 6-byte burst of DATAX0–DATAZ1.
+
+    Returns
+    -------
+    list of (x, y, z) int16 counts, oldest first (empty if no new samples).
+    """
+    device = sensor._i2c
+    bus = device.i2c
+    address = device.device_address
+    status = bytearray(1)
+    data = bytearray(6)
+    samples = []
+    with _bus_locked(bus, Deadline(config.READ_TIMEOUT), config.SENSOR_ADXL):
+        bus.writeto_then_readfrom(address, _ADXL_FIFO_STATUS, status)
+        for _ in range(status[0] & _ADXL_FIFO_ENTRIES_MASK):
+            bus.writeto_then_readfrom(address, _ADXL_DATAX0, data)
+            samples.append((_int16(data[0], data[1]), _int16(data[2], data[3]),
+                            _int16(data[4], data[5])))
+    return samples
+
+
+def _read_tilt_stream(sensor):
+    """Mean tilt angle of the samples queued since the previous read."""
+    samples = read_with_timeout(lambda: read_adxl_fifo(sensor),
+                                f"{config.SENSOR_ADXL} FIFO read")
+    if not samples:
+        # Read faster than the output data rate: nothing new yet
+        last = _last_tilt.get(config.SENSOR_ADXL)
+        if last is not None:
+            return last
+        counts = read_with_timeout(lambda: read_adxl_counts(sensor),
+                                   f"{config.SENSOR_ADXL} acceleration read")
+        return adxl_counts_to_tilt(*counts)
+
+    if config.ADXL_TILT_3AXIS:
+        angles = tilt_degrees_batch(samples, _adxl_axes())
+    else:
+        scale = config.ADXL_MS2_PER_COUNT
+        angles = z_axis_to_degrees_batch([z * scale for _, _, z in samples])
+    angle = float(sum(angles) / len(angles))
+    _last_tilt[config.SENSOR_ADXL] = angle
+    return angle
+
+
+@contextmanager
+def continuous_ranging(sensors, sensor_name):
+    """
+    Keep a VL53L0X in continuous-ranging mode for the duration of a move.
+
+    Only has an effect when config.VL53_RANGING_MODE is "moves" and the sensor
+    is not already ranging continuously; otherwise this is a no-op, so motor
+    loops can wrap themselves in it unconditionally.
+    """
+    sensor = sensors.get(sensor_name)
+    if (config.VL53_RANGING_MODE != "moves"
+            or sensor_name not in VL53_SENSORS
+            or sensor is None
+            or getattr(sensor, "is_continuous_mode", False) is True):
+        yield
+        return
+
+    sensor.start_continuous()
+    try:
+        yield
+    finally:
+        try:
+            sensor.stop_continuous()
+        except Exception as e:
+            print(f"{sensor_name} failed to stop continuous ranging: {e}")
+        _last_range.pop(sensor_name, None)
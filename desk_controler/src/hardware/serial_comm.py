@@ -1,5 +1,10 @@
-import serial
-from utils.timeout import timeout, TimeoutError
+import collections
+import itertools
+import queue
+import threading
+import time
+
+from utils.timeout import TimeoutError, call_with_timeout
 import config
 
 
@@ -17,21 +22,238 @@ def init_serial(port=config.SERIAL_PORT,
     Returns:
         serial.Serial object or None on failure
     """
+    import serial
+
     print(f"Initializing serial port {port}...")
     
     try:
-        with timeout(init_timeout, f"Serial port {port} initialization timed out"):
-            ser = serial.Serial(
+        ser = call_with_timeout(
+            lambda: serial.Serial(
                 port,
                 baudrate=baudrate,
                 parity=serial.PARITY_NONE,
                 stopbits=serial.STOPBITS_ONE,
                 bytesize=serial.EIGHTBITS,
                 timeout=config.SERIAL_TIMEOUT
-            )
-            print(f"Serial port {ser.name} opened successfully")
-            return ser
+            ),
+            init_timeout,
+            f"Serial port {port} initialization timed out",
+        )
+        print(f"Serial port {ser.name} opened successfully")
+        return ser
             
     except (serial.SerialException, TimeoutError) as e:
         print(f"Error opening serial port: {e}")
         return None
+
+
+class CommandSerial:
+    """
+    Stateful wrapper around the motor controller's serial port that drops
+    redundant command packets.
+
+    The motor control loops re-send their current command every cycle.  At
+    2400 baud each 3-byte packet occupies ~12.5 ms of line time, so those
+    duplicates keep the UART busy for no benefit.  CommandSerial remembers
+    the last packet written and only forwards a packet when it differs —
+    i.e. when a motor changes direction.
+
+    CMD_ALL_OFF is never suppressed, so stop commands always reach the
+    board.  If the controller board needs periodic refreshes, pass
+    keepalive_interval and an unchanged packet is re-sent once that many
+    seconds have passed since it was last written.
+
+    When the wrapped port is a SerialWriter, a write that fails later on
+    the writer thread also resets the remembered packet, so the next
+    command goes out even if it repeats the failed one.
+
+    All other attributes (close, name, flush, ...) are forwarded to the
+    wrapped port.
+
+    Args:
+        port: Open serial.Serial (or any object with write()).
+        keepalive_interval (float or None): Seconds after which an unchanged
+            packet is re-sent.  None disables refreshing.
+    """
+
+    def __init__(self, port, keepalive_interval=config.SERIAL_KEEPALIVE_INTERVAL):
+        self._port = port
+        self.keepalive_interval = keepalive_interval
+        self._lock = threading.Lock()
+        self._last_packet = None
+        self._last_write = 0.0
+        self.sent = 0
+        self.suppressed = 0
+        if isinstance(port, SerialWriter):
+            port.add_error_callback(lambda _error: self.reset())
+
+    def write(self, data):
+        """
+        Write data unless it repeats the previous packet.
+
+        Returns:
+            Number of bytes written (0 when the packet was suppressed).
+        """
+        data = bytes(data)
+        with self._lock:
+            now = time.monotonic()
+            if data != config.CMD_ALL_OFF and data == self._last_packet:
+                if (self.keepalive_interval is None
+                        or now - self._last_write < self.keepalive_interval):
+                    self.suppressed += 1
+                    return 0
+            try:
+                written = self._port.write(data)
+            except Exception:
+                # Unknown line state: let the next packet through regardless
+                self._last_packet = None
+                raise
+            self._last_packet = data
+            self._last_write = now
+            self.sent += 1
+            return written
+
+    def reset(self):
+        """Forget the last packet so the next write always goes out."""
+        with self._lock:
+            self._last_packet = None
+
+    def __getattr__(self, attr):
+        return getattr(self._port, attr)
+
+
+class SerialWriter:
+    """
+    Dedicated serial I/O thread fed by a priority queue.
+
+    write() only enqueues the packet and returns immediately, so a 2400-baud
+    line never blocks the motor control loop or the MQTT dispatcher.  The
+    writer thread sends queued packets in order, except that CMD_ALL_OFF:
+
+      * jumps ahead of every pending packet, and
+      * discards all motor packets queued before it.
+
+    The port's output buffer is deliberately not flushed: that could cut a
+    3-byte packet already partly on the line, and the board would then
+    misframe the stop packet itself.  The few bytes already handed to the
+    driver (at most one packet, as the writer sends one at a time) go out
+    first.
+
+    The time from enqueueing a stop packet to its write completing is
+    recorded; stop_latency_stats() reports it.
+
+    A failed write is reported, counted in `errors` and passed to every
+    callback registered with add_error_callback().  The next motor packet
+    passed to write() is still queued, then the error is raised to the
+    caller; stop packets never raise.  All other attributes are forwarded
+    to the wrapped port.
+
+    Args:
+        port: Open serial.Serial (or any object with write()).
+    """
+
+    _STOP = 0       # queue priorities: lower runs first
+    _NORMAL = 1
+    _SHUTDOWN = 2
+
+    def __init__(self, port):
+        self._port = port
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._generation = 0
+        self._gen_lock = threading.Lock()
+        self._thread = None
+        self._error_callbacks = []
+        self._pending_error = None
+        self.errors = 0
+        self.stop_latencies = collections.deque(maxlen=config.SERIAL_STOP_LATENCY_HISTORY)
+
+    def start(self):
+        """Start the writer thread.  Returns self for chaining."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, daemon=True, name="serial-writer"
+            )
+            self._thread.start()
+        return self
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_error_callback(self, callback):
+        """Call callback(exception) on the writer thread after a failed write."""
+        self._error_callbacks.append(callback)
+
+    def write(self, data):
+        """
+        Queue data for sending.  Returns the number of bytes queued.
+
+        CMD_ALL_OFF is queued with priority and cancels pending packets.
+        Any other packet raises the exception of a write that failed since
+        the previous call, after queueing data.
+        """
+        data = bytes(data)
+        now = time.monotonic()
+        if data == config.CMD_ALL_OFF:
+            with self._gen_lock:
+                self._generation += 1
+                generation = self._generation
+            self._queue.put((self._STOP, next(self._seq), generation, data, now))
+            return len(data)
+        self._queue.put((self._NORMAL, next(self._seq), self._generation, data, now))
+        error, self._pending_error = self._pending_error, None
+        if error is not None:
+            raise error
+        return len(data)
+
+    def stop(self, timeout=2.0):
+        """Send everything still queued, then stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put((self._SHUTDOWN, next(self._seq), None, None, None))
+        self._thread.join(timeout)
+        self._thread = None
+
+    def close(self):
+        """Stop the writer thread and close the wrapped port."""
+        self.stop()
+        self._port.close()
+
+    def stop_latency_stats(self):
+        """
+        Returns:
+            dict with count, last, mean and max stop latency in seconds
+            (None values before the first stop packet).
+        """
+        samples = list(self.stop_latencies)
+        if not samples:
+            return {"count": 0, "last": None, "mean": None, "max": None}
+        return {
+            "count": len(samples),
+            "last": samples[-1],
+            "mean": sum(samples) / len(samples),
+            "max": max(samples),
+        }
+
+    def _run(self):
+        while True:
+            priority, _, generation, data, queued_at = self._queue.get()
+            if priority == self._SHUTDOWN:
+                return
+            if priority == self._NORMAL and generation != self._generation:
+                continue  # superseded by a later stop packet
+            try:
+                self._port.write(data)
+            except Exception as e:
+                self.errors += 1
+                self._pending_error = e
+                print(f"Serial write failed: {e}")
+                for callback in self._error_callbacks:
+                    callback(e)
+                continue
+            if priority == self._STOP:
+                self.stop_latencies.append(time.monotonic() - queued_at)
+
+    def __getattr__(self, attr):
+        return getattr(self._port, attr)
@@ -0,0 +1,290 @@
+"""
+Warm-start cache for hardware initialization.
+
+A full initialize_hardware() probes every device, and each VL53L0X init runs
+the driver's SPAD and reference calibration, which dominates start-up time.
+After a successful init the topology (which channel holds which address),
+the driver tuning values and the last-known motor positions are saved to
+config.HARDWARE_CACHE_FILE.  On the next start:
+
+  warm_init_vl53l0x  — rebuilds the driver object from the cached state after
+                       checking the model ID and that the sensor still holds
+                       its post-init configuration (it was not power-cycled).
+  warm_init_adxl345  — identifies the device by its DEVID register and
+                       constructs the driver without a validation read.
+
+Both return None on any mismatch or error; the caller then falls back to the
+full init_vl53l0x()/init_adxl345() path.
+"""
+
+import json
+import os
+import time
+
+import config
+from hardware.i2c_utils import probe_address
+from hardware.sensors import configure_adxl_stream
+from utils import atomic_write_json
+
+
+CACHE_VERSION = 1
+
+# VL53L0X registers checked before trusting the cached driver state
+_VL53_MODEL_ID_REG = 0xC0
+_VL53_MODEL_ID = 0xEE
+_VL53_SEQUENCE_CONFIG_REG = 0x01
+# Power-on default is 0xFF; the driver leaves 0xE8 after a full init
+_VL53_SEQUENCE_CONFIG_INITIALIZED = 0xE8
+
+
+def _vl53_tuning():
+    return {
+        "timing_budget": config.VL53_TIMING_BUDGET,
+        "signal_rate_limit": config.VL53_RATE_LIMIT,
+        "sigma_limit": config.VL53_SIGMA_LIMIT,
+    }
+
+
+def vl53_state(sensor):
+    """Return the driver state of an initialized VL53L0X needed to restore it."""
+    state = {"stop_variable": sensor._stop_variable}
+    state.update(_vl53_tuning())
+    return state
+
+
+def load_hardware_cache(path=None):
+    """
+    Load the warm-start cache (default: config.HARDWARE_CACHE_FILE).
+
+    Returns the cache dict, or None if there is no usable cache (missing,
+    unreadable or written by a different cache version).
+    """
+    if path is None:
+        path = config.HARDWARE_CACHE_FILE
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[warm-start] Could not load hardware cache from {path}: {e}")
+        return None
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        print(f"[warm-start] Ignoring hardware cache {path}: unsupported version")
+        return None
+    return cache
+
+
+def _write_cache(cache, path):
+    try:
+        atomic_write_json(path, cache)
+    except OSError as e:
+        print(f"[warm-start] Could not save hardware cache to {path}: {e}")
+        return False
+    return True
+
+
+def save_hardware_cache(sensors, motor_positions=None, path=None):
+    """
+    Save topology, VL53L0X driver state and motor positions after an init.
+
+    Parameters
+    ----------
+    sensors         : sensors dict from initialize_hardware
+    motor_positions : {motor_id: position} (None values are skipped)
+    path            : cache file (default: config.HARDWARE_CACHE_FILE)
+
+    Returns True if the cache was written.
+    """
+    if path is None:
+        path = config.HARDWARE_CACHE_FILE
+    if not path:
+        return False
+    devices = {}
+    for sensor_name, channel in ((config.SENSOR_VL53_0, config.VL53_CHANNEL_0),
+                                 (config.SENSOR_VL53_1, config.VL53_CHANNEL_1)):
+        sensor = sensors.get(sensor_name)
+        if sensor is None:
+            continue
+        entry = {"channel": channel, "address": config.VL53_ADDRESS}
+        try:
+            entry.update(vl53_state(sensor))
+        except AttributeError:
+            continue
+        devices[sensor_name] = entry
+    if sensors.get(config.SENSOR_ADXL) is not None:
+        devices[config.SENSOR_ADXL] = {
+            "channel": config.ADXL345_CHANNEL,
+            "address": config.ADXL_ADDRESS,
+        }
+    cache = {
+        "version": CACHE_VERSION,
+        "saved_at": time.time(),
+        "devices": devices,
+        "motor_positions": {
+            str(motor_id): position
+            for motor_id, position in (motor_positions or {}).items()
+            if position is not None
+        },
+    }
+    return _write_cache(cache, path)
+
+
+def save_motor_positions(motor_positions, path=None):
+    """Update only the last-known motor positions in an existing cache."""
+    if path is None:
+        path = config.HARDWARE_CACHE_FILE
+    cache = load_hardware_cache(path)
+    if cache is None:
+        return False
+    positions = {
+        str(motor_id): position
+        for motor_id, position in motor_positions.items()
+        if position is not None
+    }
+    if cache.get("motor_positions") == positions:
+        return True     # unchanged (e.g. a rejected or zero-length move)
+    cache["motor_positions"] = positions
+    return _write_cache(cache, path)
+
+
+def cached_motor_positions(cache):
+    """Return {motor_id: position} from a loaded cache."""
+    if not cache:
+        return {}
+    positions = {}
+    for motor_id, position in cache.get("motor_positions", {}).items():
+        try:
+            positions[int(motor_id)] = float(position)
+        except (TypeError, ValueError):
+            continue
+    return positions
+
+
+def _cached_device(cache, sensor_name, channel, address):
+    """Return the cached entry if it matches the configured channel/address."""
+    if not cache:
+        return None
+    entry = cache.get("devices", {}).get(sensor_name)
+    if not entry:
+        return None
+    if entry.get("channel") != channel or entry.get("address") != address:
+        print(f"[warm-start] {sensor_name}: topology changed since last start")
+        return None
+    return entry
+
+
+_warm_vl53_class = None
+
+
+def _warm_vl53l0x_class():
+    """
+    Subclass of adafruit_vl53l0x.VL53L0X whose constructor skips the SPAD
+    and reference calibration.
+
+    It sets exactly the attributes the driver's own __init__ would leave
+    behind after a full init (the I2C device, stop variable, timing budget
+    and mode flags), so the rest of the driver is used unchanged.  Created
+    on first use because the driver is imported lazily.
+    """
+    global _warm_vl53_class
+    if _warm_vl53_class is None:
+        import adafruit_vl53l0x as vl53
+
+        class WarmVL53L0X(vl53.VL53L0X):
+            def __init__(self, i2c, address, stop_variable, timing_budget_us):
+                # Not calling super().__init__(): that reruns the full init
+                self._device = vl53.i2c_device.I2CDevice(i2c, address)
+                self.io_timeout_s = 0
+                self._stop_variable = stop_variable
+                self._measurement_timing_budget_us = timing_budget_us
+                self._continuous_mode = False
+                self._data_ready = False
+
+        _warm_vl53_class = WarmVL53L0X
+    return _warm_vl53_class
+
+
+def warm_init_vl53l0x(tca, channel, name, sensor_name, cache):
+    """
+    Restore a VL53L0X from the warm-start cache.
+
+    One register read confirms the model ID and a second that the sensor
+    still holds the configuration written by the last full init; the SPAD
+    and reference calibration are then skipped.
+
+    Returns the driver object, or None if the full init is required.
+    """
+    entry = _cached_device(cache, sensor_name, channel, config.VL53_ADDRESS)
+    if entry is None:
+        return None
+    if any(entry.get(key) != value for key, value in _vl53_tuning().items()):
+        print(f"[warm-start] {name}: tuning changed since last start")
+        return None
+    if "stop_variable" not in entry:
+        return None
+
+    try:
+        sensor = _warm_vl53l0x_class()(tca[channel], config.VL53_ADDRESS,
+                                       entry["stop_variable"], entry["timing_budget"])
+        if sensor._read_u8(_VL53_MODEL_ID_REG) != _VL53_MODEL_ID:
+            print(f"[warm-start] {name}: unexpected model ID")
+            return None
+        if sensor._read_u8(_VL53_SEQUENCE_CONFIG_REG) != _VL53_SEQUENCE_CONFIG_INITIALIZED:
+            print(f"[warm-start] {name}: sensor was reset since last start")
+            return None
+        # A previous run may have exited with continuous ranging active.
+        # stop_continuous() ends it with one single-shot measurement; read
+        # it out so no measurement is left pending with its interrupt set.
+        sensor.stop_continuous()
+        sensor.read_range()
+        # ...or mid-move, with an adaptive (fast/precise) budget still
+        # programmed: write the cached budget to the device, not just the driver
+        sensor.measurement_timing_budget = entry["timing_budget"]
+        sensor.sigma_limit = entry["sigma_limit"]
+        if config.VL53_RANGING_MODE == "continuous":
+            sensor.start_continuous()
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"[warm-start] {name}: restore failed: {e}")
+        return None
+
+    print(f"{name} restored from warm-start cache")
+    return sensor
+
+
+def warm_init_adxl345(tca, cache):
+    """
+    Restore the ADXL345 after a single DEVID probe.
+
+    Returns the driver object, or None if the full init is required.
+    """
+    entry = _cached_device(cache, config.SENSOR_ADXL, config.ADXL345_CHANNEL,
+                           config.ADXL_ADDRESS)
+    if entry is None:
+        return None
+
+    bus = tca[config.ADXL345_CHANNEL]
+    id_register, expected_id = config.I2C_DEVICE_IDS[config.ADXL_ADDRESS]
+    if not bus.try_lock():
+        return None
+    try:
+        found = probe_address(tca, config.ADXL345_CHANNEL, config.ADXL_ADDRESS,
+                              id_register, expected_id)
+    finally:
+        bus.unlock()
+    if not found:
+        print("[warm-start] ADXL345: not found at cached address")
+        return None
+
+    import adafruit_adxl34x
+
+    try:
+        sensor = adafruit_adxl34x.ADXL345(bus)
+        if config.ADXL_STREAM_MODE:
+            configure_adxl_stream(sensor)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"[warm-start] ADXL345: restore failed: {e}")
+        return None
+
+    print("ADXL345 restored from warm-start cache")
+    return sensor
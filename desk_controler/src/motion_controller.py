@@ -0,0 +1,321 @@
+"""
+Predictive-stop motion controller for the desk actuators.
+
+The motor controller board only understands on/off commands per motor, so a
+plain bang-bang loop keeps driving until the error is inside the tolerance
+band and then overshoots by however far the actuator coasts after power is
+cut.  PredictiveController removes most of that overshoot:
+
+  1. Velocity estimation
+       The actuator speed is estimated from the last few (time, position)
+       samples with a least-squares slope (VelocityEstimator).
+
+  2. Predictive braking
+       While driving, the controller predicts where the actuator would come
+       to rest if power were cut now:  stop = position + velocity × coast_time.
+       As soon as that predicted rest position reaches the tolerance band, it
+       sends OFF — early — and lets the actuator coast in.
+
+  3. Coast learning
+       After every OFF the controller waits for the actuator to settle and
+       measures how far it actually coasted.  The observed coast time
+       (distance / speed at cut-off) updates a per-sensor, per-direction
+       estimate with an exponential moving average, so braking gets more
+       accurate with every move.  The estimate lives in the actuator's
+       motion_model.ActuatorModel so it is persisted with the rest of the
+       learned kinematics.
+
+  4. Pulse-width modulation near the target
+       Inside a small band around the target the drive command is pulsed
+       with a duty cycle proportional to the remaining error, which creeps
+       the actuator in at reduced average speed instead of lunging past.
+
+The controller is pure logic: step() takes a timestamp and a position and
+returns "extend", "retract" or "off".  motor_control turns that into serial
+packets.  Units are whatever the caller uses (mm or degrees).
+
+StallDetector watches the same (time, position, action) stream for an
+actuator that is powered but no longer moving — it has hit an end stop or
+stalled — so motor_control can end the move after config.STALL_WINDOW_S
+instead of running into the move timeout.  How a move ended is reported as a
+MoveOutcome.
+"""
+
+import collections
+
+import config
+import motion_model
+from motion_model import EXTEND, RETRACT, OFF
+
+
+def coast_time(sensor_name: str, direction: str) -> float:
+    """Return the learned coast time for sensor_name moving in direction."""
+    model = motion_model.get_model(sensor_name)
+    return model.coast_time.get(direction, config.CONTROL_COAST_TIME_DEFAULT)
+
+
+def learn_coast(sensor_name: str, direction: str, distance: float, speed: float) -> None:
+    """
+    Update the coast-time estimate from one observed coast.
+
+    Parameters
+    ----------
+    distance : Distance travelled after OFF was sent (always >= 0).
+    speed    : Absolute speed at the moment OFF was sent.
+    """
+    if speed <= 0:
+        return
+    observed = min(max(distance / speed, 0.0), config.CONTROL_COAST_TIME_MAX)
+    motion_model.learn_coast_time(sensor_name, direction, observed)
+
+
+class VelocityEstimator:
+    """Least-squares velocity over the newest `window` (time, position) samples."""
+
+    def __init__(self, window: int = config.CONTROL_VELOCITY_WINDOW):
+        self._samples = collections.deque(maxlen=max(2, window))
+
+    def update(self, t: float, position: float) -> None:
+        """Record one position sample."""
+        self._samples.append((t, position))
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        self._samples.clear()
+
+    @property
+    def velocity(self):
+        """Signed velocity in position units per second, or None if unknown."""
+        n = len(self._samples)
+        if n < 2:
+            return None
+        mean_t = sum(t for t, _ in self._samples) / n
+        mean_p = sum(p for _, p in self._samples) / n
+        var_t = sum((t - mean_t) ** 2 for t, _ in self._samples)
+        if var_t <= 0:
+            return None
+        cov = sum((t - mean_t) * (p - mean_p) for t, p in self._samples)
+        return cov / var_t
+
+
+# MoveOutcome.result values
+REACHED = "reached"     # target (or full-travel limit reading) reached
+ENDSTOP = "endstop"     # stopped moving at the mechanical end of travel
+STALLED = "stalled"     # stopped moving short of the end of travel
+TIMEOUT = "timeout"     # move timeout expired
+
+MoveOutcome = collections.namedtuple(
+    "MoveOutcome", ["sensor_name", "result", "position", "elapsed"])
+
+
+class StallDetector:
+    """
+    Detect a powered actuator that has stopped making progress.
+
+    Samples are collected only while the actuator is driven in one
+    direction; OFF or a reversal starts a new window (so PWM pulses near the
+    target and coasting never count as a stall).  The window opens
+    `startup_lag` seconds after the direction began, or earlier once the
+    actuator has moved `min_progress` — so the motor driver and the sensor
+    pipeline catching up do not count as lack of progress.  Once the samples
+    span `window` seconds, the progress over that span in the driven
+    direction — least-squares slope × span, which is robust to sensor
+    noise — is compared with `min_progress`.
+    """
+
+    def __init__(self, window: float = config.STALL_WINDOW_S,
+                 min_progress: float = config.STALL_MIN_PROGRESS_MM,
+                 startup_lag: float = config.STALL_STARTUP_LAG_S):
+        self.window = window
+        self.min_progress = min_progress
+        self.startup_lag = startup_lag
+        self._samples = collections.deque()
+        self._direction = None
+        self._start = None
+        self._started = False
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        self._samples.clear()
+        self._direction = None
+        self._start = None
+        self._started = False
+
+    def update(self, t: float, position: float, action: str) -> bool:
+        """Record one sample taken while `action` was commanded; True = stalled."""
+        if action not in (EXTEND, RETRACT):
+            self.reset()
+            return False
+        if action != self._direction:
+            self.reset()
+            self._direction = action
+            self._start = (t, position)
+        if not self._started:
+            start_t, start_position = self._start
+            moved = position - start_position if action == EXTEND else start_position - position
+            if t - start_t < self.startup_lag and moved < self.min_progress:
+                return False
+            self._started = True
+        self._samples.append((t, position))
+        # Keep just over one window of samples
+        while len(self._samples) > 2 and t - self._samples[1][0] >= self.window:
+            self._samples.popleft()
+
+        span = t - self._samples[0][0]
+        if span < self.window:
+            return False
+        slope = motion_model._slope(list(self._samples))
+        if slope is None:
+            return False
+        progress = slope * span if action == EXTEND else -slope * span
+        return progress < self.min_progress
+
+
+class PredictiveController:
+    """
+    Closed-loop on/off controller with predictive stop and PWM approach.
+
+    Parameters
+    ----------
+    sensor_name  : Key used for coast learning (one controller per axis).
+    target       : Target position.
+    tolerance    : Acceptable absolute error.
+    pwm_band     : Error below which drive commands are pulse-width modulated.
+    settle_speed : Absolute speed below which the actuator counts as stopped.
+    predictive   : When False, behaves like the original bang-bang loop: drive
+                   until the error is inside tolerance, then stop.
+    """
+
+    DRIVE = "drive"
+    COAST = "coast"
+
+    def __init__(self, sensor_name: str, target: float, tolerance: float,
+                 pwm_band: float, settle_speed: float,
+                 predictive: bool = config.CONTROL_PREDICTIVE_STOP):
+        self.sensor_name = sensor_name
+        self.target = target
+        self.tolerance = tolerance
+        self.pwm_band = pwm_band
+        self.settle_speed = settle_speed
+        self.predictive = predictive
+
+        self.done = False
+        self.reversals = 0
+        self.position = None
+        self.action = OFF
+
+        self._state = self.DRIVE
+        self._velocity = VelocityEstimator()
+        self._last_direction = None
+        self._pwm_start = None
+        self._off_time = None
+        self._off_position = None
+        self._off_speed = None
+        self._off_direction = None
+
+    @property
+    def error(self):
+        """Signed error (position − target) of the last sample, or None."""
+        if self.position is None:
+            return None
+        return self.position - self.target
+
+    def step(self, now: float, position: float) -> str:
+        """
+        Consume one position sample and return the command to apply.
+
+        Returns one of EXTEND, RETRACT or OFF.  Once `done` is True the
+        target has been reached and the caller should stop the motor.
+        """
+        self.position = position
+        self._velocity.update(now, position)
+        error = position - self.target
+
+        if not self.predictive:
+            if abs(error) <= self.tolerance:
+                self.done = True
+                self.action = OFF
+            else:
+                self.action = RETRACT if error > 0 else EXTEND
+            return self.action
+
+        if self._state == self.COAST:
+            self.action = self._coast_step(now, position, error)
+        else:
+            self.action = self._drive_step(now, position, error)
+        return self.action
+
+    # ------------------------------------------------------------------
+    # States
+    # ------------------------------------------------------------------
+
+    def _drive_step(self, now, position, error):
+        if abs(error) <= self.tolerance:
+            if self._last_direction is None:
+                # Already on target before any drive command was sent.
+                self.done = True
+                return OFF
+            return self._cut_power(now, position, self._last_direction)
+
+        # Positive error → too far out → retract; negative → extend
+        direction = RETRACT if error > 0 else EXTEND
+        if self._last_direction is not None and direction != self._last_direction:
+            self.reversals += 1
+            self._velocity.reset()
+        if direction != self._last_direction:
+            self._pwm_start = now
+        self._last_direction = direction
+
+        velocity = self._velocity.velocity
+        if velocity is not None and self._moving_toward_target(velocity, error):
+            predicted_rest = position + velocity * coast_time(self.sensor_name, direction)
+            if abs(predicted_rest - self.target) <= self.tolerance or \
+                    (predicted_rest - self.target) * error < 0:
+                return self._cut_power(now, position, direction)
+
+        if abs(error) < self.pwm_band:
+            duty = max(config.CONTROL_PWM_MIN_DUTY, abs(error) / self.pwm_band)
+            phase = (now - self._pwm_start) % config.CONTROL_PWM_PERIOD
+            if phase >= duty * config.CONTROL_PWM_PERIOD:
+                return OFF
+
+        return direction
+
+    def _coast_step(self, now, position, error):
+        velocity = self._velocity.velocity
+        settled = velocity is not None and abs(velocity) <= self.settle_speed
+        if not settled and now - self._off_time < config.CONTROL_SETTLE_TIMEOUT:
+            return OFF
+
+        if self._off_direction is not None and self._off_speed:
+            learn_coast(
+                self.sensor_name,
+                self._off_direction,
+                abs(position - self._off_position),
+                self._off_speed,
+            )
+
+        self._state = self.DRIVE
+        if abs(error) <= self.tolerance:
+            self.done = True
+            return OFF
+        return self._drive_step(now, position, error)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _cut_power(self, now, position, direction):
+        """Send OFF and wait in COAST for the actuator to settle."""
+        velocity = self._velocity.velocity
+        self._state = self.COAST
+        self._off_time = now
+        self._off_position = position
+        self._off_speed = abs(velocity) if velocity is not None else 0.0
+        self._off_direction = direction
+        return OFF
+
+    @staticmethod
+    def _moving_toward_target(velocity, error):
+        """True when the actuator is moving in the error-reducing direction."""
+        return velocity * error < 0
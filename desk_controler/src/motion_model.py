@@ -0,0 +1,310 @@
+"""
+Per-actuator kinematic model learned from motion history.
+
+Every move logs a MotionTrace of (time, position, command) samples.  When the
+move finishes, update_model() fits the trace into the actuator's
+ActuatorModel:
+
+  extend_speed / retract_speed
+      Cruise speed in position units per second (mm/s or deg/s), from a
+      least-squares slope over each sustained drive segment.
+  startup_lag
+      Seconds between a drive command leaving standstill and the actuator
+      measurably moving.
+  coast_time
+      Seconds of travel the actuator coasts after power is cut, per
+      direction (coast distance = speed × coast_time).  Learned online by
+      motion_controller.PredictiveController.
+
+Parameters are blended into the model with an exponential moving average
+(config.MOTION_MODEL_LEARNING_RATE) so the model tracks slow changes such as
+load or supply voltage.
+
+Once a model has seen config.MOTION_MODEL_MIN_RUNS fitted moves it is
+considered trained.  motor_control then drives long travels open-loop for the
+bulk of the distance (see open_loop_duration()) and only samples the sensor
+near the target, and the wrapper publishes an ETA from estimate_move_time().
+
+Models are kept in memory and persisted as JSON in config.MOTION_MODEL_FILE
+by save_models(); load_models() restores them at start-up.
+"""
+
+import json
+import os
+
+import config
+from utils import atomic_write_json
+
+
+EXTEND = "extend"
+RETRACT = "retract"
+OFF = "off"
+
+
+class ActuatorModel:
+    """Learned kinematic parameters for one actuator."""
+
+    def __init__(self, extend_speed=None, retract_speed=None, startup_lag=None,
+                 coast_time=None, runs=0):
+        self.extend_speed = extend_speed
+        self.retract_speed = retract_speed
+        self.startup_lag = startup_lag
+        self.coast_time = dict(coast_time or {})
+        self.runs = runs
+
+    @property
+    def trained(self) -> bool:
+        """True once enough moves have been fitted to trust the model."""
+        return (self.runs >= config.MOTION_MODEL_MIN_RUNS
+                and self.extend_speed is not None
+                and self.retract_speed is not None)
+
+    def speed(self, direction: str):
+        """Return the cruise speed for direction, or None if unknown."""
+        return self.extend_speed if direction == EXTEND else self.retract_speed
+
+    def coast_distance(self, direction: str):
+        """Return the expected coast distance at cruise speed, or None."""
+        speed = self.speed(direction)
+        if speed is None:
+            return None
+        return speed * self.coast_time.get(direction, config.CONTROL_COAST_TIME_DEFAULT)
+
+    def to_dict(self) -> dict:
+        return {
+            "extend_speed": self.extend_speed,
+            "retract_speed": self.retract_speed,
+            "startup_lag": self.startup_lag,
+            "coast_time": self.coast_time,
+            "runs": self.runs,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ActuatorModel":
+        return cls(
+            extend_speed=data.get("extend_speed"),
+            retract_speed=data.get("retract_speed"),
+            startup_lag=data.get("startup_lag"),
+            coast_time=data.get("coast_time"),
+            runs=data.get("runs", 0),
+        )
+
+
+class MotionTrace:
+    """Time-ordered (time, position, command) log of one move."""
+
+    def __init__(self, sensor_name: str):
+        self.sensor_name = sensor_name
+        self.samples = []
+
+    def record(self, t: float, position, command: str) -> None:
+        """
+        Append one sample.  command is EXTEND, RETRACT or OFF.
+
+        A position of None marks the start of an open-loop phase, during
+        which the actuator is driven without sampling the sensor.
+        """
+        self.samples.append((t, position, command))
+
+    def segments(self):
+        """Split the trace into [(command, [(t, position), ...]), ...] runs."""
+        runs = []
+        for t, position, command in self.samples:
+            if not runs or runs[-1][0] != command:
+                runs.append((command, []))
+            runs[-1][1].append((t, position))
+        return runs
+
+
+# Models keyed by sensor name, and whether they changed since the last save.
+_models = {}
+_dirty = False
+
+
+def get_model(sensor_name: str) -> ActuatorModel:
+    """Return the model for sensor_name, creating an empty one on first use."""
+    model = _models.get(sensor_name)
+    if model is None:
+        model = _models[sensor_name] = ActuatorModel()
+    return model
+
+
+def _blend(current, observed):
+    """EMA-blend an observed value into the current estimate."""
+    if observed is None:
+        return current
+    if current is None:
+        return observed
+    return current + config.MOTION_MODEL_LEARNING_RATE * (observed - current)
+
+
+def _slope(points):
+    """Least-squares slope of [(t, position), ...], or None if undefined."""
+    n = len(points)
+    if n < 2:
+        return None
+    mean_t = sum(t for t, _ in points) / n
+    mean_p = sum(p for _, p in points) / n
+    var_t = sum((t - mean_t) ** 2 for t, _ in points)
+    if var_t <= 0:
+        return None
+    return sum((t - mean_t) * (p - mean_p) for t, p in points) / var_t
+
+
+def fit_trace(trace: MotionTrace):
+    """
+    Extract (speeds, lags) observations from a trace.
+
+    Returns ({direction: [speed, ...]}, [lag, ...]).  Drive segments shorter
+    than config.MOTION_MODEL_MIN_SEGMENT_SAMPLES samples are ignored, which
+    excludes the short PWM pulses near the target.  Segments that start from
+    standstill (first segment, or following an OFF segment) yield a start-up
+    lag and a cruise speed; segments containing an open-loop phase (marked
+    by a None position) yield a cruise speed from the samples after it; segments that start with a
+    direction reversal are skipped.
+    """
+    speeds = {EXTEND: [], RETRACT: []}
+    lags = []
+    previous = None
+    for command, points in trace.segments():
+        from_standstill = previous in (None, OFF)
+        previous = command
+        if command == OFF:
+            continue
+        blind = [i for i, (_, p) in enumerate(points) if p is None]
+        if blind:
+            # Only the samples after the open-loop phase carry positions.
+            points = points[blind[-1] + 1:]
+        if len(points) < config.MOTION_MODEL_MIN_SEGMENT_SAMPLES:
+            continue
+
+        if blind:
+            cruise = points
+        elif from_standstill:
+            t0, p0 = points[0]
+            moving_from = None
+            for i, (t, p) in enumerate(points):
+                if abs(p - p0) >= config.MOTION_MODEL_MOVE_THRESHOLD:
+                    moving_from = i
+                    break
+            if moving_from is None:
+                continue
+            lags.append(points[moving_from][0] - t0)
+            cruise = points[moving_from:]
+        else:
+            continue
+
+        if len(cruise) >= 3:
+            slope = _slope(cruise)
+            if slope is not None and slope != 0:
+                speeds[command].append(abs(slope))
+    return speeds, lags
+
+
+def update_model(trace: MotionTrace) -> ActuatorModel:
+    """Fit a finished move's trace into its actuator model."""
+    global _dirty
+    model = get_model(trace.sensor_name)
+    speeds, lags = fit_trace(trace)
+
+    fitted = False
+    for speed in speeds[EXTEND]:
+        model.extend_speed = _blend(model.extend_speed, speed)
+        fitted = True
+    for speed in speeds[RETRACT]:
+        model.retract_speed = _blend(model.retract_speed, speed)
+        fitted = True
+    for lag in lags:
+        model.startup_lag = _blend(model.startup_lag, lag)
+
+    if fitted:
+        model.runs += 1
+        _dirty = True
+    return model
+
+
+def learn_coast_time(sensor_name: str, direction: str, observed: float) -> float:
+    """Blend one observed coast time into the model and return the new value."""
+    global _dirty
+    model = get_model(sensor_name)
+    current = model.coast_time.get(direction, config.CONTROL_COAST_TIME_DEFAULT)
+    model.coast_time[direction] = current + config.CONTROL_COAST_LEARNING_RATE * (observed - current)
+    _dirty = True
+    return model.coast_time[direction]
+
+
+def estimate_move_time(sensor_name: str, current: float, target: float):
+    """
+    Return the expected seconds to travel from current to target, or None
+    when the actuator's model is not trained yet.
+    """
+    model = get_model(sensor_name)
+    if not model.trained or current is None:
+        return None
+    distance = abs(target - current)
+    if distance == 0:
+        return 0.0
+    direction = EXTEND if target > current else RETRACT
+    return ((model.startup_lag or 0.0)
+            + distance / model.speed(direction)
+            + model.coast_time.get(direction, config.CONTROL_COAST_TIME_DEFAULT))
+
+
+def open_loop_duration(sensor_name: str, current: float, target: float,
+                       approach: float) -> float:
+    """
+    Return how long a move may drive open-loop without sampling the sensor.
+
+    The actuator is driven blind until it is expected to be `approach` units
+    short of the target; closed-loop control takes over from there.  Returns
+    0.0 when the model is untrained or the travel is too short to benefit.
+    """
+    model = get_model(sensor_name)
+    if not model.trained:
+        return 0.0
+    blind_distance = abs(target - current) - approach
+    if blind_distance <= 0:
+        return 0.0
+    direction = EXTEND if target > current else RETRACT
+    return (model.startup_lag or 0.0) + blind_distance / model.speed(direction)
+
+
+def load_models(path: str = None) -> bool:
+    """
+    Load persisted models from path (default: config.MOTION_MODEL_FILE).
+    Returns True if a file was loaded.
+    """
+    global _dirty
+    if path is None:
+        path = config.MOTION_MODEL_FILE
+    if not path or not os.path.exists(path):
+        return False
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[model] Could not load actuator models from {path}: {e}")
+        return False
+    for sensor_name, model_data in data.items():
+        _models[sensor_name] = ActuatorModel.from_dict(model_data)
+    _dirty = False
+    return True
+
+
+def save_models(path: str = None) -> bool:
+    """
+    Persist models to path (default: config.MOTION_MODEL_FILE) if they
+    changed.  Returns True if written.
+    """
+    global _dirty
+    if path is None:
+        path = config.MOTION_MODEL_FILE
+    if not path or not _dirty:
+        return False
+    try:
+        atomic_write_json(path, {name: m.to_dict() for name, m in _models.items()})
+    except OSError as e:
+        print(f"[model] Could not save actuator models to {path}: {e}")
+        return False
+    _dirty = False
+    return True
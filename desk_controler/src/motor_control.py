@@ -3,15 +3,20 @@ Motor control functions for actuator positioning.
 
 Distance actuators (Motors 2 & 3)
 ----------------------------------
-  move_to_distance()  — closed-loop control using VL53L0X sensors (mm).
+  move_to_distance()  — closed-loop control using VL53L0X sensors (mm),
+                        driven by motion_controller.PredictiveController
+                        (predictive stop + PWM approach).
   extend_fully()      — drives an actuator to config.MAX_POSITION.
   retract_fully()     — drives an actuator to config.MIN_POSITION.
 
 Angle actuator (Motor 1)
 ------------------------
   move_to_angle()     — closed-loop control using the ADXL345 accelerometer
-                        (degrees).  Reads the Z-axis tilt angle as returned
-                        by get_sensor_value(sensors, config.SENSOR_ADXL):
+                        (degrees) to within ±config.TILT_TOLERANCE_DEG.
+                        Reads the tilt angle as returned by
+                        get_sensor_value(sensors, config.SENSOR_ADXL): with
+                        config.ADXL_TILT_3AXIS the calibrated gravity vector
+                        through atan2 (utils.tilt_degrees), otherwise Z alone:
 
                             0°   → sensor upside down   (Z ≈ −g)
                             90°  → sensor perpendicular  (Z ≈  0)
@@ -20,24 +25,73 @@ Angle actuator (Motor 1)
   extend_tilt()       — drives the angle actuator to config.MAX_ANGLE_DEG.
   retract_tilt()      — drives the angle actuator to config.MIN_ANGLE_DEG.
 
+Coordinated moves
+-----------------
+  move_to_targets()   — moves several actuators at once.  The drive bits of
+                        every active motor are OR-ed into one packet and each
+                        axis drops out of the packet as it arrives, so the
+                        move takes roughly as long as the slowest axis.
+
 Emergency stop
 --------------
   emergency_stop()    — immediately halts all motors.
 
 Offset correction
 -----------------
-config.OFFSET stores a per-sensor software offset (float, mm) produced by
-the VL53L0X calibration routine.  All distance movement loops call
-_read_corrected() so the offset is applied in exactly one place.
-
-The ADXL345 does not use a software offset — the angle is computed directly
-from the Z-axis gravity vector, which is self-referencing.
+The calibration store (calibration_store.get_store()) holds a per-sensor
+software offset (float, mm) produced by the VL53L0X calibration routine.
+All distance movement loops call _read_corrected() so the offset is applied
+in exactly one place.  Every time a retraction stops on the end stop
+(retract_fully(), or a move_to_distance() / move_to_targets() that runs into
+it) the offset is re-estimated from the resting reading
+(calibration.observe_endstop), so it follows sensor drift between explicit
+calibration runs.
+
+Noise filtering
+---------------
+_read_corrected() feeds each new reading into a per-sensor streaming filter
+(config.SENSOR_FILTER, see utils.filters) rather than re-sampling the sensor
+several times per control cycle.  The filter is reset at the start of every
+move so readings from a previous move never leak into the next one.
+
+Learned motion model
+--------------------
+Every move records a motion_model.MotionTrace that is fitted into the
+actuator's ActuatorModel when the move ends.  Once that model is trained,
+long moves are driven open-loop (no sensor reads) until the actuator is
+expected to be config.MOTION_OPEN_LOOP_APPROACH_* short of the target, and
+only the final approach runs closed-loop.
+
+The ADXL345 has no software offset in degrees.  Its per-axis scale/offset
+calibration (calibration.calibrate_adxl345, kept in the calibration store)
+is applied to the raw counts before the angle is computed, and atan2 over
+all three axes is self-referencing: gain error common to the axes cancels.
 """
 
+import contextlib
 import time
 
 import config
-from hardware import get_sensor_value
+import calibration
+from calibration_store import get_store
+from hardware import get_sensor_value, continuous_ranging, set_timing_budget
+from hardware import protocol
+from utils import make_filter
+import motion_model
+from motion_controller import (
+    PredictiveController, StallDetector, MoveOutcome,
+    EXTEND, RETRACT, OFF, REACHED, ENDSTOP, STALLED, TIMEOUT,
+)
+
+
+# Per-sensor (streaming filter, SensorCalibration) pairs used by
+# _read_corrected(), and the timestamp of the newest sampler reading each
+# filter has consumed.
+_filters = {}
+_last_sample_time = {}
+
+# MoveOutcome of the most recent distance move per sensor (see last_outcome()).
+_outcomes = {}
 
 
 # ---------------------------------------------------------------------------
@@ -56,17 +110,180 @@ def _get_motor_commands(sensor_name: str) -> dict:
         )
 
 
+def _get_filter(sensor_name: str):
+    """
+    Return (streaming filter, SensorCalibration) for sensor_name, creating
+    the filter on first use.  The calibration entry is updated in place by
+    the store, so it is looked up only once per move.
+    """
+    state = _filters.get(sensor_name)
+    if state is None:
+        filt = make_filter(
+            config.SENSOR_FILTER,
+            config.SENSOR_FILTER_WINDOW,
+            ema_alpha=config.SENSOR_FILTER_EMA_ALPHA,
+            kalman_process_var=config.SENSOR_FILTER_KALMAN_Q,
+            kalman_measurement_var=config.SENSOR_FILTER_KALMAN_R,
+        )
+        state = _filters[sensor_name] = (filt, get_store().entry(sensor_name))
+    return state
+
+
+def _reset_filter(sensor_name: str) -> None:
+    """Discard the filter history for sensor_name (call at the start of a move)."""
+    _filters.pop(sensor_name, None)
+    _last_sample_time.pop(sensor_name, None)
+
+
+def _feed_filter(sensors: dict, sensor_name: str, filt) -> None:
+    """
+    Push the readings that arrived since the previous call into filt.
+
+    With a running SensorSampler every new sample in its ring buffer is
+    consumed exactly once and no I2C read is made.  Without one — or when
+    the sampler has no fresh data for this sensor — a single direct reading
+    is taken.  Either way, an unprimed filter is topped up with direct reads
+    until it holds a full window.
+    """
+    sampler = sensors.get(config.SENSOR_SAMPLER)
+    fed_from_sampler = False
+    if sampler is not None and sampler.latest(sensor_name) is not None:
+        since = _last_sample_time.get(sensor_name, float("-inf"))
+        for sample in sampler.samples_since(sensor_name, since):
+            filt.update(sample.value)
+            _last_sample_time[sensor_name] = sample.timestamp
+        fed_from_sampler = True
+
+    if not fed_from_sampler and filt.primed:
+        filt.update(get_sensor_value(sensors, sensor_name))
+
+    while not filt.primed:
+        filt.update(get_sensor_value(sensors, sensor_name))
+
+
+def _drive_open_loop(ser, commands: dict, trace, current: float,
+                     target: float, approach: float, deadline: float) -> None:
+    """
+    Drive towards target without sampling the sensor, if the model allows.
+
+    Uses motion_model.open_loop_duration() to decide how long the actuator
+    can travel blind before it is `approach` units short of the target.  The
+    drive command is re-sent every cycle, exactly as in the closed-loop
+    phase, and the phase never runs past the move's deadline.  Does nothing
+    when config.MOTION_OPEN_LOOP is False or the model is not trained.
+    """
+    if not config.MOTION_OPEN_LOOP:
+        return
+    duration = motion_model.open_loop_duration(trace.sensor_name, current, target, approach)
+    if duration <= 0:
+        return
+
+    direction = EXTEND if target > current else RETRACT
+    start = time.monotonic()
+    end = min(start + duration, deadline)
+    print(f"[motor] Open-loop {direction} for {duration:.1f} s "
+          f"({trace.sensor_name}, model-estimated).")
+    trace.record(start, None, direction)
+    while time.monotonic() < end:
+        ser.write(commands[direction])
+        time.sleep(0.05)
+
+
+@contextlib.contextmanager
+def _moving(sensors: dict, sensor_name: str):
+    """
+    Sensor set-up for the duration of one axis's move.
+
+    Keeps a VL53L0X ranging continuously (continuous_ranging) and has the
+    SensorSampler poll this axis's sensor at its active rate while the other
+    axes drop to the background rate.  A timing budget changed during the
+    move (_adapt_timing_budget) is put back to config.VL53_TIMING_BUDGET.
+    """
+    sampler = sensors.get(config.SENSOR_SAMPLER)
+    prioritised = getattr(sampler, "prioritised", None)
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(continuous_ranging(sensors, sensor_name))
+        if prioritised is not None:
+            stack.enter_context(prioritised(sensor_name))
+        try:
+            yield
+        finally:
+            if sensor_name in config.DISTANCE_SENSORS:
+                set_timing_budget(sensors, sensor_name, config.VL53_TIMING_BUDGET)
+
+
+def _stop_after_error(ser) -> None:
+    """
+    Send CMD_ALL_OFF when a move loop is left by an exception (sensor
+    timeout, I2C error, ...), so the last drive command is not left latched
+    on the board.  Errors from the write itself are ignored: the original
+    exception is the one to report, and an interrupted move has already been
+    stopped by emergency_stop().
+    """
+    try:
+        ser.write(config.CMD_ALL_OFF)
+    except InterruptedError:
+        pass
+    except Exception as e:
+        print(f"[motor] Could not send stop after error: {e}")
+
+
+def _adapt_timing_budget(sensors: dict, sensor_name: str, error_mm: float) -> None:
+    """
+    Short VL53L0X timing budget far from the target, long one near it.
+
+    Outside config.VL53_APPROACH_BAND_MM the fast budget gives more samples
+    per second for the coarse part of the move; inside it the precise budget
+    lowers the ranging noise for the final approach.  set_timing_budget()
+    caches the value, so calling this every cycle only reprograms the sensor
+    when the band changes.
+    """
+    if not config.VL53_ADAPTIVE_BUDGET:
+        return
+    if abs(error_mm) > config.VL53_APPROACH_BAND_MM:
+        budget = config.VL53_BUDGET_FAST
+    else:
+        budget = config.VL53_BUDGET_PRECISE
+    set_timing_budget(sensors, sensor_name, budget)
+
+
+def _stall_detector():
+    """StallDetector for one distance move, or None when disabled."""
+    return StallDetector() if config.STALL_DETECTION else None
+
+
+def _record_outcome(sensor_name: str, result: str, position,
+                    start_time: float) -> MoveOutcome:
+    outcome = MoveOutcome(sensor_name, result, position,
+                          time.monotonic() - start_time)
+    _outcomes[sensor_name] = outcome
+    return outcome
+
+
+def last_outcome(sensor_name: str):
+    """
+    Return how the most recent distance move of sensor_name ended.
+
+    A MoveOutcome(sensor_name, result, position, elapsed) where result is
+    REACHED, ENDSTOP, STALLED or TIMEOUT, or None if it has not moved yet.
+    The move functions keep returning a plain bool; this carries the reason.
+    """
+    return _outcomes.get(sensor_name)
+
+
 def _read_corrected(sensors: dict, sensor_name: str) -> float:
     """
-    Return the offset-corrected distance for a VL53L0X sensor.
+    Return the filtered, offset-corrected distance for a VL53L0X sensor.
 
-    Takes config.SENSOR_AVERAGE_SAMPLES consecutive readings and averages them
-    before applying config.OFFSET[sensor_name].  Averaging suppresses the
-    per-reading noise (typically ±2–5 mm on the VL53L0X) so that the
-    calibration offset — which was itself computed from a 30-sample average —
-    is applied to an equally stable value rather than a single noisy sample.
+    The first call after _reset_filter() primes the streaming filter with
+    config.SENSOR_FILTER_WINDOW readings; every later call consumes only the
+    readings that are new since the previous call (one direct read, or the
+    fresh samples from the SensorSampler).  The filter output is as stable as
+    the old N-sample average — so the calibration offset, itself computed
+    from a 30-sample average, is applied to an equally stable value — at a
+    fraction of the per-cycle latency.
 
-    If no offset entry exists (calibration not yet run) the averaged raw
+    If no offset entry exists (calibration not yet run) the filtered raw
     reading is returned and a warning is printed.
 
     The offset is a software correction produced by the VL53L0X calibration
@@ -74,9 +291,10 @@ def _read_corrected(sensors: dict, sensor_name: str) -> float:
     between the sensor face and the actuator zero-point so that position
     commands work in real-world millimetres rather than raw sensor distances.
     """
-    n = config.SENSOR_AVERAGE_SAMPLES
-    raw = sum(get_sensor_value(sensors, sensor_name) for _ in range(n)) / n
-    offset = getattr(config, "OFFSET", {}).get(sensor_name)
+    filt, calibration = _get_filter(sensor_name)
+    _feed_filter(sensors, sensor_name, filt)
+    raw = filt.value
+    offset = calibration.offset_mm
     if offset is None:
         print(f"[motor] Warning: no calibration offset for '{sensor_name}' — "
               f"using raw reading.")
@@ -104,7 +322,8 @@ def move_to_distance(sensors: dict, sensor_name: str, target_mm: float,
 
     Returns
     -------
-    True if the target was reached, False on timeout.
+    True if the target was reached, False on timeout or when the actuator
+    stops making progress short of it (see _stalled_move, last_outcome()).
     """
     if ser is None:
         raise ValueError("A serial port object is required for motor control.")
@@ -120,30 +339,120 @@ def move_to_distance(sensors: dict, sensor_name: str, target_mm: float,
 
     print(f"[motor] Moving '{sensor_name}' → {clamped_mm} mm  (±{tolerance} mm)")
 
+    _reset_filter(sensor_name)
+    controller = PredictiveController(
+        sensor_name, clamped_mm, tolerance,
+        pwm_band=config.CONTROL_PWM_BAND_MM,
+        settle_speed=config.CONTROL_SETTLE_SPEED_MM,
+        predictive=config.CONTROL_PREDICTIVE_STOP,
+    )
+    commands = {EXTEND: cmd_extend, RETRACT: cmd_retract, OFF: config.CMD_ALL_OFF}
+    trace = motion_model.MotionTrace(sensor_name)
+    stall = _stall_detector()
     start_time = time.monotonic()
 
-    # Bang-bang (on/off) closed-loop control: read the corrected sensor distance,
-    # compute the signed error, and drive the actuator in the correcting direction
-    # until the error falls within tolerance or the timeout expires.
-    while True:
-        if time.monotonic() - start_time > timeout:
-            ser.write(config.CMD_ALL_OFF)
-            print(f"[motor] Timeout after {timeout} s — motion aborted.")
-            return False
-
-        current_mm = _read_corrected(sensors, sensor_name)
-        error      = current_mm - clamped_mm
-
-        if abs(error) <= tolerance:
-            ser.write(config.CMD_ALL_OFF)
-            print(f"[motor] Target reached: {current_mm:.1f} mm "
-                  f"(target {clamped_mm} mm).")
-            return True
-
-        # Positive error → too far out → retract
-        # Negative error → not far enough → extend
-        ser.write(cmd_retract if error > 0 else cmd_extend)
-        time.sleep(0.05)
+    # Closed-loop control: read the corrected sensor distance and let the
+    # controller pick extend / retract / off.  It cuts power early when the
+    # predicted coast would carry the actuator into the tolerance band and
+    # pulses the drive near the target, so moves rarely overshoot.  With a
+    # trained motion model the bulk of a long move is driven open-loop first.
+    with _moving(sensors, sensor_name):
+        try:
+            current_mm = _read_corrected(sensors, sensor_name)
+            _drive_open_loop(ser, commands, trace, current_mm, clamped_mm,
+                             config.MOTION_OPEN_LOOP_APPROACH_MM,
+                             start_time + timeout)
+            if trace.samples:
+                # Readings taken before the open-loop phase are stale now.
+                _reset_filter(sensor_name)
+
+            while True:
+                if time.monotonic() - start_time > timeout:
+                    ser.write(config.CMD_ALL_OFF)
+                    print(f"[motor] Timeout after {timeout} s — motion aborted.")
+                    _record_outcome(sensor_name, TIMEOUT, current_mm, start_time)
+                    return False
+
+                current_mm = _read_corrected(sensors, sensor_name)
+                now        = time.monotonic()
+                action     = controller.step(now, current_mm)
+                trace.record(now, current_mm, action)
+                _adapt_timing_budget(sensors, sensor_name, clamped_mm - current_mm)
+
+                if controller.done:
+                    ser.write(config.CMD_ALL_OFF)
+                    print(f"[motor] Target reached: {current_mm:.1f} mm "
+                          f"(target {clamped_mm} mm, "
+                          f"{controller.reversals} reversal(s)).")
+                    _record_outcome(sensor_name, REACHED, current_mm, start_time)
+                    return True
+
+                if stall is not None and stall.update(now, current_mm, action):
+                    ser.write(config.CMD_ALL_OFF)
+                    trace.record(time.monotonic(), current_mm, OFF)
+                    reached = _stalled_move(sensor_name, action, current_mm,
+                                            clamped_mm, start_time)
+                    if _at_retracted_endstop(sensor_name, action):
+                        _learn_endstop_offset(sensors, sensor_name)
+                    return reached
+
+                ser.write(commands[action])
+                time.sleep(0.05)
+        except BaseException:
+            _stop_after_error(ser)
+            raise
+        finally:
+            motion_model.update_model(trace)
+
+
+def _stalled_move(sensor_name: str, action: str, current_mm: float,
+                  target_mm: float, start_time: float) -> bool:
+    """
+    Classify and report a distance move that stopped making progress.
+
+    Near the limit it was driving towards the actuator is at its end stop;
+    that counts as success when the target was that limit as well (the
+    sensor offset merely puts the end stop a few mm past the target).
+    """
+    limit = config.MAX_POSITION if action == EXTEND else config.MIN_POSITION
+    margin = config.STALL_ENDSTOP_MARGIN_MM
+    if abs(current_mm - limit) <= margin:
+        _record_outcome(sensor_name, ENDSTOP, current_mm, start_time)
+        reached = abs(target_mm - limit) <= margin
+        print(f"[motor] '{sensor_name}' at end stop: {current_mm:.1f} mm "
+              f"(target {target_mm} mm).")
+        return reached
+    _record_outcome(sensor_name, STALLED, current_mm, start_time)
+    print(f"[motor] '{sensor_name}' stalled at {current_mm:.1f} mm "
+          f"(target {target_mm} mm) — motion aborted.")
+    return False
+
+
+def _at_retracted_endstop(sensor_name: str, action: str) -> bool:
+    """True if _stalled_move() just classified a retraction as ENDSTOP."""
+    outcome = _outcomes.get(sensor_name)
+    return action == RETRACT and outcome is not None and outcome.result == ENDSTOP
+
+
+def _learn_endstop_offset(sensors: dict, sensor_name: str) -> None:
+    """
+    Feed raw readings taken at the retracted end stop to
+    calibration.observe_endstop(), which re-estimates the sensor offset.
+
+    Called for every end stop confirmed by the stall detector while
+    retracting.  A raw reading at MIN_POSITION alone is not used: power is
+    cut there, so the actuator need not be resting on the stop.
+    """
+    if not config.OFFSET_ONLINE_LEARNING:
+        return
+    readings = []
+    for _ in range(config.OFFSET_ENDSTOP_SAMPLES):
+        time.sleep(config.OFFSET_ENDSTOP_SAMPLE_DELAY)
+        readings.append(get_sensor_value(sensors, sensor_name))
+    try:
+        calibration.observe_endstop(sensor_name, readings)
+    except Exception as e:
+        print(f"[motor] Offset update for '{sensor_name}' failed: {e}")
 
 
 def extend_fully(sensors: dict, sensor_name: str,
@@ -165,7 +474,8 @@ def extend_fully(sensors: dict, sensor_name: str,
 
     Returns
     -------
-    True if fully extended, False on timeout.
+    True if fully extended (MAX_POSITION read, or the end stop detected by
+    the stall detector), False on timeout.  See last_outcome().
     """
     if ser is None:
         raise ValueError("A serial port object is required for motor control.")
@@ -175,21 +485,55 @@ def extend_fully(sensors: dict, sensor_name: str,
     print(f"[motor] Extending '{sensor_name}' to maximum position "
           f"({config.MAX_POSITION} mm) …")
 
+    trace = motion_model.MotionTrace(sensor_name)
+    stall = _stall_detector()
     start_time = time.monotonic()
-
-    while time.monotonic() - start_time < timeout:
-        current_mm = get_sensor_value(sensors, sensor_name)
-
-        if current_mm >= config.MAX_POSITION:
-            ser.write(config.CMD_ALL_OFF)
-            print(f"[motor] '{sensor_name}' extended to {current_mm:.1f} mm.")
-            return True
-
-        ser.write(cmd_extend)
-        time.sleep(0.1)
+    current_mm = None
+
+    with _moving(sensors, sensor_name):
+        try:
+            first = True
+            while time.monotonic() - start_time < timeout:
+                current_mm = get_sensor_value(sensors, sensor_name)
+                now = time.monotonic()
+                trace.record(now, current_mm, EXTEND)
+
+                if current_mm >= config.MAX_POSITION:
+                    ser.write(config.CMD_ALL_OFF)
+                    trace.record(time.monotonic(), current_mm, OFF)
+                    print(f"[motor] '{sensor_name}' extended to {current_mm:.1f} mm.")
+                    _record_outcome(sensor_name, REACHED, current_mm, start_time)
+                    return True
+
+                # No progress while driving: the actuator is at its end stop,
+                # even though the raw reading never reaches MAX_POSITION.
+                if stall is not None and stall.update(now, current_mm, EXTEND):
+                    ser.write(config.CMD_ALL_OFF)
+                    trace.record(time.monotonic(), current_mm, OFF)
+                    print(f"[motor] '{sensor_name}' at end stop: {current_mm:.1f} mm.")
+                    _record_outcome(sensor_name, ENDSTOP, current_mm, start_time)
+                    return True
+
+                if first:
+                    first = False
+                    _drive_open_loop(ser, {EXTEND: cmd_extend}, trace, current_mm,
+                                     config.MAX_POSITION,
+                                     config.MOTION_OPEN_LOOP_APPROACH_MM,
+                                     start_time + timeout)
+                    if len(trace.samples) > 1:
+                        continue
+
+                ser.write(cmd_extend)
+                time.sleep(0.1)
+        except BaseException:
+            _stop_after_error(ser)
+            raise
+        finally:
+            motion_model.update_model(trace)
 
     ser.write(config.CMD_ALL_OFF)
     print(f"[motor] Timeout while extending '{sensor_name}'.")
+    _record_outcome(sensor_name, TIMEOUT, current_mm, start_time)
     return False
 
 
@@ -207,7 +551,10 @@ def retract_fully(sensors: dict, sensor_name: str,
 
     Returns
     -------
-    True if fully retracted, False on timeout.
+    True if fully retracted (MIN_POSITION read, or the end stop detected by
+    the stall detector), False on timeout.  See last_outcome().  At a
+    detected end stop the sensor offset is re-estimated
+    (calibration.observe_endstop).
     """
     if ser is None:
         raise ValueError("A serial port object is required for motor control.")
@@ -217,21 +564,56 @@ def retract_fully(sensors: dict, sensor_name: str,
     print(f"[motor] Retracting '{sensor_name}' to minimum position "
           f"({config.MIN_POSITION} mm) …")
 
+    trace = motion_model.MotionTrace(sensor_name)
+    stall = _stall_detector()
     start_time = time.monotonic()
-
-    while time.monotonic() - start_time < timeout:
-        current_mm = get_sensor_value(sensors, sensor_name)
-
-        if current_mm <= config.MIN_POSITION:
-            ser.write(config.CMD_ALL_OFF)
-            print(f"[motor] '{sensor_name}' retracted to {current_mm:.1f} mm.")
-            return True
-
-        ser.write(cmd_retract)
-        time.sleep(0.1)
+    current_mm = None
+
+    with _moving(sensors, sensor_name):
+        try:
+            first = True
+            while time.monotonic() - start_time < timeout:
+                current_mm = get_sensor_value(sensors, sensor_name)
+                now = time.monotonic()
+                trace.record(now, current_mm, RETRACT)
+
+                if current_mm <= config.MIN_POSITION:
+                    ser.write(config.CMD_ALL_OFF)
+                    trace.record(time.monotonic(), current_mm, OFF)
+                    print(f"[motor] '{sensor_name}' retracted to {current_mm:.1f} mm.")
+                    _record_outcome(sensor_name, REACHED, current_mm, start_time)
+                    return True
+
+                # No progress while driving: the actuator is at its end stop,
+                # even though the raw reading never reaches MIN_POSITION.
+                if stall is not None and stall.update(now, current_mm, RETRACT):
+                    ser.write(config.CMD_ALL_OFF)
+                    trace.record(time.monotonic(), current_mm, OFF)
+                    print(f"[motor] '{sensor_name}' at end stop: {current_mm:.1f} mm.")
+                    _record_outcome(sensor_name, ENDSTOP, current_mm, start_time)
+                    _learn_endstop_offset(sensors, sensor_name)
+                    return True
+
+                if first:
+                    first = False
+                    _drive_open_loop(ser, {RETRACT: cmd_retract}, trace, current_mm,
+                                     config.MIN_POSITION,
+                                     config.MOTION_OPEN_LOOP_APPROACH_MM,
+                                     start_time + timeout)
+                    if len(trace.samples) > 1:
+                        continue
+
+                ser.write(cmd_retract)
+                time.sleep(0.1)
+        except BaseException:
+            _stop_after_error(ser)
+            raise
+        finally:
+            motion_model.update_model(trace)
 
     ser.write(config.CMD_ALL_OFF)
     print(f"[motor] Timeout while retracting '{sensor_name}'.")
+    _record_outcome(sensor_name, TIMEOUT, current_mm, start_time)
     return False
 
 
@@ -240,17 +622,23 @@ def retract_fully(sensors: dict, sensor_name: str,
 # ---------------------------------------------------------------------------
 
 def move_to_angle(sensors: dict, target_deg: float,
-                  ser, tolerance: float = 1.0, timeout: float = 30) -> bool:
+                  ser, tolerance: float = None, timeout: float = 30) -> bool:
     """
     Move the tilt actuator (Motor 1) to a target angle using the ADXL345.
 
-    The ADXL345 measures tilt via the Z-axis gravity component.  The angle
-    convention (set in sensors.get_sensor_value) is:
+    With config.ADXL_TILT_3AXIS (default) the tilt is the angle of the
+    calibrated gravity vector, 180° − atan2(√(x² + y²), z), using the
+    ADXL345 axis calibration from the calibration store
+    (hardware.sensors.adxl_counts_to_tilt); otherwise it comes from the
+    Z-axis component alone.  Either way the convention is:
 
         0°   → sensor upside down    (Z ≈ −g)
         90°  → sensor perpendicular  (Z ≈  0)
         180° → sensor right-side up  (Z ≈ +g)
 
+    The move ends once the angle is within ±tolerance, by default
+    config.TILT_TOLERANCE_DEG (0.5°, steady enough with the 3-axis angle).
+
     The actuator stroke is 200 mm.  Angle limits are enforced by
     config.MIN_ANGLE_DEG and config.MAX_ANGLE_DEG so the actuator never
     travels beyond its physical range.
@@ -270,7 +658,8 @@ def move_to_angle(sensors: dict, target_deg: float,
     sensors    : Dictionary of initialised sensor objects.
     target_deg : Desired tilt angle in degrees.
     ser        : Open serial.Serial object.
-    tolerance  : Acceptable error in degrees (default ±1.0°).
+    tolerance  : Acceptable error in degrees (default
+                 ±config.TILT_TOLERANCE_DEG).
     timeout    : Maximum movement time in seconds (default 30 s).
 
     Returns
@@ -280,6 +669,9 @@ def move_to_angle(sensors: dict, target_deg: float,
     if ser is None:
         raise ValueError("A serial port object is required for motor control.")
 
+    if tolerance is None:
+        tolerance = config.TILT_TOLERANCE_DEG
+
     motor_cmds  = _get_motor_commands(config.SENSOR_ADXL)
     cmd_extend  = motor_cmds["extend"]
     cmd_retract = motor_cmds["retract"]
@@ -292,27 +684,50 @@ def move_to_angle(sensors: dict, target_deg: float,
 
     print(f"[motor] Moving tilt actuator → {clamped_deg:.1f}°  (±{tolerance}°)")
 
+    # Positive error → currently tilted too far → retract to reduce angle
+    # Negative error → not tilted enough        → extend to increase angle
+    controller = PredictiveController(
+        config.SENSOR_ADXL, clamped_deg, tolerance,
+        pwm_band=config.CONTROL_PWM_BAND_DEG,
+        settle_speed=config.CONTROL_SETTLE_SPEED_DEG,
+        predictive=config.CONTROL_PREDICTIVE_STOP,
+    )
+    commands = {EXTEND: cmd_extend, RETRACT: cmd_retract, OFF: config.CMD_ALL_OFF}
+    trace = motion_model.MotionTrace(config.SENSOR_ADXL)
     start_time = time.monotonic()
 
-    while True:
-        if time.monotonic() - start_time > timeout:
-            ser.write(config.CMD_ALL_OFF)
-            print(f"[motor] Tilt timeout after {timeout} s — motion aborted.")
-            return False
-
-        current_deg = get_sensor_value(sensors, config.SENSOR_ADXL)
-        error       = current_deg - clamped_deg
-
-        if abs(error) <= tolerance:
-            ser.write(config.CMD_ALL_OFF)
-            print(f"[motor] Tilt target reached: {current_deg:.1f}° "
-                  f"(target {clamped_deg:.1f}°).")
-            return True
-
-        # Positive error → currently tilted too far → retract to reduce angle
-        # Negative error → not tilted enough        → extend to increase angle
-        ser.write(cmd_retract if error > 0 else cmd_extend)
-        time.sleep(0.05)
+    with _moving(sensors, config.SENSOR_ADXL):
+        try:
+            current_deg = get_sensor_value(sensors, config.SENSOR_ADXL)
+            _drive_open_loop(ser, commands, trace, current_deg, clamped_deg,
+                             config.MOTION_OPEN_LOOP_APPROACH_DEG,
+                             start_time + timeout)
+
+            while True:
+                if time.monotonic() - start_time > timeout:
+                    ser.write(config.CMD_ALL_OFF)
+                    print(f"[motor] Tilt timeout after {timeout} s — motion aborted.")
+                    return False
+
+                current_deg = get_sensor_value(sensors, config.SENSOR_ADXL)
+                now         = time.monotonic()
+                action      = controller.step(now, current_deg)
+                trace.record(now, current_deg, action)
+
+                if controller.done:
+                    ser.write(config.CMD_ALL_OFF)
+                    print(f"[motor] Tilt target reached: {current_deg:.1f}° "
+                          f"(target {clamped_deg:.1f}°, "
+                          f"{controller.reversals} reversal(s)).")
+                    return True
+
+                ser.write(commands[action])
+                time.sleep(0.05)
+        except BaseException:
+            _stop_after_error(ser)
+            raise
+        finally:
+            motion_model.update_model(trace)
 
 
 def retract_tilt(sensors: dict, ser, timeout: float = 30) -> bool:
@@ -342,16 +757,21 @@ def retract_tilt(sensors: dict, ser, timeout: float = 30) -> bool:
 
     start_time = time.monotonic()
 
-    while time.monotonic() - start_time < timeout:
-        current_deg = get_sensor_value(sensors, config.SENSOR_ADXL)
+    with _moving(sensors, config.SENSOR_ADXL):
+        try:
+            while time.monotonic() - start_time < timeout:
+                current_deg = get_sensor_value(sensors, config.SENSOR_ADXL)
 
-        if current_deg <= config.MIN_ANGLE_DEG:
-            ser.write(config.CMD_ALL_OFF)
-            print(f"[motor] Tilt retracted to {current_deg:.1f}°.")
-            return True
+                if current_deg <= config.MIN_ANGLE_DEG:
+                    ser.write(config.CMD_ALL_OFF)
+                    print(f"[motor] Tilt retracted to {current_deg:.1f}°.")
+                    return True
 
-        ser.write(cmd_retract)
-        time.sleep(0.1)
+                ser.write(cmd_retract)
+                time.sleep(0.1)
+        except BaseException:
+            _stop_after_error(ser)
+            raise
 
     ser.write(config.CMD_ALL_OFF)
     print(f"[motor] Timeout while retracting tilt actuator.")
@@ -385,22 +805,164 @@ def extend_tilt(sensors: dict, ser, timeout: float = 30) -> bool:
 
     start_time = time.monotonic()
 
-    while time.monotonic() - start_time < timeout:
-        current_deg = get_sensor_value(sensors, config.SENSOR_ADXL)
+    with _moving(sensors, config.SENSOR_ADXL):
+        try:
+            while time.monotonic() - start_time < timeout:
+                current_deg = get_sensor_value(sensors, config.SENSOR_ADXL)
 
-        if current_deg >= config.MAX_ANGLE_DEG:
-            ser.write(config.CMD_ALL_OFF)
-            print(f"[motor] Tilt extended to {current_deg:.1f}°.")
-            return True
+                if current_deg >= config.MAX_ANGLE_DEG:
+                    ser.write(config.CMD_ALL_OFF)
+                    print(f"[motor] Tilt extended to {current_deg:.1f}°.")
+                    return True
 
-        ser.write(cmd_extend)
-        time.sleep(0.1)
+                ser.write(cmd_extend)
+                time.sleep(0.1)
+        except BaseException:
+            _stop_after_error(ser)
+            raise
 
     ser.write(config.CMD_ALL_OFF)
     print(f"[motor] Timeout while extending tilt actuator.")
     return False
 
 
+# ---------------------------------------------------------------------------
+# Coordinated multi-axis moves
+# ---------------------------------------------------------------------------
+
+def move_to_targets(sensors: dict, targets: dict, ser,
+                    tolerances: dict = None, timeout: float = 30) -> dict:
+    """
+    Move several actuators to their targets simultaneously.
+
+    Every axis gets its own PredictiveController and is read once per cycle
+    in one shared control loop.  The commands of all axes that still need
+    power are combined into a single packet (see hardware.protocol); an axis
+    that arrives simply stops contributing its bit, so the others keep moving
+    undisturbed.  Distance axes are watched by a StallDetector like in
+    move_to_distance(); an axis that hits its end stop or stalls is dropped
+    the same way.
+
+    Parameters
+    ----------
+    sensors    : Dictionary of initialised sensor objects.
+    targets    : {sensor_name: target} — mm for VL53L0X sensors, degrees for
+                 config.SENSOR_ADXL.  Targets are clamped to the usual limits.
+    ser        : Open serial.Serial object.
+    tolerances : Optional {sensor_name: tolerance}; defaults to ±2 mm for
+                 distance axes and ±config.TILT_TOLERANCE_DEG for the
+                 tilt axis.
+    timeout    : Maximum movement time in seconds for the whole move.
+
+    Returns
+    -------
+    {sensor_name: bool} — True for every axis that reached its target.
+    """
+    if ser is None:
+        raise ValueError("A serial port object is required for motor control.")
+
+    tolerances = tolerances or {}
+    axes = {}
+    for sensor_name, target in targets.items():
+        motor_cmds = _get_motor_commands(sensor_name)
+        if sensor_name == config.SENSOR_ADXL:
+            clamped = max(config.MIN_ANGLE_DEG, min(config.MAX_ANGLE_DEG, target))
+            tolerance = tolerances.get(sensor_name, config.TILT_TOLERANCE_DEG)
+            band, settle = config.CONTROL_PWM_BAND_DEG, config.CONTROL_SETTLE_SPEED_DEG
+        else:
+            clamped = max(config.MIN_POSITION, min(config.MAX_POSITION, target))
+            tolerance = tolerances.get(sensor_name, 2)
+            band, settle = config.CONTROL_PWM_BAND_MM, config.CONTROL_SETTLE_SPEED_MM
+            _reset_filter(sensor_name)
+        axes[sensor_name] = {
+            "controller": PredictiveController(
+                sensor_name, clamped, tolerance,
+                pwm_band=band, settle_speed=settle,
+                predictive=config.CONTROL_PREDICTIVE_STOP,
+            ),
+            "commands": {EXTEND: motor_cmds["extend"], RETRACT: motor_cmds["retract"]},
+            "trace": motion_model.MotionTrace(sensor_name),
+            # Stall thresholds are in mm, so the tilt axis is not watched
+            "stall": None if sensor_name == config.SENSOR_ADXL else _stall_detector(),
+        }
+
+    print("[motor] Coordinated move: " + ", ".join(
+        f"'{name}' → {axis['controller'].target}" for name, axis in axes.items()))
+
+    results = {name: False for name in axes}
+    active = set(axes)
+    endstops = []
+    start_time = time.monotonic()
+
+    with contextlib.ExitStack() as stack:
+        for sensor_name in axes:
+            stack.enter_context(_moving(sensors, sensor_name))
+        try:
+            while active:
+                if time.monotonic() - start_time > timeout:
+                    ser.write(config.CMD_ALL_OFF)
+                    for sensor_name in active:
+                        if sensor_name != config.SENSOR_ADXL:
+                            _record_outcome(sensor_name, TIMEOUT,
+                                            axes[sensor_name]["controller"].position,
+                                            start_time)
+                    print(f"[motor] Coordinated move timeout after {timeout} s — "
+                          f"unfinished: {sorted(active)}.")
+                    break
+
+                packets = []
+                for sensor_name in list(active):
+                    axis = axes[sensor_name]
+                    controller = axis["controller"]
+                    if sensor_name == config.SENSOR_ADXL:
+                        current = get_sensor_value(sensors, sensor_name)
+                    else:
+                        current = _read_corrected(sensors, sensor_name)
+                        _adapt_timing_budget(sensors, sensor_name,
+                                             controller.target - current)
+                    now = time.monotonic()
+                    action = controller.step(now, current)
+                    axis["trace"].record(now, current, action)
+
+                    if controller.done:
+                        active.discard(sensor_name)
+                        results[sensor_name] = True
+                        if sensor_name != config.SENSOR_ADXL:
+                            _record_outcome(sensor_name, REACHED, current, start_time)
+                        print(f"[motor] '{sensor_name}' reached {current:.1f} "
+                              f"(target {controller.target}).")
+                    elif axis["stall"] is not None and \
+                            axis["stall"].update(now, current, action):
+                        # Dropping the axis from the next packet powers it off
+                        active.discard(sensor_name)
+                        axis["trace"].record(now, current, OFF)
+                        results[sensor_name] = _stalled_move(
+                            sensor_name, action, current, controller.target, start_time)
+                        if _at_retracted_endstop(sensor_name, action):
+                            endstops.append(sensor_name)
+                    elif action != OFF:
+                        packets.append(axis["commands"][action])
+
+                if not active:
+                    break
+                ser.write(protocol.combine(packets))
+                time.sleep(0.05)
+        except BaseException:
+            _stop_after_error(ser)
+            raise
+        finally:
+            for axis in axes.values():
+                motion_model.update_model(axis["trace"])
+
+        ser.write(config.CMD_ALL_OFF)
+        # Sampled once every motor is off, so the other axes were not held
+        # up, but before _moving() exits so the sampler still polls these
+        # sensors at their active rate and each reading is a fresh one
+        for sensor_name in endstops:
+            _learn_endstop_offset(sensors, sensor_name)
+    return results
+
+
 # ---------------------------------------------------------------------------
 # Emergency stop
 # ---------------------------------------------------------------------------
@@ -1,3 +1,6 @@
-from .timeout import timeout, TimeoutError
-from .misc import vector_to_degrees, z_axis_to_degrees
-__all__ = ['timeout', 'TimeoutError', 'vector_to_degrees', 'z_axis_to_degrees']
+from .timeout import timeout, TimeoutError, Deadline, call_with_timeout
+from .misc import (vector_to_degrees, z_axis_to_degrees, z_axis_to_degrees_batch,
+                   apply_calibration, tilt_degrees, tilt_degrees_batch)
+from .filters import make_filter
+from .files import atomic_write_json
+__all__ = ['timeout', 'TimeoutError', 'Deadline', 'call_with_timeout', 'vector_to_degrees', 'z_axis_to_degrees', 'z_axis_to_degrees_batch', 'apply_calibration', 'tilt_degrees', 'tilt_degrees_batch', 'make_filter', 'atomic_write_json']
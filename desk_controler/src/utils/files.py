@@ -0,0 +1,38 @@
+"""
+Durable file writes for persisted state (calibration, warm-start cache,
+motion models).
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+
+
+def atomic_write_json(path, data, indent=4):
+    """
+    Write data to path as JSON via a fsync'ed temporary file and os.replace().
+
+    A power cut leaves either the old or the new file, never a truncated one.
+    Raises OSError (the temporary file is removed) if the write fails.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    prefix = "." + os.path.basename(path) + "-"
+    fd, tmp_path = tempfile.mkstemp(prefix=prefix, suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+    # Make the rename itself durable
+    with contextlib.suppress(OSError):
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
@@ -0,0 +1,167 @@
+"""
+Streaming noise filters for sensor readings.
+
+Each filter consumes one sample at a time through update() and keeps just
+enough state (a fixed-size ring buffer or a couple of floats) to return a
+smoothed value immediately.  This lets a control loop take one fresh reading
+per cycle and still get the noise suppression of an N-sample average, instead
+of re-sampling N times and throwing the readings away afterwards.
+
+Available filters
+-----------------
+  RunningMean     — mean of the last `window` samples (O(1) per update).
+  MedianFilter    — median of the last `window` samples; rejects spikes.
+  EMAFilter       — exponential moving average with smoothing factor alpha.
+  KalmanFilter1D  — scalar Kalman filter with a random-walk process model.
+
+All filters report `primed` once they have seen `window` samples, which is the
+point at which their output is at least as stable as a `window`-sample mean.
+"""
+
+import collections
+import statistics
+
+
+class StreamFilter:
+    """Base class for streaming filters."""
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError(f"Filter window must be >= 1, got {window}")
+        self.window = window
+        self.count = 0
+        self.value = None
+
+    @property
+    def primed(self) -> bool:
+        """True once at least `window` samples have been consumed."""
+        return self.count >= self.window
+
+    def update(self, sample: float) -> float:
+        """Consume one sample and return the new filtered value."""
+        self.count += 1
+        self.value = self._update(sample)
+        return self.value
+
+    def reset(self) -> None:
+        """Forget all history."""
+        self.count = 0
+        self.value = None
+        self._reset()
+
+    def _update(self, sample: float) -> float:
+        raise NotImplementedError
+
+    def _reset(self) -> None:
+        raise NotImplementedError
+
+
+class RunningMean(StreamFilter):
+    """Mean of the last `window` samples, maintained with a running sum."""
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self._buffer = collections.deque(maxlen=window)
+        self._sum = 0.0
+
+    def _update(self, sample):
+        if len(self._buffer) == self.window:
+            self._sum -= self._buffer[0]
+        self._buffer.append(sample)
+        self._sum += sample
+        return self._sum / len(self._buffer)
+
+    def _reset(self):
+        self._buffer.clear()
+        self._sum = 0.0
+
+
+class MedianFilter(StreamFilter):
+    """Median of the last `window` samples (robust to single-sample spikes)."""
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self._buffer = collections.deque(maxlen=window)
+
+    def _update(self, sample):
+        self._buffer.append(sample)
+        return float(statistics.median(self._buffer))
+
+    def _reset(self):
+        self._buffer.clear()
+
+
+class EMAFilter(StreamFilter):
+    """
+    Exponential moving average.
+
+    The first `window` samples are averaged to seed the filter so its output
+    is not dominated by a single noisy first reading.
+    """
+
+    def __init__(self, alpha: float, window: int = 1):
+        super().__init__(window)
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"EMA alpha must be in (0, 1], got {alpha}")
+        self.alpha = alpha
+        self._seed_sum = 0.0
+
+    def _update(self, sample):
+        if self.count <= self.window:
+            self._seed_sum += sample
+            return self._seed_sum / self.count
+        return self.value + self.alpha * (sample - self.value)
+
+    def _reset(self):
+        self._seed_sum = 0.0
+
+
+class KalmanFilter1D(StreamFilter):
+    """
+    Scalar Kalman filter for a slowly moving position.
+
+    Parameters
+    ----------
+    process_var     : Expected variance of the true position change between
+                      samples (mm² per sample).  Larger values track motion
+                      faster; smaller values smooth harder.
+    measurement_var : Variance of a single sensor reading (mm²).
+    window          : Samples consumed before the filter reports `primed`.
+    """
+
+    def __init__(self, process_var: float, measurement_var: float, window: int = 1):
+        super().__init__(window)
+        self.process_var = process_var
+        self.measurement_var = measurement_var
+        self._estimate_var = None
+
+    def _update(self, sample):
+        if self.value is None:
+            self._estimate_var = self.measurement_var
+            return float(sample)
+
+        predicted_var = self._estimate_var + self.process_var
+        gain = predicted_var / (predicted_var + self.measurement_var)
+        self._estimate_var = (1.0 - gain) * predicted_var
+        return self.value + gain * (sample - self.value)
+
+    def _reset(self):
+        self._estimate_var = None
+
+
+FILTER_KINDS = ("mean", "median", "ema", "kalman")
+
+
+def make_filter(kind: str, window: int, ema_alpha: float = 0.5,
+                kalman_process_var: float = 4.0,
+                kalman_measurement_var: float = 9.0) -> StreamFilter:
+    """Build a streaming filter by name (one of FILTER_KINDS)."""
+    if kind == "mean":
+        return RunningMean(window)
+    if kind == "median":
+        return MedianFilter(window)
+    if kind == "ema":
+        return EMAFilter(ema_alpha, window)
+    if kind == "kalman":
+        return KalmanFilter1D(kalman_process_var, kalman_measurement_var, window)
+    raise ValueError(f"Unknown filter kind '{kind}'. Valid kinds: {FILTER_KINDS}")
@@ -1,5 +1,22 @@
 from math import atan2, degrees, acos, sqrt
 
+# NumPy is optional and imported on first use (see _numpy)
+_np = None
+_NUMPY_AVAILABLE = True
+
+
+def _numpy():
+    """Return the numpy module, or None if it is not installed."""
+    global _np, _NUMPY_AVAILABLE
+    if _np is None and _NUMPY_AVAILABLE:
+        try:
+            import numpy
+        except ImportError:
+            _NUMPY_AVAILABLE = False
+        else:
+            _np = numpy
+    return _np
+
 
 def vector_to_degrees(x, y):
     """Convert coordinates into an angle in degrees."""
@@ -43,3 +60,97 @@ def z_axis_to_degrees(z: float, g: float = 9.81) -> float:
     raw_angle = degrees(acos(ratio))
     # Remap: upside-down (raw=180°) → 0°, perpendicular (raw=90°) → 90°
     return 180.0 - raw_angle
+
+
+def z_axis_to_degrees_batch(z_values, g: float = 9.81):
+    """
+    Convert a batch of Z-axis readings (m/s²) to angles in degrees.
+
+    Same convention as z_axis_to_degrees(), evaluated for the whole batch at
+    once with NumPy (one clip and one arccos over an array) when NumPy is
+    installed, and sample by sample otherwise.
+
+    Returns
+    -------
+    numpy.ndarray or list of float
+        One angle per input value, in the range [0, 180].
+    """
+    np = _numpy()
+    if np is None:
+        return [z_axis_to_degrees(z, g) for z in z_values]
+    ratio = np.clip(np.asarray(z_values, dtype=float) / g, -1.0, 1.0)
+    return 180.0 - np.degrees(np.arccos(ratio))
+
+
+def apply_calibration(x, y, z, cal=None):
+    """
+    Apply a per-axis 2-point calibration to one accelerometer sample.
+
+    Parameters
+    ----------
+    x, y, z : float
+        Raw readings (ADXL345 counts, or any unit the calibration was taken in).
+    cal : dict or None
+        {"x": (scale, offset), "y": ..., "z": ...} as returned by
+        calibrationCurveADXL.calibrate_adxl().  None returns the sample as is.
+
+    Returns
+    -------
+    (x, y, z) in g when calibrated, else unchanged.
+    """
+    if cal is None:
+        return x, y, z
+    return (x * cal["x"][0] + cal["x"][1],
+            y * cal["y"][0] + cal["y"][1],
+            z * cal["z"][0] + cal["z"][1])
+
+
+def tilt_degrees(x, y, z, cal=None) -> float:
+    """
+    Tilt angle in degrees from the full gravity vector.
+
+    Same convention as z_axis_to_degrees() (0° upside down, 90° perpendicular,
+    180° right-side up), but computed as
+
+        angle = 180° − degrees( atan2( sqrt(x² + y²), z ) )
+
+    over the calibrated vector.  atan2 needs no g constant and keeps full
+    resolution near 0° and 180°, where acos(z / g) flattens out.
+
+    Parameters
+    ----------
+    x, y, z : float
+        One accelerometer sample (see apply_calibration()).
+    cal : dict or None
+        Per-axis (scale, offset) calibration, or None for raw values.
+
+    Returns
+    -------
+    float
+        Angle in degrees in the range [0, 180].
+    """
+    x, y, z = apply_calibration(x, y, z, cal)
+    return 180.0 - degrees(atan2(sqrt(x * x + y * y), z))
+
+
+def tilt_degrees_batch(samples, cal=None):
+    """
+    Tilt angles for a batch of (x, y, z) samples.
+
+    Same result as tilt_degrees() per sample, evaluated over an (n, 3) array
+    with NumPy when installed and sample by sample otherwise.
+
+    Returns
+    -------
+    numpy.ndarray or list of float
+        One angle per sample, in the range [0, 180].
+    """
+    np = _numpy()
+    if np is None:
+        return [tilt_degrees(x, y, z, cal) for x, y, z in samples]
+    vectors = np.asarray(samples, dtype=float).reshape(-1, 3)
+    if cal is not None:
+        vectors = (vectors * np.array([cal["x"][0], cal["y"][0], cal["z"][0]])
+                   + np.array([cal["x"][1], cal["y"][1], cal["z"][1]]))
+    horizontal = np.hypot(vectors[:, 0], vectors[:, 1])
+    return 180.0 - np.degrees(np.arctan2(horizontal, vectors[:, 2]))
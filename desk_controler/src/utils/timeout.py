@@ -1,23 +1,151 @@
+"""
+Thread-safe deadlines with sub-second resolution.
+
+The controller runs hardware I/O from the main thread, the motor worker
+threads and the sensor sampler thread, so timeouts cannot rely on SIGALRM
+(main thread only, whole seconds with signal.alarm).  This module offers:
+
+  Deadline           — a monotonic-clock deadline for cooperative loops
+                       (remaining, expired, check()).
+  call_with_timeout  — run a call on a reusable worker thread and stop
+                       waiting for it after `seconds`; works from any thread.
+  timeout            — context manager kept for existing callers; uses a
+                       float interval timer (setitimer) and so only works on
+                       the main thread.
+
+A call abandoned by call_with_timeout keeps its worker thread until it
+returns; the pool grows up to config.TIMEOUT_WORKERS threads so later calls
+are not starved by one hung transaction.  A call made from a worker (e.g. a
+sensor read inside a timed init) runs inline instead of taking a second
+worker: the outer call already bounds it, and nesting could exhaust the
+pool.  Pass `lock` to hold a device lock for exactly as long as the call
+runs, including after the caller has given up on it.
+"""
+
 import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as _FutureTimeout
 from contextlib import contextmanager
 
+import config
+
 
 class TimeoutError(Exception):
     """Custom timeout exception"""
     pass
 
 
+class Deadline:
+    """A point in time `seconds` from now on the monotonic clock."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @property
+    def remaining(self):
+        """Seconds left (never negative)."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+    def check(self, error_message="Operation timed out"):
+        """Raise TimeoutError if the deadline has passed."""
+        if self.expired:
+            raise TimeoutError(error_message)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+# .active is True on a pool worker while it runs a call
+_worker = threading.local()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=config.TIMEOUT_WORKERS,
+                    thread_name_prefix="deadline",
+                )
+    return _executor
+
+
+def _locked_call(fn, lock, deadline, error_message):
+    """Run fn() holding lock; give up if the lock is not free before deadline."""
+    if lock is None:
+        return fn()
+    if not lock.acquire(timeout=deadline.remaining):
+        raise TimeoutError(error_message)
+    try:
+        # The caller may have given up while we waited for the lock
+        deadline.check(error_message)
+        return fn()
+    finally:
+        lock.release()
+
+
+def _run_on_worker(fn, lock, deadline, error_message):
+    _worker.active = True
+    try:
+        return _locked_call(fn, lock, deadline, error_message)
+    finally:
+        _worker.active = False
+
+
+def call_with_timeout(fn, seconds, error_message="Operation timed out", lock=None):
+    """
+    Call fn() and return its result, or raise TimeoutError after `seconds`.
+
+    Safe to use from any thread.  fn runs on a reusable worker thread;
+    exceptions it raises are re-raised in the caller.  On timeout the caller
+    stops waiting immediately, but fn itself cannot be killed and finishes in
+    the background.
+
+    lock, if given, is acquired on the worker around fn(), so a call that is
+    abandoned keeps the lock until it really returns and the next user of
+    the device waits for it (or times out) instead of interleaving with it.
+
+    Called from a worker thread, fn runs inline within the outer deadline.
+    """
+    deadline = Deadline(seconds)
+    if getattr(_worker, "active", False):
+        return _locked_call(fn, lock, deadline, error_message)
+    future = _get_executor().submit(_run_on_worker, fn, lock, deadline, error_message)
+    try:
+        return future.result(timeout=seconds)
+    except _FutureTimeout:
+        future.cancel()
+        raise TimeoutError(error_message) from None
+
+
 @contextmanager
 def timeout(seconds, error_message="Operation timed out"):
-    """Context manager for timeout handling using signals"""
+    """
+    Context manager for timeout handling.
+
+    The block is interrupted after `seconds` (fractions allowed) by an
+    ITIMER_REAL signal.  Signals are only delivered to the main thread, where
+    a block could not be interrupted elsewhere, so any other thread gets a
+    RuntimeError; use call_with_timeout() there.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        raise RuntimeError("timeout() only works on the main thread; "
+                           "use call_with_timeout()")
+
     def timeout_handler(signum, frame):
         raise TimeoutError(error_message)
-    
+
     old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-    signal.alarm(int(seconds))
-    
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+
     try:
         yield
     finally:
-        signal.alarm(0)
+        signal.setitimer(signal.ITIMER_REAL, 0)
         signal.signal(signal.SIGALRM, old_handler)
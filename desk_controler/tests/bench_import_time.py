@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Startup import-time benchmark.
+
+Imports a module in a fresh interpreter with ``python -X importtime`` and
+reports the cost of every module it pulls in, slowest first.  Fails (exit
+code 1) when a driver library is imported eagerly or when the total import
+time exceeds --max-ms, so startup regressions are caught.
+
+Usage:
+    python bench_import_time.py                       # desk_controller_wrapper
+    python bench_import_time.py hardware --top 10
+    python bench_import_time.py --max-ms 400
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# Must load only when the corresponding init function (or mqtt_connect) runs
+DRIVER_MODULES = (
+    "board",
+    "busio",
+    "serial",
+    "adafruit_tca9548a",
+    "adafruit_vl53l0x",
+    "adafruit_adxl34x",
+    "paho",
+)
+
+
+def measure(module):
+    """
+    Import module in a fresh interpreter.
+
+    Returns {imported module name: (self_us, cumulative_us)}.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(SRC_DIR), env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def eager_drivers(timings):
+    """Driver modules (or their submodules) present in the timings."""
+    return sorted(
+        name for name in timings
+        if any(name == d or name.startswith(d + ".") for d in DRIVER_MODULES)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("module", nargs="?", default="desk_controller_wrapper")
+    parser.add_argument("--top", type=int, default=20, help="rows to print")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="fail if the total import time exceeds this")
+    args = parser.parse_args()
+
+    timings = measure(args.module)
+    total_ms = timings[args.module][1] / 1000
+
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    rows = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_us, cumulative_us) in rows[:args.top]:
+        print(f"{self_us / 1000:9.1f} {cumulative_us / 1000:9.1f}  {name}")
+    print(f"\nimport {args.module}: {total_ms:.1f} ms, {len(timings)} modules")
+
+    ok = True
+    drivers = eager_drivers(timings)
+    if drivers:
+        print(f"❌ Driver modules imported eagerly: {', '.join(drivers)}")
+        ok = False
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"❌ Import time {total_ms:.1f} ms exceeds budget of {args.max_ms:.1f} ms")
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Tests for the adaptive VL53L0X timing budget: hardware.sensors.set_timing_budget
+and its use by motor_control.move_to_distance.
+"""
+
+import contextlib
+import importlib
+import sys
+import types
+from pathlib import Path
+from unittest.mock import patch
+
+
+_DRIVER_MODULES = (
+    "board", "busio", "serial",
+    "adafruit_tca9548a", "adafruit_vl53l0x", "adafruit_adxl34x",
+)
+
+
+def _src_on_path():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    return src_dir
+
+
+def _load_sensors():
+    _src_on_path()
+    for name in _DRIVER_MODULES:
+        sys.modules.setdefault(name, types.ModuleType(name))
+    for name in [m for m in sys.modules if m == "hardware" or m.startswith("hardware.")]:
+        del sys.modules[name]
+    return importlib.import_module("hardware.sensors")
+
+
+def _load_motor_control(budget_calls):
+    src_dir = _src_on_path()
+    fake_hardware = types.ModuleType("hardware")
+    fake_hardware.__path__ = [str(src_dir / "hardware")]
+    fake_hardware.get_sensor_value = lambda sensors, name: 0
+    fake_hardware.continuous_ranging = lambda *_: contextlib.nullcontext()
+    fake_hardware.set_timing_budget = (
+        lambda _sensors, name, budget: budget_calls.append((name, budget)))
+    sys.modules["hardware"] = fake_hardware
+    sys.modules.pop("motor_control", None)
+    return importlib.import_module("motor_control")
+
+
+class _FakeVL53:
+    """Driver stand-in counting how often the budget is reprogrammed."""
+
+    def __init__(self, continuous=False):
+        self._measurement_timing_budget_us = 33000
+        self.is_continuous_mode = continuous
+        self.writes = []
+        self.events = []
+
+    @property
+    def measurement_timing_budget(self):
+        return self._measurement_timing_budget_us
+
+    @measurement_timing_budget.setter
+    def measurement_timing_budget(self, budget_us):
+        assert not self.is_continuous_mode, "budget written while ranging"
+        self.writes.append(budget_us)
+        self._measurement_timing_budget_us = budget_us
+
+    def stop_continuous(self):
+        self.events.append("stop")
+        self.is_continuous_mode = False
+
+    def start_continuous(self):
+        self.events.append("start")
+        self.is_continuous_mode = True
+
+
+def test_unchanged_budget_is_not_reprogrammed():
+    sensors_mod = _load_sensors()
+    name = sensors_mod.config.SENSOR_VL53_0
+    sensor = _FakeVL53()
+    sensors = {name: sensor}
+
+    assert not sensors_mod.set_timing_budget(sensors, name, 33000)
+    assert sensors_mod.set_timing_budget(sensors, name, 20000)
+    for _ in range(5):
+        assert not sensors_mod.set_timing_budget(sensors, name, 20000)
+    assert sensors_mod.set_timing_budget(sensors, name, 100000)
+    assert sensor.writes == [20000, 100000]
+    # Longer budget → longer read deadline
+    assert sensors_mod._vl53_read_timeout(sensor) >= 0.2
+
+    # A re-initialised driver object is not mistaken for the cached one
+    sensors[name] = _FakeVL53()
+    assert sensors_mod.set_timing_budget(sensors, name, 100000)
+    assert not sensors_mod.set_timing_budget(sensors, sensors_mod.config.SENSOR_ADXL, 20000)
+
+
+def test_continuous_sensor_is_stopped_for_the_change():
+    sensors_mod = _load_sensors()
+    name = sensors_mod.config.SENSOR_VL53_1
+    sensor = _FakeVL53(continuous=True)
+
+    assert sensors_mod.set_timing_budget({name: sensor}, name, 20000)
+    assert sensor.events == ["stop", "start"]
+    assert sensor.is_continuous_mode
+
+
+def test_move_uses_fast_budget_far_away_and_precise_budget_near_target(monkeypatch):
+    budget_calls = []
+    mc = _load_motor_control(budget_calls)
+    cfg = mc.config
+    name = cfg.SENSOR_VL53_0
+    monkeypatch.setattr(cfg, "CONTROL_PREDICTIVE_STOP", False)
+    monkeypatch.setattr(mc.time, "sleep", lambda _s: None)
+
+    position = [100.0]
+
+    class _Serial:
+        def write(self, packet):
+            if packet == cfg.SENSOR_MOTOR_COMMANDS[name]["extend"]:
+                position[0] += 5.0
+            elif packet == cfg.SENSOR_MOTOR_COMMANDS[name]["retract"]:
+                position[0] -= 5.0
+
+    with patch.object(mc, "_read_corrected", side_effect=lambda *_: position[0]):
+        assert mc.move_to_distance({}, name, 200, _Serial(), timeout=5)
+
+    budgets = [budget for sensor_name, budget in budget_calls if sensor_name == name]
+    assert budgets[0] == cfg.VL53_BUDGET_FAST
+    assert cfg.VL53_BUDGET_PRECISE in budgets
+    assert budgets[-1] == cfg.VL53_TIMING_BUDGET
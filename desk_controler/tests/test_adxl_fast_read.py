@@ -0,0 +1,146 @@
+"""
+Tests for the burst ADXL345 reader, Z-count angle table and FIFO streaming.
+"""
+
+import importlib
+import struct
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+
+_DRIVER_MODULES = (
+    "board", "busio", "serial",
+    "adafruit_tca9548a", "adafruit_vl53l0x", "adafruit_adxl34x",
+)
+
+
+def _load_sensors():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+
+    for name in _DRIVER_MODULES:
+        sys.modules.setdefault(name, types.ModuleType(name))
+    for name in [m for m in sys.modules if m == "hardware" or m.startswith("hardware.")]:
+        del sys.modules[name]
+
+    return importlib.import_module("hardware.sensors")
+
+
+class _FakeChannel:
+    def __init__(self, counts):
+        self.data = struct.pack("<hhh", *counts)
+        self.transactions = 0
+
+    def try_lock(self):
+        return True
+
+    def unlock(self):
+        pass
+
+    def writeto_then_readfrom(self, addr, out_buffer, in_buffer):
+        self.transactions += 1
+        assert addr == 0x53 and out_buffer[0] == 0x32
+        in_buffer[:] = self.data
+
+
+class _FakeADXL:
+    """Initialized driver object as left by adafruit_adxl34x.ADXL345()."""
+
+    def __init__(self, channel):
+        self._i2c = types.SimpleNamespace(i2c=channel, device_address=0x53)
+
+    @property
+    def acceleration(self):
+        raise AssertionError("float acceleration path used")
+
+
+def test_table_matches_acos_formula():
+    sensors = _load_sensors()
+    scale = sensors.config.ADXL_MS2_PER_COUNT
+    for counts in (-300, -250, -120, -1, 0, 1, 77, 249, 250, 400):
+        assert sensors.adxl_counts_to_degrees(counts) == pytest.approx(
+            sensors.z_axis_to_degrees(counts * scale))
+    # Fractional (averaged) counts interpolate between neighbours
+    assert sensors.adxl_counts_to_degrees(10.5) == pytest.approx(
+        sensors.z_axis_to_degrees(10.5 * scale), abs=0.01)
+
+
+def test_burst_read_returns_signed_counts_in_one_transaction():
+    sensors = _load_sensors()
+    channel = _FakeChannel((-3, 512, -200))
+    assert sensors.read_adxl_counts(_FakeADXL(channel)) == (-3, 512, -200)
+    assert channel.transactions == 1
+
+
+def test_read_sensor_uses_fast_path_for_z_only_tilt(monkeypatch):
+    sensors = _load_sensors()
+    monkeypatch.setattr(sensors.config, "ADXL_TILT_3AXIS", False)
+    name = sensors.config.SENSOR_ADXL
+    adxl = _FakeADXL(_FakeChannel((0, 0, 125)))
+
+    angle = sensors.read_sensor({name: adxl}, name)
+    assert angle == pytest.approx(
+        sensors.z_axis_to_degrees(125 * sensors.config.ADXL_MS2_PER_COUNT))
+
+
+class _FakeFifoChannel:
+    """ADXL345 in stream mode; `queued` holds the FIFO contents."""
+
+    def __init__(self, queued=()):
+        self.queued = list(queued)
+        self.registers = {}
+        self.locks = 0
+
+    def try_lock(self):
+        self.locks += 1
+        return True
+
+    def unlock(self):
+        pass
+
+    def writeto(self, addr, buffer):
+        self.registers[buffer[0]] = buffer[1]
+
+    def writeto_then_readfrom(self, addr, out_buffer, in_buffer):
+        if out_buffer[0] == 0x39:
+            in_buffer[0] = len(self.queued)
+        else:
+            in_buffer[:] = struct.pack("<hhh", *self.queued.pop(0))
+
+
+def test_stream_configuration_sets_rate_and_fifo_mode():
+    sensors = _load_sensors()
+    channel = _FakeFifoChannel()
+    sensors.configure_adxl_stream(_FakeADXL(channel), rate_hz=400)
+    assert channel.registers == {0x2C: 0x0C, 0x38: 0x80}
+    with pytest.raises(ValueError):
+        sensors.configure_adxl_stream(_FakeADXL(channel), rate_hz=300)
+
+
+def test_stream_mode_returns_mean_angle_of_drained_batch(monkeypatch):
+    sensors = _load_sensors()
+    monkeypatch.setattr(sensors.config, "ADXL_STREAM_MODE", True)
+    monkeypatch.setattr(sensors.config, "ADXL_TILT_3AXIS", False)
+    scale = sensors.config.ADXL_MS2_PER_COUNT
+    name = sensors.config.SENSOR_ADXL
+    batch = [(0, 0, z) for z in (90, 100, 110, 120)]
+    channel = _FakeFifoChannel(batch)
+    adxl = {name: _FakeADXL(channel)}
+
+    expected = sum(sensors.z_axis_to_degrees(z * scale) for _, _, z in batch) / 4
+    assert sensors.read_sensor(adxl, name) == pytest.approx(expected)
+    assert channel.queued == [] and channel.locks == 1
+
+    # Empty FIFO → last batch angle, no extra sample reads
+    assert sensors.read_sensor(adxl, name) == pytest.approx(expected)
+
+
+def test_batch_conversion_matches_per_sample():
+    sensors = _load_sensors()
+    values = [-12.0, -9.81, -3.3, 0.0, 4.9, 9.81, 11.0]
+    batch = sensors.z_axis_to_degrees_batch(values)
+    assert list(batch) == pytest.approx([sensors.z_axis_to_degrees(z) for z in values])
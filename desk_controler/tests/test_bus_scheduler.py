@@ -0,0 +1,151 @@
+"""
+Tests for the TCA9548A channel-affinity scheduler in hardware.bus_scheduler.
+"""
+
+import importlib
+import sys
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+
+_DRIVER_MODULES = (
+    "board", "busio", "serial",
+    "adafruit_tca9548a", "adafruit_vl53l0x", "adafruit_adxl34x",
+)
+
+
+def _load(module):
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    for name in _DRIVER_MODULES:
+        sys.modules.setdefault(name, types.ModuleType(name))
+    for name in [m for m in sys.modules if m == "hardware" or m.startswith("hardware.")]:
+        del sys.modules[name]
+    return importlib.import_module(module)
+
+
+class _FakeI2C:
+    """Root bus: records every write to the mux and every device transaction."""
+
+    def __init__(self, fail_on=None):
+        self.mux_writes = []
+        self.transactions = []
+        self.locked = False
+        self.fail_on = fail_on
+
+    def try_lock(self):
+        if self.locked:
+            return False
+        self.locked = True
+        return True
+
+    def unlock(self):
+        self.locked = False
+
+    def writeto(self, address, buffer):
+        assert self.locked
+        if address == 0x70:
+            self.mux_writes.append(bytes(buffer)[0])
+        else:
+            if address == self.fail_on:
+                raise OSError(121, "Remote I/O error")
+            self.transactions.append(("w", address))
+
+    def writeto_then_readfrom(self, address, out_buffer, in_buffer):
+        assert self.locked
+        self.transactions.append(("wr", address))
+        in_buffer[0] = 0xE5
+
+    def scan(self):
+        return [0x29, 0x70]
+
+
+def _scheduler(**kwargs):
+    bus_scheduler = _load("hardware.bus_scheduler")
+    i2c = _FakeI2C(**kwargs)
+    return bus_scheduler.BusScheduler(types.SimpleNamespace(i2c=i2c, address=0x70)), i2c
+
+
+def _access(channel, address=0x29):
+    channel.try_lock()
+    try:
+        channel.writeto(address, b"\x00\x01")
+    finally:
+        channel.unlock()
+
+
+def test_repeated_access_to_one_channel_selects_once():
+    mux, i2c = _scheduler()
+    for _ in range(5):
+        _access(mux[0])
+
+    assert i2c.mux_writes == [0x01]
+    assert len(i2c.transactions) == 5
+    assert mux.stats()[0] == {"locks": 5, "selects": 1, "skipped_selects": 4,
+                              "transactions": 5, "errors": 0}
+    assert not i2c.locked
+
+
+def test_switching_channels_selects_each_time():
+    mux, i2c = _scheduler()
+    for channel in (0, 1, 2, 2, 0):
+        _access(mux[channel])
+
+    assert i2c.mux_writes == [0x01, 0x02, 0x04, 0x01]
+    assert mux.active_channel == 0
+    assert mux[1].scan() == [0x29]
+    with pytest.raises(IndexError):
+        mux[8]
+
+
+def test_bus_error_forces_reselect():
+    mux, i2c = _scheduler(fail_on=0x53)
+    _access(mux[2], address=0x29)
+    with pytest.raises(OSError):
+        _access(mux[2], address=0x53)
+    assert mux.active_channel is None
+
+    _access(mux[2], address=0x29)
+    assert i2c.mux_writes == [0x04, 0x04]
+    assert mux.stats()[2]["errors"] == 1
+
+
+def test_order_puts_active_channel_first_and_groups_the_rest():
+    mux, _ = _scheduler()
+    channels = {"a0": 0, "b1": 1, "c2": 2, "d1": 1, "mqtt": None}
+    _access(mux[1])
+
+    assert mux.order(["a0", "mqtt", "b1", "c2", "d1"], channels.get) == \
+        ["b1", "d1", "a0", "c2", "mqtt"]
+
+
+def test_sampler_reads_due_sensors_in_channel_order(monkeypatch):
+    sampler_module = _load("hardware.sampler")
+    cfg = sampler_module.config
+    mux, _ = _scheduler()
+    _access(mux[cfg.ADXL345_CHANNEL])
+
+    order = []
+
+    def fake_read(_sensors, sensor_name):
+        order.append(sensor_name)
+        return 0
+
+    monkeypatch.setattr(sampler_module, "read_sensor", fake_read)
+    sensors = {cfg.SENSOR_MUX: mux, cfg.SENSOR_VL53_1: object(),
+               cfg.SENSOR_VL53_0: object(), cfg.SENSOR_ADXL: object()}
+    periods = {cfg.SENSOR_VL53_1: 10, cfg.SENSOR_VL53_0: 10, cfg.SENSOR_ADXL: 10}
+    sampler = sampler_module.SensorSampler(sensors, periods=periods)
+    sampler.start()
+    try:
+        deadline = time.monotonic() + 1.0
+        while len(order) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        sampler.stop()
+
+    assert order == [cfg.SENSOR_ADXL, cfg.SENSOR_VL53_0, cfg.SENSOR_VL53_1]
@@ -0,0 +1,123 @@
+"""
+Tests for the interleaved, early-terminating VL53L0X calibration sampler.
+"""
+
+import contextlib
+import importlib
+import itertools
+import random
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+
+def _load_calibration(monkeypatch, readings):
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+
+    ranging = []
+
+    @contextlib.contextmanager
+    def continuous_ranging(_sensors, name):
+        ranging.append(name)
+        yield
+
+    fake_hardware = types.ModuleType("hardware")
+    fake_hardware.get_sensor_value = lambda _sensors, name: next(readings[name])
+    fake_hardware.continuous_ranging = continuous_ranging
+    monkeypatch.setitem(sys.modules, "hardware", fake_hardware)
+    sys.modules.pop("calibration", None)
+    calibration = importlib.import_module("calibration")
+
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    monkeypatch.setattr(calibration.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(calibration.time, "sleep", sleep)
+    return calibration, now, ranging
+
+
+def test_robust_stats_rejects_outliers(monkeypatch):
+    calibration, _, _ = _load_calibration(monkeypatch, {})
+    stats = calibration._robust_stats([47, 48, 47, 46, 47, 48, 250, 47])
+    assert stats["rejected"] == 1
+    assert stats["median_mm"] == 47
+    assert stats["mean_mm"] == pytest.approx(330 / 7)
+    assert stats["sem_mm"] < 0.5
+
+
+def test_sampler_interleaves_and_stops_each_sensor_early(monkeypatch):
+    readings = {
+        "vl53l0x_0": itertools.cycle([47, 47, 48, 47]),          # quiet
+        "vl53l0x_1": itertools.cycle([85, 95, 88, 92, 80, 99]),  # noisy
+    }
+    calibration, now, ranging = _load_calibration(monkeypatch, readings)
+
+    results = calibration._sample_sensors({}, ["vl53l0x_0", "vl53l0x_1"])
+
+    quiet_stats, quiet = results["vl53l0x_0"]
+    noisy_stats, noisy = results["vl53l0x_1"]
+    assert len(quiet) == calibration.CALIBRATION_MIN_SAMPLES
+    assert quiet_stats["sem_mm"] <= calibration.CALIBRATION_SEM_MM
+    assert len(noisy) == calibration.CALIBRATION_SAMPLES
+    # Both sensors are read in the same rounds
+    assert ranging == ["vl53l0x_0", "vl53l0x_1"]
+    assert now[0] == pytest.approx(calibration.CALIBRATION_SAMPLES * calibration.SAMPLE_DELAY)
+    assert now[0] < 2.0
+
+
+def _vl53_noise(true_mm, sigma_mm, seed):
+    """Integer-mm readings with Gaussian noise, like the VL53L0X driver."""
+    rng = random.Random(seed)
+    while True:
+        yield round(rng.gauss(true_mm, sigma_mm))
+
+
+@pytest.mark.parametrize("sigma_mm", [1.5, 2.0])
+def test_sampler_stops_early_at_realistic_sensor_noise(monkeypatch, sigma_mm):
+    readings = {
+        "vl53l0x_0": _vl53_noise(47.0, sigma_mm, seed=1),
+        "vl53l0x_1": _vl53_noise(91.0, sigma_mm, seed=2),
+    }
+    calibration, _, _ = _load_calibration(monkeypatch, readings)
+
+    results = calibration._sample_sensors({}, ["vl53l0x_0", "vl53l0x_1"])
+
+    for key, true_mm in (("vl53l0x_0", 47.0), ("vl53l0x_1", 91.0)):
+        stats, samples = results[key]
+        assert len(samples) < calibration.CALIBRATION_SAMPLES
+        assert stats["sem_mm"] <= calibration.CALIBRATION_SEM_MM
+        assert abs(stats["mean_mm"] - true_mm) <= calibration.CALIBRATION_CI_Z * stats["sem_mm"]
+
+
+def test_calibration_stores_confidence_interval(monkeypatch):
+    readings = {
+        "vl53l0x_0": itertools.cycle([47, 48]),
+        "vl53l0x_1": itertools.cycle([91]),
+    }
+    calibration, _, _ = _load_calibration(monkeypatch, readings)
+    calibration_store = importlib.import_module("calibration_store")
+    store = calibration_store.CalibrationStore(None)
+    monkeypatch.setattr(calibration_store, "_store", store)
+
+    data = calibration.calibrate_vl53_sensors({})
+
+    assert data["vl53l0x_0"]["offset_mm"] == -47.5
+    assert data["vl53l0x_0"]["offset_ci_mm"] == pytest.approx(
+        calibration.CALIBRATION_CI_Z * data["vl53l0x_0"]["sem_mm"], abs=1e-3)
+    assert data["vl53l0x_1"]["offset_ci_mm"] == 0.0
+    assert store.offsets() == {"vl53l0x_0": -47.5, "vl53l0x_1": -91.0}
+    assert store["vl53l0x_0"].meta["ci_mm"] == data["vl53l0x_0"]["offset_ci_mm"]
+    assert store["vl53l0x_0"].meta["samples"] == len(data["vl53l0x_0"]["samples"])
+
+
+def test_sensor_without_readings_raises(monkeypatch):
+    readings = {"vl53l0x_0": itertools.repeat(None)}
+    calibration, _, _ = _load_calibration(monkeypatch, readings)
+    with pytest.raises(RuntimeError):
+        calibration._sample_sensors({}, ["vl53l0x_0"])
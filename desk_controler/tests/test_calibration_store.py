@@ -0,0 +1,95 @@
+"""
+Tests for the atomic, versioned VL53L0X calibration store.
+"""
+
+import importlib
+import json
+import sys
+from pathlib import Path
+
+
+def _load_store_module():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    return importlib.import_module("calibration_store")
+
+
+def test_save_and_load_round_trip_with_metadata(tmp_path):
+    calibration_store = _load_store_module()
+    path = tmp_path / "calibration.json"
+    store = calibration_store.CalibrationStore(str(path))
+    store.update("vl53l0x_0", -47.4, save=False, ci_mm=0.3, source="calibration")
+    store.update("vl53l0x_1", -91.3, ci_mm=0.2, source="calibration")
+
+    data = json.loads(path.read_text())
+    assert data["schema"] == calibration_store.SCHEMA_VERSION
+    assert data["sensors"]["vl53l0x_0"]["offset_mm"] == -47.4
+    assert data["sensors"]["vl53l0x_0"]["ci_mm"] == 0.3
+    assert list(tmp_path.iterdir()) == [path]  # no temporary file left behind
+
+    loaded = calibration_store.CalibrationStore(str(path))
+    assert loaded.load()
+    assert loaded.offsets() == {"vl53l0x_0": -47.4, "vl53l0x_1": -91.3}
+    assert loaded["vl53l0x_1"].meta["source"] == "calibration"
+
+
+def test_entries_are_updated_in_place(tmp_path):
+    calibration_store = _load_store_module()
+    store = calibration_store.CalibrationStore(None)
+    entry = store.entry("vl53l0x_0")
+    assert entry.offset_mm is None and not store and "vl53l0x_0" not in store
+
+    store.update("vl53l0x_0", -47.0)
+    assert entry.offset_mm == -47.0 and store["vl53l0x_0"] is entry
+
+    path = tmp_path / "calibration.json"
+    path.write_text(json.dumps({"schema": calibration_store.SCHEMA_VERSION,
+                                "sensors": {"vl53l0x_0": {"offset_mm": -45.5}}}))
+    store.path = str(path)
+    store.load()
+    assert entry.offset_mm == -45.5
+
+
+def test_failed_write_keeps_previous_file(tmp_path, monkeypatch):
+    calibration_store = _load_store_module()
+    path = tmp_path / "calibration.json"
+    store = calibration_store.CalibrationStore(str(path))
+    store.update("vl53l0x_0", -47.0)
+    before = path.read_text()
+
+    def failing_replace(*_args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(calibration_store.os, "replace", failing_replace)
+    store.update("vl53l0x_0", -10.0)
+    assert store.save() is False
+    assert path.read_text() == before
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_unsupported_schema_is_ignored(tmp_path):
+    calibration_store = _load_store_module()
+    path = tmp_path / "calibration.json"
+    path.write_text(json.dumps({"schema": 99, "sensors": {"vl53l0x_0": {"offset_mm": 1}}}))
+    store = calibration_store.CalibrationStore(str(path))
+    assert store.load() is False
+    assert not store
+
+
+def test_get_store_imports_legacy_config_offsets(tmp_path, monkeypatch):
+    calibration_store = _load_store_module()
+    monkeypatch.setattr(calibration_store, "_store", None)
+    monkeypatch.setattr(calibration_store.config, "CALIBRATION_FILE",
+                        str(tmp_path / "calibration.json"))
+    monkeypatch.setattr(calibration_store.config, "OFFSET", {"vl53l0x_0": -47.433})
+    cal = {"x": (0.0039, 0.02), "y": (0.0038, -0.01), "z": (0.004, 0.03)}
+    monkeypatch.setattr(calibration_store.config, "ADXL_CALIBRATION", cal)
+
+    store = calibration_store.get_store()
+    assert calibration_store.get_store() is store
+    assert store.offsets() == {"vl53l0x_0": -47.433}
+    assert store["vl53l0x_0"].meta["source"] == "config"
+    assert store.entry(calibration_store.config.SENSOR_ADXL).axes == cal
+    # Imported offsets are only written with the next update
+    assert not (tmp_path / "calibration.json").exists()
@@ -1,4 +1,5 @@
 import importlib
+import json
 import sys
 import threading
 import time
@@ -6,12 +7,24 @@ import types
 from pathlib import Path
 from unittest.mock import Mock
 
+import pytest
+
 
 class _Message:
     def __init__(self, payload: bytes):
         self.payload = payload
 
 
+@pytest.fixture(autouse=True)
+def _isolated_model_file(monkeypatch, tmp_path):
+    """Motor workers end with motion_model.save_models(); keep it in tmp_path."""
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    import config
+    monkeypatch.setattr(config, "MOTION_MODEL_FILE", str(tmp_path / "actuator_model.json"))
+
+
 def _load_wrapper_module(move_impl, retract_impl, extend_impl=None, calibration_impl=None):
     src_dir = Path(__file__).resolve().parents[1] / "src"
     if str(src_dir) not in sys.path:
@@ -24,7 +37,16 @@ def _load_wrapper_module(move_impl, retract_impl, extend_impl=None, calibration_
     fake_hardware.init_vl53l0x = lambda *_: None
     fake_hardware.init_adxl345 = lambda *_: None
     fake_hardware.init_serial = lambda: None
+    fake_hardware.CommandSerial = lambda port: port
+    fake_hardware.SerialWriter = Mock()
     fake_hardware.get_sensor_value = lambda *_: 0
+    fake_hardware.SensorSampler = Mock()
+    fake_hardware.load_hardware_cache = lambda *_: None
+    fake_hardware.save_hardware_cache = lambda *_: False
+    fake_hardware.save_motor_positions = lambda *_: False
+    fake_hardware.cached_motor_positions = lambda *_: {}
+    fake_hardware.warm_init_vl53l0x = lambda *_: None
+    fake_hardware.warm_init_adxl345 = lambda *_: None
 
     if extend_impl is None:
         extend_impl = lambda *_args, **_kwargs: True
@@ -52,7 +74,15 @@ def _load_wrapper_module(move_impl, retract_impl, extend_impl=None, calibration_
         lambda sensors, serial_port, timeout=30:
         retract_impl(sensors, "adxl345", serial_port, timeout=timeout)
     )
+    # Simultaneous moves are simulated by running the per-axis fake in order
+    fake_motor_control.move_to_targets = (
+        lambda sensors, targets, serial_port, tolerances=None, timeout=30: {
+            name: move_impl(sensors, name, target, serial_port, timeout=timeout)
+            for name, target in targets.items()
+        }
+    )
     fake_motor_control.emergency_stop = Mock()
+    fake_motor_control.last_outcome = lambda *_: None
 
     fake_calibration = types.ModuleType("calibration")
     if calibration_impl is None:
@@ -225,8 +255,8 @@ def test_direct_motor_methods_reject_while_calibrating():
     assert extend_calls["count"] == 0
 
 
-def test_preset_load_motors_move_in_correct_order():
-    """Motors must be moved in order: M2 (keyboard) → M3 (monitor) → M1 (tilt)."""
+def test_preset_load_motors_move_in_correct_order(monkeypatch):
+    """Sequential presets move in order: M2 (keyboard) → M3 (monitor) → M1 (tilt)."""
     move_order = []
 
     def move_impl(_sensors, sensor_name, _target, _ser, tolerance=2, timeout=30):
@@ -237,6 +267,7 @@ def test_preset_load_motors_move_in_correct_order():
         move_impl=move_impl,
         retract_impl=lambda *_args, **_kwargs: True,
     )
+    monkeypatch.setattr(wrapper_module.config, "PRESET_SIMULTANEOUS_MOVES", False)
 
     controller = wrapper_module.DeskControllerWrapper(log_file=None)
     controller.is_initialized = True
@@ -250,6 +281,32 @@ def test_preset_load_motors_move_in_correct_order():
     assert move_order == ["vl53l0x_0", "vl53l0x_1", "adxl345"]
 
 
+def test_preset_load_moves_all_motors_in_one_coordinated_move(monkeypatch):
+    """Simultaneous presets hand all three targets to move_to_targets at once."""
+    wrapper_module, motor_control = _load_wrapper_module(
+        move_impl=lambda *_args, **_kwargs: True,
+        retract_impl=lambda *_args, **_kwargs: True,
+    )
+    monkeypatch.setattr(wrapper_module.config, "PRESET_SIMULTANEOUS_MOVES", True)
+    calls = []
+
+    def move_to_targets(_sensors, targets, _ser, tolerances=None, timeout=30):
+        calls.append(dict(targets))
+        return {name: True for name in targets}
+
+    monkeypatch.setattr(wrapper_module, "move_to_targets", move_to_targets)
+
+    controller = wrapper_module.DeskControllerWrapper(log_file=None)
+    controller.is_initialized = True
+    controller.serial_port = Mock()
+    controller.presets[1] = {1: 90.0, 2: 200.0, 3: 300.0}
+
+    assert controller.load_and_execute_preset(1) is True
+    assert calls == [{"vl53l0x_0": 200.0, "vl53l0x_1": 300.0, "adxl345": 90.0}]
+    assert controller.motor_positions == {1: 90.0, 2: 200.0, 3: 300.0}
+    assert controller.system_state == wrapper_module.SystemState.IDLE
+
+
 def test_preset_load_mqtt_message_numeric_format():
     """MQTT 'preset 1' message triggers preset execution."""
     preset_executed = threading.Event()
@@ -442,6 +499,81 @@ def test_mqtt_down_calls_retract_not_extend():
         "motor_positions[2] was not set to MIN_POSITION after 'down'"
 
 
+def _published_json(controller):
+    statuses = []
+    for call in controller.mqtt_client.publish.call_args_list:
+        try:
+            statuses.append(json.loads(call.args[1]))
+        except (ValueError, TypeError):
+            pass
+    return statuses
+
+
+def test_commands_during_startup_are_queued_until_hardware_ready():
+    extend_called = threading.Event()
+
+    def extend_impl(_sensors, _sensor_name, _ser, timeout=30):
+        extend_called.set()
+        return True
+
+    wrapper_module, _ = _load_wrapper_module(
+        move_impl=lambda *_args, **_kwargs: True,
+        retract_impl=lambda *_args, **_kwargs: True,
+        extend_impl=extend_impl,
+    )
+
+    controller = wrapper_module.DeskControllerWrapper(log_file=None)
+    controller.mqtt_connected = True
+    controller.mqtt_client = Mock()
+    controller.begin_startup()
+
+    controller._mqtt_on_message(None, None, _Message(b"m1 -> up"))
+    assert _wait_for(lambda: any(
+        status.get("state") == "initializing" and status.get("command") == "m1 -> up"
+        for status in _published_json(controller)
+    ))
+    assert not extend_called.is_set()
+
+    # Hardware comes up: the queued command runs
+    controller.is_initialized = True
+    controller.serial_port = Mock()
+    controller.finish_startup(True)
+    assert _wait_for(lambda: extend_called.is_set())
+    assert controller.system_state == wrapper_module.SystemState.IDLE
+    assert controller.startup_metrics["time_to_ready"] is not None
+    assert _wait_for(lambda: controller.startup_metrics["time_to_first_move"] is not None)
+    assert any(status.get("state") == "idle" for status in _published_json(controller))
+
+
+def test_emergency_stop_during_startup_discards_queued_commands():
+    extend_called = threading.Event()
+
+    def extend_impl(_sensors, _sensor_name, _ser, timeout=30):
+        extend_called.set()
+        return True
+
+    wrapper_module, motor_control = _load_wrapper_module(
+        move_impl=lambda *_args, **_kwargs: True,
+        retract_impl=lambda *_args, **_kwargs: True,
+        extend_impl=extend_impl,
+    )
+
+    controller = wrapper_module.DeskControllerWrapper(log_file=None)
+    controller.serial_port = Mock()
+    controller.begin_startup()
+
+    controller._mqtt_on_message(None, None, _Message(b"m1 -> up"))
+    assert _wait_for(lambda: len(controller._deferred_commands) == 1)
+    controller._mqtt_on_message(None, None, _Message(b"emergency_stop"))
+    assert _wait_for(lambda: motor_control.emergency_stop.called)
+    assert len(controller._deferred_commands) == 0
+
+    controller.is_initialized = True
+    controller.finish_startup(True)
+    time.sleep(0.2)
+    assert not extend_called.is_set()
+
+
 def _load_wrapper_module_with_calibration_data(calibration_data_fn, calibration_impl=None):
     """Variant of _load_wrapper_module with configurable load_calibration return value."""
     src_dir = Path(__file__).resolve().parents[1] / "src"
@@ -455,7 +587,16 @@ def _load_wrapper_module_with_calibration_data(calibration_data_fn, calibration_
     fake_hardware.init_vl53l0x = lambda *_: None
     fake_hardware.init_adxl345 = lambda *_: None
     fake_hardware.init_serial = lambda: None
+    fake_hardware.CommandSerial = lambda port: port
+    fake_hardware.SerialWriter = Mock()
     fake_hardware.get_sensor_value = lambda *_: 0
+    fake_hardware.SensorSampler = Mock()
+    fake_hardware.load_hardware_cache = lambda *_: None
+    fake_hardware.save_hardware_cache = lambda *_: False
+    fake_hardware.save_motor_positions = lambda *_: False
+    fake_hardware.cached_motor_positions = lambda *_: {}
+    fake_hardware.warm_init_vl53l0x = lambda *_: None
+    fake_hardware.warm_init_adxl345 = lambda *_: None
 
     fake_motor_control = types.ModuleType("motor_control")
     fake_motor_control.move_to_distance = lambda *_args, **_kwargs: True
@@ -464,7 +605,11 @@ def _load_wrapper_module_with_calibration_data(calibration_data_fn, calibration_
     fake_motor_control.extend_tilt = lambda *_args, **_kwargs: True
     fake_motor_control.retract_fully = lambda *_args, **_kwargs: True
     fake_motor_control.retract_tilt = lambda *_args, **_kwargs: True
+    fake_motor_control.move_to_targets = lambda _sensors, targets, *_args, **_kwargs: {
+        name: True for name in targets
+    }
     fake_motor_control.emergency_stop = Mock()
+    fake_motor_control.last_outcome = lambda *_: None
 
     fake_calibration = types.ModuleType("calibration")
     if calibration_impl is None:
@@ -685,3 +830,38 @@ def test_wait_for_motor_ready_does_not_deadlock_inside_worker():
     assert _wait_for(lambda: reached.is_set(), timeout=3)
     # Must return True (debounce only, no deadlock)
     assert wait_result.get("val") is True
+
+
+def test_simultaneous_move_records_measured_position_of_a_stalled_motor(monkeypatch, capsys):
+    """A motor that stalls keeps its measured position and the reason is logged."""
+    wrapper_module, _ = _load_wrapper_module(
+        move_impl=lambda *_args, **_kwargs: True,
+        retract_impl=lambda *_args, **_kwargs: True,
+    )
+    outcomes = {"vl53l0x_0": types.SimpleNamespace(
+        result="timeout", position=10.0, elapsed=99.0)}  # left by an earlier move
+    stale = dict(outcomes)
+
+    def move_to_targets(_sensors, targets, _ser, tolerances=None, timeout=30):
+        outcomes["vl53l0x_1"] = types.SimpleNamespace(
+            result="stalled", position=143.0, elapsed=1.5)
+        return {"vl53l0x_0": False, "vl53l0x_1": False, "adxl345": True}
+
+    monkeypatch.setattr(wrapper_module, "move_to_targets", move_to_targets)
+    monkeypatch.setattr(wrapper_module, "last_outcome", outcomes.get)
+
+    controller = wrapper_module.DeskControllerWrapper(log_file=None)
+    controller.is_initialized = True
+    controller.serial_port = Mock()
+    before = controller.motor_positions[2]
+
+    assert controller.move_motors_simultaneously({1: 90.0, 2: 200.0, 3: 300.0}) is False
+    out = capsys.readouterr().out
+
+    assert controller.motor_positions[1] == 90.0
+    assert controller.motor_positions[2] == before        # no outcome from this move
+    assert controller.motor_positions[3] == 143.0         # where it stalled
+    assert controller.motor_status == {1: "idle", 2: "error", 3: "error"}
+    assert "failed to reach 300.0 mm (stalled at 143.0 mm after 1.5 s)" in out
+    assert "failed to reach 200.0 mm\n" in out
+    assert controller.system_state == wrapper_module.SystemState.ERROR
@@ -0,0 +1,93 @@
+"""
+Tests for the streaming filters in utils.filters.
+"""
+
+import importlib
+import random
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _load_filters():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    return importlib.import_module("utils.filters")
+
+
+def test_running_mean_matches_plain_average_of_window():
+    filters = _load_filters()
+    f = filters.RunningMean(3)
+    values = [10, 20, 30, 40, 50]
+    outputs = [f.update(v) for v in values]
+    assert outputs[2] == pytest.approx(20.0)
+    assert outputs[3] == pytest.approx(30.0)
+    assert outputs[4] == pytest.approx(40.0)
+    assert f.primed
+
+
+def test_median_filter_rejects_single_spike():
+    filters = _load_filters()
+    f = filters.MedianFilter(3)
+    for v in (100, 100, 900):
+        out = f.update(v)
+    assert out == 100
+
+
+def test_ema_is_seeded_by_window_mean():
+    filters = _load_filters()
+    f = filters.EMAFilter(alpha=0.5, window=2)
+    f.update(10)
+    assert f.update(20) == pytest.approx(15.0)
+    assert f.update(25) == pytest.approx(20.0)
+
+
+def test_kalman_converges_to_constant_signal():
+    filters = _load_filters()
+    f = filters.KalmanFilter1D(process_var=0.01, measurement_var=9.0)
+    rng = random.Random(1)
+    for _ in range(200):
+        out = f.update(150 + rng.gauss(0, 3))
+    assert abs(out - 150) < 1.5
+
+
+# The median is deliberately excluded: on pure Gaussian noise it is ~25 % less
+# efficient than the mean; it is there to reject spikes, not white noise.
+@pytest.mark.parametrize("kind", ["mean", "ema", "kalman"])
+def test_filters_suppress_noise_at_least_as_well_as_three_sample_average(kind):
+    """
+    One-sample-per-cycle filtering must be no noisier than re-sampling three
+    times per cycle (the previous _read_corrected behaviour).
+    """
+    filters = _load_filters()
+    rng = random.Random(42)
+    noise = [rng.gauss(0, 3) for _ in range(3000)]
+
+    three_sample_avg = [
+        sum(noise[i:i + 3]) / 3 for i in range(0, len(noise) - 2, 3)
+    ]
+
+    f = filters.make_filter(kind, 3, ema_alpha=0.5,
+                            kalman_process_var=0.5, kalman_measurement_var=9.0)
+    streamed = [f.update(v) for v in noise][3:]
+
+    assert statistics.pstdev(streamed) <= statistics.pstdev(three_sample_avg) * 1.05
+
+
+def test_reset_clears_history():
+    filters = _load_filters()
+    f = filters.RunningMean(2)
+    f.update(1)
+    f.update(3)
+    f.reset()
+    assert not f.primed
+    assert f.update(10) == 10
+
+
+def test_make_filter_rejects_unknown_kind():
+    filters = _load_filters()
+    with pytest.raises(ValueError):
+        filters.make_filter("bogus", 3)
@@ -0,0 +1,103 @@
+"""
+Tests for the targeted address probe in hardware.i2c_utils.
+"""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+
+_DRIVER_MODULES = (
+    "board", "busio", "serial",
+    "adafruit_tca9548a", "adafruit_vl53l0x", "adafruit_adxl34x",
+)
+
+
+def _load_i2c_utils():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    for name in _DRIVER_MODULES:
+        sys.modules.setdefault(name, types.ModuleType(name))
+    for name in [m for m in sys.modules if m == "hardware" or m.startswith("hardware.")]:
+        del sys.modules[name]
+    return importlib.import_module("hardware.i2c_utils")
+
+
+class _FakeChannel:
+    """One mux channel with devices {address: {register: value}}."""
+
+    def __init__(self, devices):
+        self.devices = devices
+        self.transactions = 0
+        self.scans = 0
+
+    def try_lock(self):
+        return True
+
+    def unlock(self):
+        pass
+
+    def scan(self):
+        self.scans += 1
+        return list(self.devices)
+
+    def writeto(self, addr, buffer):
+        self.transactions += 1
+        if addr not in self.devices:
+            raise OSError(121, "Remote I/O error")
+
+    def readfrom_into(self, addr, buffer):
+        self.writeto(addr, b"")
+
+    def writeto_then_readfrom(self, addr, out_buffer, in_buffer):
+        self.writeto(addr, out_buffer)
+        in_buffer[0] = self.devices[addr].get(out_buffer[0], 0)
+
+
+def test_probe_finds_present_device_with_one_transaction():
+    i2c_utils = _load_i2c_utils()
+    channel = _FakeChannel({0x29: {}})
+    tca = {0: channel}
+
+    assert i2c_utils.probe_address(tca, 0, 0x29)
+    assert channel.transactions == 1
+    # Absent: zero-length write plus the one-byte read fallback
+    assert not i2c_utils.probe_address(tca, 0, 0x53)
+    assert channel.transactions == 3
+    assert channel.scans == 0
+
+
+def test_probe_checks_identity_register():
+    i2c_utils = _load_i2c_utils()
+    tca = {2: _FakeChannel({0x53: {0x00: 0xE5}})}
+
+    assert i2c_utils.probe_address(tca, 2, "0x53", id_register=0x00, expected_id=0xE5)
+    assert not i2c_utils.probe_address(tca, 2, 0x53, id_register=0x00, expected_id=0xEE)
+
+
+def test_require_address_uses_probe_not_scan():
+    i2c_utils = _load_i2c_utils()
+    config = i2c_utils.config
+    channel = _FakeChannel({config.VL53_ADDRESS: {0xC0: 0xEE}})
+
+    i2c_utils.require_address({0: channel}, 0, config.VL53_ADDRESS, "VL53L0X #0")
+    i2c_utils.require_address({0: channel}, 0, hex(config.VL53_ADDRESS), "VL53L0X #0")
+
+    assert channel.scans == 0
+    assert channel.transactions == 2
+
+
+def test_require_address_fails_for_missing_or_wrong_device():
+    i2c_utils = _load_i2c_utils()
+    config = i2c_utils.config
+    wrong_id = {0: _FakeChannel({config.VL53_ADDRESS: {0xC0: 0x00}})}
+    missing = {0: _FakeChannel({})}
+
+    for tca in (wrong_id, missing):
+        with pytest.raises(RuntimeError, match="not found on channel 0"):
+            i2c_utils.require_address(tca, 0, config.VL53_ADDRESS, "VL53L0X #0",
+                                      retries=2, retry_delay=0)
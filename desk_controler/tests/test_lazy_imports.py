@@ -0,0 +1,33 @@
+"""
+Tests that importing the controller does not load the hardware drivers.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+def _load_bench():
+    path = Path(__file__).resolve().parent / "bench_import_time.py"
+    spec = importlib.util.spec_from_file_location("bench_import_time", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("module", ["hardware", "desk_controller_wrapper"])
+def test_import_does_not_load_driver_modules(module):
+    bench = _load_bench()
+    timings = bench.measure(module)
+    assert module in timings
+    assert bench.eager_drivers(timings) == []
+
+
+def test_hardware_exports_resolve_on_first_access():
+    bench = _load_bench()
+    timings = bench.measure("hardware; hardware.encode; hardware.SensorSampler")
+    assert "hardware.protocol" in timings
+    assert "hardware.sampler" in timings
+    # Unused submodules stay unloaded
+    assert "hardware.serial_comm" not in timings
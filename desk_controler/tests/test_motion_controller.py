@@ -0,0 +1,143 @@
+"""
+Tests for the predictive-stop PredictiveController in motion_controller.py.
+
+The actuator is simulated: it moves at a constant speed while driven and
+decays exponentially after power is cut, so it always coasts a distance
+proportional to its speed — which is exactly what the bang-bang loop used to
+overshoot by.
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _load_motion_controller():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    if "motion_controller" in sys.modules:
+        del sys.modules["motion_controller"]
+    return importlib.import_module("motion_controller")
+
+
+class _SimActuator:
+    def __init__(self, position=100.0, speed=40.0, coast_tau=0.2):
+        self.position = position
+        self.speed = speed
+        self.coast_tau = coast_tau
+        self.velocity = 0.0
+        self.command = "off"
+
+    def advance(self, dt):
+        if self.command == "extend":
+            self.velocity = self.speed
+        elif self.command == "retract":
+            self.velocity = -self.speed
+        else:
+            # Exponential decay: total coast distance = v × tau
+            self.velocity *= max(0.0, 1.0 - dt / self.coast_tau)
+        self.position += self.velocity * dt
+
+
+def _run(mc, controller, actuator, dt=0.05, max_time=30.0):
+    t = 0.0
+    while t < max_time:
+        action = controller.step(t, actuator.position)
+        if controller.done:
+            actuator.command = "off"
+            break
+        actuator.command = action
+        actuator.advance(dt)
+        t += dt
+    # Let any residual coast finish
+    for _ in range(40):
+        actuator.advance(dt)
+    return t
+
+
+def test_bang_bang_mode_overshoots_simulated_actuator():
+    mc = _load_motion_controller()
+    actuator = _SimActuator()
+    controller = mc.PredictiveController(
+        "sim", target=200.0, tolerance=2.0,
+        pwm_band=10.0, settle_speed=2.0, predictive=False,
+    )
+    _run(mc, controller, actuator)
+    # Reference: plain on/off control coasts ~v × tau = 8 mm past the band.
+    assert actuator.position - 200.0 > 2.0
+
+
+def test_predictive_stop_lands_inside_tolerance():
+    mc = _load_motion_controller()
+    actuator = _SimActuator()
+    controller = mc.PredictiveController(
+        "sim", target=200.0, tolerance=2.0,
+        pwm_band=10.0, settle_speed=2.0, predictive=True,
+    )
+    _run(mc, controller, actuator)
+    assert controller.done
+    assert abs(actuator.position - 200.0) <= 2.0
+    assert controller.reversals == 0
+
+
+def test_predictive_stop_works_when_retracting():
+    mc = _load_motion_controller()
+    actuator = _SimActuator(position=300.0)
+    controller = mc.PredictiveController(
+        "sim", target=120.0, tolerance=2.0,
+        pwm_band=10.0, settle_speed=2.0, predictive=True,
+    )
+    _run(mc, controller, actuator)
+    assert controller.done
+    assert abs(actuator.position - 120.0) <= 2.0
+
+
+def test_coast_time_is_learned_from_observed_coast():
+    mc = _load_motion_controller()
+    before = mc.coast_time("sim-learn", mc.EXTEND)
+    for _ in range(10):
+        actuator = _SimActuator(coast_tau=0.3)
+        controller = mc.PredictiveController(
+            "sim-learn", target=200.0, tolerance=2.0,
+            pwm_band=10.0, settle_speed=2.0, predictive=True,
+        )
+        _run(mc, controller, actuator)
+    after = mc.coast_time("sim-learn", mc.EXTEND)
+    # The simulated coast time is 0.3 s; the estimate must move towards it.
+    assert after > before
+    assert after == pytest.approx(0.3, abs=0.1)
+
+
+def test_already_on_target_finishes_immediately():
+    mc = _load_motion_controller()
+    controller = mc.PredictiveController(
+        "sim", target=150.0, tolerance=2.0,
+        pwm_band=10.0, settle_speed=2.0, predictive=True,
+    )
+    assert controller.step(0.0, 151.0) == mc.OFF
+    assert controller.done
+
+
+def test_pwm_pulses_drive_inside_band():
+    mc = _load_motion_controller()
+    controller = mc.PredictiveController(
+        "sim-pwm", target=100.0, tolerance=1.0,
+        pwm_band=20.0, settle_speed=2.0, predictive=True,
+    )
+    # Stationary actuator 5 mm short of the target: duty = max(min_duty, 0.25)
+    actions = [controller.step(i * 0.02, 95.0) for i in range(20)]
+    assert mc.EXTEND in actions
+    assert mc.OFF in actions
+    assert not controller.done
+
+
+def test_velocity_estimator_least_squares_slope():
+    mc = _load_motion_controller()
+    est = mc.VelocityEstimator(window=4)
+    assert est.velocity is None
+    for i in range(6):
+        est.update(i * 0.1, 10.0 + 5.0 * i * 0.1)
+    assert est.velocity == pytest.approx(5.0)
@@ -0,0 +1,173 @@
+"""
+Tests for the learned actuator model in motion_model.py.
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _load_motion_model():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    if "motion_model" in sys.modules:
+        del sys.modules["motion_model"]
+    return importlib.import_module("motion_model")
+
+
+def _trace(mm, sensor_name, start=100.0, speed=20.0, lag=0.2, dt=0.05,
+           drive_time=3.0, command="extend"):
+    """Synthesise a standstill → drive → off trace with a start-up lag."""
+    trace = mm.MotionTrace(sensor_name)
+    sign = 1.0 if command == "extend" else -1.0
+    t = 0.0
+    position = start
+    while t < drive_time:
+        if t >= lag:
+            position += sign * speed * dt
+        trace.record(t, position, command)
+        t += dt
+    trace.record(t, position, "off")
+    return trace
+
+
+def test_fit_recovers_speed_and_lag():
+    mm = _load_motion_model()
+    speeds, lags = mm.fit_trace(_trace(mm, "sim", speed=20.0, lag=0.2))
+    assert speeds["extend"][0] == pytest.approx(20.0, rel=0.02)
+    assert lags[0] == pytest.approx(0.2, abs=0.1)
+
+
+def test_model_trains_after_min_runs_and_estimates_eta():
+    mm = _load_motion_model()
+    mm.update_model(_trace(mm, "sim", start=300.0, speed=25.0, command="retract"))
+    for _ in range(mm.config.MOTION_MODEL_MIN_RUNS - 2):
+        mm.update_model(_trace(mm, "sim", command="extend"))
+    assert not mm.get_model("sim").trained
+    assert mm.estimate_move_time("sim", 100.0, 300.0) is None
+
+    mm.update_model(_trace(mm, "sim", command="extend"))
+    model = mm.get_model("sim")
+    assert model.trained
+    assert model.retract_speed == pytest.approx(25.0, rel=0.02)
+
+    eta = mm.estimate_move_time("sim", 100.0, 300.0)
+    # lag + 200 mm / 20 mm/s + coast
+    assert eta == pytest.approx(10.0 + model.startup_lag
+                                + mm.config.CONTROL_COAST_TIME_DEFAULT, rel=0.02)
+
+
+def test_open_loop_duration_stops_short_of_target():
+    mm = _load_motion_model()
+    assert mm.open_loop_duration("sim", 100.0, 300.0, approach=30.0) == 0.0
+
+    for _ in range(mm.config.MOTION_MODEL_MIN_RUNS):
+        mm.update_model(_trace(mm, "sim", speed=20.0, lag=0.0))
+        mm.update_model(_trace(mm, "sim", start=300.0, speed=20.0, lag=0.0, command="retract"))
+
+    # 200 mm move, last 30 mm closed-loop → 170 mm at 20 mm/s
+    assert mm.open_loop_duration("sim", 100.0, 300.0, approach=30.0) == \
+        pytest.approx(8.5, rel=0.05)
+    # Too short to bother
+    assert mm.open_loop_duration("sim", 100.0, 120.0, approach=30.0) == 0.0
+
+
+def test_trace_after_open_loop_phase_yields_speed_only():
+    mm = _load_motion_model()
+    trace = mm.MotionTrace("sim")
+    trace.record(0.0, None, "extend")
+    for i in range(10):
+        trace.record(5.0 + i * 0.05, 200.0 + i * 1.0, "extend")
+    speeds, lags = mm.fit_trace(trace)
+    assert speeds["extend"] == [pytest.approx(20.0)]
+    assert lags == []
+
+
+def test_reversal_and_pwm_segments_are_ignored():
+    mm = _load_motion_model()
+    trace = mm.MotionTrace("sim")
+    # Reversal straight from extend to retract, then a 2-sample PWM pulse
+    for i in range(6):
+        trace.record(i * 0.05, 100.0 + i, "extend")
+    for i in range(6):
+        trace.record(0.3 + i * 0.05, 105.0 - i, "retract")
+    trace.record(0.6, 100.0, "off")
+    trace.record(0.65, 100.0, "extend")
+    trace.record(0.7, 101.0, "extend")
+    speeds, _ = mm.fit_trace(trace)
+    assert len(speeds["extend"]) == 1
+    assert speeds["retract"] == []
+
+
+def test_models_round_trip_through_json(tmp_path):
+    mm = _load_motion_model()
+    path = str(tmp_path / "model.json")
+    assert not mm.save_models(path)  # nothing learned yet
+
+    mm.update_model(_trace(mm, "sim"))
+    mm.learn_coast_time("sim", "extend", 0.2)
+    assert mm.save_models(path)
+
+    saved = mm.get_model("sim").to_dict()
+    mm = _load_motion_model()
+    assert mm.load_models(path)
+    assert mm.get_model("sim").to_dict() == saved
+    # Written through a temporary file that replaced the target
+    assert [p.name for p in tmp_path.iterdir()] == ["model.json"]
+
+
+def test_move_to_distance_drives_open_loop_with_trained_model():
+    import contextlib
+    import types
+    from unittest.mock import patch
+
+    mm = _load_motion_model()
+    fake_hardware = types.ModuleType("hardware")
+    # Real hardware.protocol (pure Python) stays importable
+    fake_hardware.__path__ = [str(Path(__file__).resolve().parents[1] / "src" / "hardware")]
+    fake_hardware.get_sensor_value = lambda sensors, name: 0
+    fake_hardware.continuous_ranging = lambda *_: contextlib.nullcontext()
+    fake_hardware.set_timing_budget = lambda *_: False
+    sys.modules["hardware"] = fake_hardware
+    sys.modules.pop("motion_controller", None)
+    sys.modules.pop("motor_control", None)
+    mc = importlib.import_module("motor_control")
+    config = mc.config
+    sensor = config.SENSOR_VL53_0
+
+    # Fast actuator so the open-loop phase lasts a fraction of a second
+    model = mm.get_model(sensor)
+    model.extend_speed = model.retract_speed = 1000.0
+    model.startup_lag = 0.0
+    model.runs = config.MOTION_MODEL_MIN_RUNS
+
+    events = []
+    offset = config.OFFSET.get(sensor, 0)
+    position = [100.0 - offset]
+
+    def read(sensors, name):
+        events.append("read")
+        return position[0]
+
+    class _Serial:
+        def write(self, data):
+            events.append(data)
+            if data == config.CMD_M2_EXTEND and events.count(data) >= 2:
+                position[0] = 300.0 - offset
+
+    try:
+        with patch.object(config, "MOTION_OPEN_LOOP", True), \
+                patch.object(mc, "get_sensor_value", side_effect=read):
+            assert mc.move_to_distance({}, sensor, 300.0, _Serial(), timeout=5)
+    finally:
+        # Don't leak the trained model into other test modules
+        sys.modules.pop("motion_model", None)
+        sys.modules.pop("motor_control", None)
+
+    first_write = events.index(config.CMD_M2_EXTEND)
+    # Open-loop phase: consecutive drive writes with no sensor reads between
+    assert events[first_write + 1] == config.CMD_M2_EXTEND
+    assert events[-1] == config.CMD_ALL_OFF
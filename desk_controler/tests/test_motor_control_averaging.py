@@ -1,6 +1,10 @@
 """
 Tests for the sensor-read averaging inside _read_corrected().
 
+_read_corrected() now primes a streaming filter with SENSOR_FILTER_WINDOW
+readings and then consumes one new reading per control cycle; the priming read
+keeps the original N-sample averaging behaviour checked below.
+
 Issue B fix: _read_corrected() now takes SENSOR_AVERAGE_SAMPLES readings and
 averages them, so single-sample noise no longer drives bang-bang oscillation.
 
@@ -8,6 +12,8 @@ Issue D fix: the calibration offset (computed from a 30-sample average) is now
 applied to an equally stable averaged value rather than a single noisy sample.
 """
 
+import collections
+import contextlib
 import importlib
 import sys
 import types
@@ -22,7 +28,11 @@ def _load_motor_control():
 
     # Stub hardware so the module loads without real I2C hardware
     fake_hardware = types.ModuleType("hardware")
+    # Real hardware.protocol (pure Python) stays importable
+    fake_hardware.__path__ = [str(src_dir / "hardware")]
     fake_hardware.get_sensor_value = lambda sensors, name: 0
+    fake_hardware.continuous_ranging = lambda *_: contextlib.nullcontext()
+    fake_hardware.set_timing_budget = lambda *_: False
     sys.modules["hardware"] = fake_hardware
 
     if "motor_control" in sys.modules:
@@ -112,15 +122,15 @@ def test_read_corrected_no_offset_returns_raw_average():
     sensor = mc.config.SENSOR_VL53_0
 
     # Temporarily remove offset for this sensor
-    saved_offset = mc.config.OFFSET.get(sensor)
-    mc.config.OFFSET.pop(sensor, None)
+    calibration = mc.get_store().entry(sensor)
+    saved_offset = calibration.offset_mm
+    calibration.offset_mm = None
 
     try:
         with patch.object(mc, "get_sensor_value", return_value=75):
             result = mc._read_corrected({}, sensor)
     finally:
-        if saved_offset is not None:
-            mc.config.OFFSET[sensor] = saved_offset
+        calibration.offset_mm = saved_offset
 
     assert result == 75.0, f"Expected raw average 75.0, got {result}"
 
@@ -139,3 +149,80 @@ def test_sensor_average_samples_present_in_config():
     assert isinstance(n, int) and n >= 2, (
         f"SENSOR_AVERAGE_SAMPLES must be an integer >= 2, got {n!r}"
     )
+
+
+def test_read_corrected_takes_one_reading_per_cycle_once_primed():
+    """After priming, each _read_corrected call must cost exactly one sensor read."""
+    mc = _load_motor_control()
+    n = mc.config.SENSOR_FILTER_WINDOW
+    sensor = mc.config.SENSOR_VL53_0
+
+    with patch.object(mc, "get_sensor_value", return_value=100) as mock_gsv:
+        mc._read_corrected({}, sensor)
+        assert mock_gsv.call_count == n
+        for cycle in range(1, 4):
+            mc._read_corrected({}, sensor)
+            assert mock_gsv.call_count == n + cycle
+
+
+def test_read_corrected_sliding_window_tracks_new_readings():
+    """The running mean must slide over the newest SENSOR_FILTER_WINDOW readings."""
+    mc = _load_motor_control()
+    sensor = mc.config.SENSOR_VL53_0
+    offset = mc.config.OFFSET.get(sensor, 0)
+
+    readings = iter([100, 100, 100, 130, 130, 130])
+
+    with patch.object(mc.config, "SENSOR_FILTER", "mean"), \
+            patch.object(mc.config, "SENSOR_FILTER_WINDOW", 3), \
+            patch.object(mc, "get_sensor_value", side_effect=lambda *_: next(readings)):
+        assert abs(mc._read_corrected({}, sensor) - (100 + offset)) < 1e-9
+        assert abs(mc._read_corrected({}, sensor) - (110 + offset)) < 1e-9
+        assert abs(mc._read_corrected({}, sensor) - (120 + offset)) < 1e-9
+        assert abs(mc._read_corrected({}, sensor) - (130 + offset)) < 1e-9
+
+
+def test_reset_filter_reprimes_on_next_read():
+    """_reset_filter() must discard history so the next read primes a full window."""
+    mc = _load_motor_control()
+    n = mc.config.SENSOR_FILTER_WINDOW
+    sensor = mc.config.SENSOR_VL53_0
+
+    with patch.object(mc, "get_sensor_value", return_value=100) as mock_gsv:
+        mc._read_corrected({}, sensor)
+        mc._reset_filter(sensor)
+        mc._read_corrected({}, sensor)
+
+    assert mock_gsv.call_count == 2 * n
+
+
+def test_read_corrected_consumes_sampler_samples_without_bus_reads():
+    """With a fresh sampler, new buffered samples feed the filter and no direct read is made."""
+    mc = _load_motor_control()
+    sensor = mc.config.SENSOR_VL53_0
+    offset = mc.config.OFFSET.get(sensor, 0)
+    Sample = collections.namedtuple("Sample", ["timestamp", "value"])
+
+    class _FakeSampler:
+        def __init__(self):
+            self.samples = [Sample(1.0, 100), Sample(2.0, 102), Sample(3.0, 104)]
+
+        def latest(self, _name):
+            return self.samples[-1]
+
+        def samples_since(self, _name, timestamp):
+            return [s for s in self.samples if s.timestamp > timestamp]
+
+    sampler = _FakeSampler()
+    sensors = {mc.config.SENSOR_SAMPLER: sampler}
+
+    with patch.object(mc.config, "SENSOR_FILTER", "mean"), \
+            patch.object(mc.config, "SENSOR_FILTER_WINDOW", 3), \
+            patch.object(mc, "get_sensor_value") as mock_gsv:
+        assert abs(mc._read_corrected(sensors, sensor) - (102 + offset)) < 1e-9
+        # No new samples: value unchanged, still no bus read.
+        assert abs(mc._read_corrected(sensors, sensor) - (102 + offset)) < 1e-9
+        sampler.samples.append(Sample(4.0, 108))
+        assert abs(mc._read_corrected(sensors, sensor) - (104.666666 + offset)) < 1e-3
+
+    mock_gsv.assert_not_called()
@@ -0,0 +1,221 @@
+"""
+Tests for coordinated multi-axis moves (motor_control.move_to_targets).
+"""
+
+import contextlib
+import importlib
+import sys
+import types
+from pathlib import Path
+from unittest.mock import patch
+
+
+def _load_motor_control():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+
+    fake_hardware = types.ModuleType("hardware")
+    # Real hardware.protocol (pure Python) stays importable
+    fake_hardware.__path__ = [str(src_dir / "hardware")]
+    fake_hardware.get_sensor_value = lambda sensors, name: 0
+    fake_hardware.continuous_ranging = lambda *_: contextlib.nullcontext()
+    fake_hardware.set_timing_budget = lambda *_: False
+    sys.modules["hardware"] = fake_hardware
+
+    sys.modules.pop("calibration", None)
+    if "motor_control" in sys.modules:
+        del sys.modules["motor_control"]
+
+    return importlib.import_module("motor_control")
+
+
+class _SimDesk:
+    """Three actuators that move one step per packet carrying their bit."""
+
+    def __init__(self, mc, positions, step):
+        self.config = mc.config
+        self.positions = dict(positions)
+        self.step = step
+        self.packets = []
+
+    def write(self, packet):
+        self.packets.append(packet)
+        for name, cmds in self.config.SENSOR_MOTOR_COMMANDS.items():
+            if packet[1] & cmds["extend"][1]:
+                self.positions[name] += self.step[name]
+            elif packet[1] & cmds["retract"][1]:
+                self.positions[name] -= self.step[name]
+
+    def read(self, _sensors, name):
+        return self.positions[name]
+
+
+def test_move_to_targets_drives_axes_together_and_drops_arrived_axes(monkeypatch):
+    mc = _load_motor_control()
+    cfg = mc.config
+    monkeypatch.setattr(cfg, "CONTROL_PREDICTIVE_STOP", False)
+    monkeypatch.setattr(mc.time, "sleep", lambda _s: None)
+
+    desk = _SimDesk(
+        mc,
+        {cfg.SENSOR_VL53_0: 100.0, cfg.SENSOR_VL53_1: 300.0, cfg.SENSOR_ADXL: 90.0},
+        {cfg.SENSOR_VL53_0: 5.0, cfg.SENSOR_VL53_1: 5.0, cfg.SENSOR_ADXL: 1.0},
+    )
+    targets = {cfg.SENSOR_VL53_0: 150.0, cfg.SENSOR_VL53_1: 200.0, cfg.SENSOR_ADXL: 95.0}
+
+    with patch.object(mc, "_read_corrected", side_effect=desk.read), \
+            patch.object(mc, "get_sensor_value", side_effect=desk.read):
+        results = mc.move_to_targets({}, targets, desk, timeout=5)
+
+    assert results == {name: True for name in targets}
+    for name, target in targets.items():
+        assert abs(desk.positions[name] - target) <= 2
+    # The first packet drives all three motors at once
+    assert desk.packets[0] == bytes([0x5a, 0x25, (0x5a + 0x25) & 0xFF])
+    # Tilt (5 steps) arrives first; afterwards only M2/M3 bits remain
+    assert bytes([0x5a, 0x24, (0x5a + 0x24) & 0xFF]) in desk.packets
+    # 20 steps for the slowest axis instead of 10 + 20 + 5 sequentially
+    assert len(desk.packets) <= 22
+    assert desk.packets[-1] == cfg.CMD_ALL_OFF
+
+
+def test_move_to_targets_reports_unfinished_axes_on_timeout(monkeypatch):
+    mc = _load_motor_control()
+    cfg = mc.config
+    monkeypatch.setattr(cfg, "CONTROL_PREDICTIVE_STOP", False)
+
+    # Motor 3 never moves
+    desk = _SimDesk(
+        mc,
+        {cfg.SENSOR_VL53_0: 100.0, cfg.SENSOR_VL53_1: 300.0},
+        {cfg.SENSOR_VL53_0: 50.0, cfg.SENSOR_VL53_1: 0.0},
+    )
+    targets = {cfg.SENSOR_VL53_0: 150.0, cfg.SENSOR_VL53_1: 200.0}
+
+    with patch.object(mc, "_read_corrected", side_effect=desk.read):
+        results = mc.move_to_targets({}, targets, desk, timeout=0.2)
+
+    assert results == {cfg.SENSOR_VL53_0: True, cfg.SENSOR_VL53_1: False}
+    assert desk.packets[-1] == cfg.CMD_ALL_OFF
+
+
+def test_moving_axes_are_prioritised_in_the_sampler(monkeypatch):
+    mc = _load_motor_control()
+    cfg = mc.config
+    monkeypatch.setattr(mc.time, "sleep", lambda _s: None)
+
+    class _Sampler:
+        def __init__(self):
+            self.active = set()
+            self.seen = set()
+
+        @contextlib.contextmanager
+        def prioritised(self, name):
+            self.active.add(name)
+            self.seen.add(frozenset(self.active))
+            try:
+                yield
+            finally:
+                self.active.discard(name)
+
+        def latest(self, _name):
+            return None
+
+    desk = _SimDesk(mc, {cfg.SENSOR_VL53_1: 100.0, cfg.SENSOR_ADXL: 90.0},
+                    {cfg.SENSOR_VL53_1: 5.0, cfg.SENSOR_ADXL: 1.0})
+    sampler = _Sampler()
+    targets = {cfg.SENSOR_VL53_1: 120.0, cfg.SENSOR_ADXL: 92.0}
+
+    with patch.object(mc, "_read_corrected", side_effect=desk.read), \
+            patch.object(mc, "get_sensor_value", side_effect=desk.read):
+        mc.move_to_targets({cfg.SENSOR_SAMPLER: sampler}, targets, desk, timeout=5)
+
+    assert frozenset(targets) in sampler.seen
+    assert cfg.SENSOR_VL53_0 not in set().union(*sampler.seen)
+    assert sampler.active == set()
+
+
+def test_stalled_axis_is_dropped_while_the_others_keep_moving(monkeypatch):
+    mc = _load_motor_control()
+    cfg = mc.config
+    monkeypatch.setattr(cfg, "CONTROL_PREDICTIVE_STOP", False)
+    monkeypatch.setattr(cfg, "STALL_DETECTION", True)
+    # Keep the speeds learned from this move out of the other tests
+    monkeypatch.setattr(mc.motion_model, "_models", {})
+    monkeypatch.setattr(mc.motion_model, "_dirty", False)
+    clock = [0.0]
+    monkeypatch.setattr(mc.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(mc.time, "sleep", lambda s: clock.__setitem__(0, clock[0] + s))
+
+    # Motor 3 is jammed mid-travel; motor 2 needs several seconds
+    desk = _SimDesk(
+        mc,
+        {cfg.SENSOR_VL53_0: 100.0, cfg.SENSOR_VL53_1: 300.0},
+        {cfg.SENSOR_VL53_0: 1.0, cfg.SENSOR_VL53_1: 0.0},
+    )
+    targets = {cfg.SENSOR_VL53_0: 200.0, cfg.SENSOR_VL53_1: 200.0}
+
+    with patch.object(mc, "_read_corrected", side_effect=desk.read):
+        results = mc.move_to_targets({}, targets, desk, timeout=30)
+
+    assert results == {cfg.SENSOR_VL53_0: True, cfg.SENSOR_VL53_1: False}
+    assert mc.last_outcome(cfg.SENSOR_VL53_1).result == mc.STALLED
+    assert mc.last_outcome(cfg.SENSOR_VL53_0).result == mc.REACHED
+    # Motor 3 was powered for about the startup lag plus one stall window,
+    # not the whole move
+    m3_retract = cfg.SENSOR_MOTOR_COMMANDS[cfg.SENSOR_VL53_1]["retract"][1]
+    assert sum(1 for p in desk.packets if p[1] & m3_retract) <= 20
+    assert desk.packets[-1] == cfg.CMD_ALL_OFF
+
+
+def test_endstop_samples_are_taken_while_the_axis_is_still_prioritised(monkeypatch):
+    mc = _load_motor_control()
+    cfg = mc.config
+    monkeypatch.setattr(cfg, "CONTROL_PREDICTIVE_STOP", False)
+    monkeypatch.setattr(cfg, "STALL_DETECTION", True)
+    monkeypatch.setattr(cfg, "OFFSET_ONLINE_LEARNING", True)
+    monkeypatch.setattr(mc.motion_model, "_models", {})
+    monkeypatch.setattr(mc.motion_model, "_dirty", False)
+    clock = [0.0]
+    monkeypatch.setattr(mc.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(mc.time, "sleep", lambda s: clock.__setitem__(0, clock[0] + s))
+
+    class _Sampler:
+        def __init__(self):
+            self.active = set()
+
+        @contextlib.contextmanager
+        def prioritised(self, name):
+            self.active.add(name)
+            try:
+                yield
+            finally:
+                self.active.discard(name)
+
+    # Motor 2 is already resting on its retracted end stop
+    desk = _SimDesk(
+        mc,
+        {cfg.SENSOR_VL53_0: 5.0, cfg.SENSOR_VL53_1: 100.0},
+        {cfg.SENSOR_VL53_0: 0.0, cfg.SENSOR_VL53_1: 1.0},
+    )
+    sampler = _Sampler()
+    samples = []
+
+    def endstop_read(_sensors, name):
+        samples.append((name in sampler.active, desk.packets[-1]))
+        return desk.positions[name]
+
+    targets = {cfg.SENSOR_VL53_0: 0.0, cfg.SENSOR_VL53_1: 150.0}
+    with patch.object(mc, "_read_corrected", side_effect=desk.read), \
+            patch.object(mc, "get_sensor_value", side_effect=endstop_read), \
+            patch.object(mc.calibration, "observe_endstop", return_value=None):
+        results = mc.move_to_targets({cfg.SENSOR_SAMPLER: sampler}, targets, desk,
+                                     timeout=30)
+
+    assert results == {cfg.SENSOR_VL53_0: True, cfg.SENSOR_VL53_1: True}
+    assert mc.last_outcome(cfg.SENSOR_VL53_0).result == mc.ENDSTOP
+    assert len(samples) == cfg.OFFSET_ENDSTOP_SAMPLES
+    # Every motor is off, but the sampler still polls motor 2 at its active rate
+    assert samples == [(True, cfg.CMD_ALL_OFF)] * cfg.OFFSET_ENDSTOP_SAMPLES
+    assert sampler.active == set()
@@ -1,9 +1,12 @@
+import contextlib
 import importlib
 import sys
 import types
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
 
 class _SerialStub:
     def __init__(self):
@@ -22,9 +25,14 @@ def _load_motor_control():
         raise AssertionError("Test must patch motor_control.get_sensor_value explicitly.")
 
     fake_hardware = types.ModuleType("hardware")
+    # Real hardware.protocol (pure Python) stays importable
+    fake_hardware.__path__ = [str(src_dir / "hardware")]
     fake_hardware.get_sensor_value = _require_explicit_patch
+    fake_hardware.continuous_ranging = lambda *_: contextlib.nullcontext()
+    fake_hardware.set_timing_budget = lambda *_: False
     sys.modules["hardware"] = fake_hardware
 
+    sys.modules.pop("calibration", None)
     if "motor_control" in sys.modules:
         del sys.modules["motor_control"]
 
@@ -52,3 +60,159 @@ def test_retract_fully_stops_at_raw_minimum():
 
     assert result is True
     assert serial_stub.writes == [motor_control.config.CMD_ALL_OFF]
+
+
+class _StuckActuator:
+    """Raw reading that falls to `rest_mm` and then stays there."""
+
+    def __init__(self, start_mm, rest_mm, step_mm):
+        self.position = start_mm
+        self.rest_mm = rest_mm
+        self.step_mm = step_mm
+
+    def read(self, *_args):
+        value = self.position
+        self.position = max(self.rest_mm, self.position - self.step_mm)
+        return value
+
+
+def _fake_clock(monkeypatch, motor_control, step=0.1):
+    now = [0.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    monkeypatch.setattr(motor_control.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(motor_control.time, "sleep", sleep)
+    return now
+
+
+def test_retract_fully_detects_endstop_above_minimum(monkeypatch):
+    motor_control = _load_motor_control()
+    cfg = motor_control.config
+    now = _fake_clock(monkeypatch, motor_control)
+    serial_stub = _SerialStub()
+    # Resting distance of 45 mm: the raw reading never reaches MIN_POSITION
+    actuator = _StuckActuator(start_mm=80, rest_mm=45, step_mm=5)
+    observed = []
+
+    with patch.object(motor_control, "get_sensor_value", side_effect=actuator.read), \
+            patch.object(motor_control.calibration, "observe_endstop",
+                         side_effect=lambda name, readings: observed.append((name, readings))):
+        result = motor_control.retract_fully(
+            sensors={}, sensor_name=cfg.SENSOR_VL53_0, ser=serial_stub, timeout=30)
+
+    assert result is True
+    # Resting readings at the end stop feed the online offset estimate
+    assert observed == [(cfg.SENSOR_VL53_0, [45] * cfg.OFFSET_ENDSTOP_SAMPLES)]
+    assert serial_stub.writes[-1] == cfg.CMD_ALL_OFF
+    outcome = motor_control.last_outcome(cfg.SENSOR_VL53_0)
+    assert outcome.result == motor_control.ENDSTOP
+    assert outcome.position == 45
+    # Ended one stall window after reaching rest, not at the 30 s timeout
+    assert now[0] < 2.0
+
+
+def test_stall_mid_travel_aborts_move_to_distance(monkeypatch):
+    motor_control = _load_motor_control()
+    cfg = motor_control.config
+    monkeypatch.setattr(cfg, "CONTROL_PREDICTIVE_STOP", False)
+    now = _fake_clock(monkeypatch, motor_control)
+    serial_stub = _SerialStub()
+
+    # Corrected position never leaves 150 mm although M2 is driven down
+    with patch.object(motor_control, "_read_corrected", return_value=150.0):
+        result = motor_control.move_to_distance(
+            {}, cfg.SENSOR_VL53_0, 50, serial_stub, timeout=30)
+
+    assert result is False
+    outcome = motor_control.last_outcome(cfg.SENSOR_VL53_0)
+    assert outcome.result == motor_control.STALLED
+    assert now[0] < 2.0
+    assert serial_stub.writes[-1] == cfg.CMD_ALL_OFF
+
+
+def test_stall_detector_ignores_slow_but_steady_motion():
+    motor_control = _load_motor_control()
+    detector = motor_control.StallDetector(window=0.5, min_progress=2.0)
+    extend = motor_control.EXTEND
+
+    # 10 mm/s with ±1 mm of noise keeps moving
+    assert not any(detector.update(i * 0.05, i * 0.5 + (1 if i % 2 else -1), extend)
+                   for i in range(40))
+    # Plateau → stalled once a full window has no progress
+    stalled = [detector.update(2.0 + i * 0.05, 20.0, extend) for i in range(12)]
+    assert stalled[-1] and not stalled[0]
+    # OFF (coasting / PWM pulse) restarts the window
+    assert not detector.update(3.0, 20.0, motor_control.OFF)
+    assert not detector.update(3.05, 20.0, extend)
+
+
+def test_stall_detector_waits_for_a_delayed_start():
+    motor_control = _load_motor_control()
+    detector = motor_control.StallDetector(window=0.5, min_progress=2.0,
+                                           startup_lag=0.3)
+    retract = motor_control.RETRACT
+
+    # Actuator only starts moving 0.4 s after power-on, then at 20 mm/s
+    positions = [200.0 if i < 8 else 200.0 - (i - 8) for i in range(40)]
+    assert not any(detector.update(i * 0.05, p, retract)
+                   for i, p in enumerate(positions))
+
+    # Without the lag the idle start alone would count as a stall
+    eager = motor_control.StallDetector(window=0.5, min_progress=2.0, startup_lag=0.0)
+    assert any(eager.update(i * 0.05, p, retract) for i, p in enumerate(positions))
+
+    # A motor that never starts is still caught, after lag + window
+    detector.reset()
+    stalled = [detector.update(i * 0.05, 200.0, retract) for i in range(20)]
+    assert stalled.index(True) * 0.05 >= 0.8 - 1e-9
+
+
+def test_move_to_distance_learns_offset_at_retracted_endstop(monkeypatch):
+    motor_control = _load_motor_control()
+    cfg = motor_control.config
+    monkeypatch.setattr(cfg, "CONTROL_PREDICTIVE_STOP", False)
+    _fake_clock(monkeypatch, motor_control)
+    serial_stub = _SerialStub()
+    observed = []
+
+    # Target at the limit; the actuator rests on the stop a few mm above it
+    rest_mm = cfg.MIN_POSITION + 4
+    with patch.object(motor_control, "_read_corrected", return_value=rest_mm), \
+            patch.object(motor_control, "get_sensor_value", return_value=45), \
+            patch.object(motor_control.calibration, "observe_endstop",
+                         side_effect=lambda name, readings: observed.append((name, readings))):
+        result = motor_control.move_to_distance(
+            {}, cfg.SENSOR_VL53_0, cfg.MIN_POSITION, serial_stub, timeout=30)
+
+    assert result is True
+    assert motor_control.last_outcome(cfg.SENSOR_VL53_0).result == motor_control.ENDSTOP
+    assert observed == [(cfg.SENSOR_VL53_0, [45] * cfg.OFFSET_ENDSTOP_SAMPLES)]
+
+
+def test_sensor_error_mid_move_stops_the_motor(monkeypatch):
+    motor_control = _load_motor_control()
+    cfg = motor_control.config
+    monkeypatch.setattr(cfg, "CONTROL_PREDICTIVE_STOP", False)
+    _fake_clock(monkeypatch, motor_control)
+    monkeypatch.setattr(motor_control.motion_model, "_models", {})
+
+    def read(*_args):
+        value = next(readings, None)
+        if value is None:
+            raise TimeoutError("no sample from the sampler")
+        return value
+
+    for move in (
+        lambda ser: motor_control.move_to_distance({}, cfg.SENSOR_VL53_0, 50, ser, timeout=30),
+        lambda ser: motor_control.move_to_targets({}, {cfg.SENSOR_VL53_0: 50}, ser, timeout=30),
+    ):
+        readings = iter([150.0, 149.0])
+        serial_stub = _SerialStub()
+        with patch.object(motor_control, "_read_corrected", side_effect=read), \
+                pytest.raises(TimeoutError):
+            move(serial_stub)
+        # The retract command sent before the error is not left latched
+        assert any(w != cfg.CMD_ALL_OFF for w in serial_stub.writes)
+        assert serial_stub.writes[-1] == cfg.CMD_ALL_OFF
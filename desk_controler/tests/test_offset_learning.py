@@ -0,0 +1,80 @@
+"""
+Tests for the online VL53L0X offset re-estimation at the retracted end stop.
+"""
+
+import contextlib
+import importlib
+import json
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+
+def _load_calibration(monkeypatch, tmp_path, offsets):
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+
+    fake_hardware = types.ModuleType("hardware")
+    fake_hardware.get_sensor_value = lambda *_: pytest.fail("unexpected sensor read")
+    fake_hardware.continuous_ranging = lambda *_: contextlib.nullcontext()
+    monkeypatch.setitem(sys.modules, "hardware", fake_hardware)
+    sys.modules.pop("calibration", None)
+    calibration = importlib.import_module("calibration")
+    calibration_store = importlib.import_module("calibration_store")
+
+    monkeypatch.chdir(tmp_path)
+    store = calibration_store.CalibrationStore("calibration.json")
+    for sensor_name, offset_mm in offsets.items():
+        store.update(sensor_name, offset_mm, save=False)
+    monkeypatch.setattr(calibration_store, "_store", store)
+    monkeypatch.setattr(calibration.config, "OFFSET_CHANGE_LOG", "offsets.log")
+    return calibration, store
+
+
+def _log_entries(tmp_path):
+    return [json.loads(line) for line in (tmp_path / "offsets.log").read_text().splitlines()]
+
+
+def test_observation_moves_offset_by_bounded_ema_step(monkeypatch, tmp_path):
+    calibration, store = _load_calibration(monkeypatch, tmp_path, {"vl53l0x_0": -47.0})
+    cfg = calibration.config
+    monkeypatch.setattr(cfg, "OFFSET_LEARNING_RATE", 0.5)
+    monkeypatch.setattr(cfg, "OFFSET_MAX_STEP_MM", 2.0)
+
+    # Median 45 mm → observed offset -45 mm; half of the +2 mm gap applies
+    assert calibration.observe_endstop("vl53l0x_0", [44, 45, 45, 46, 45]) == -46.0
+    assert store.offsets() == {"vl53l0x_0": -46.0}
+    saved = json.loads((tmp_path / "calibration.json").read_text())
+    assert saved["sensors"]["vl53l0x_0"]["offset_mm"] == -46.0
+    assert saved["sensors"]["vl53l0x_0"]["source"] == "endstop"
+
+    # A larger drift is followed at most OFFSET_MAX_STEP_MM per observation
+    assert calibration.observe_endstop("vl53l0x_0", [36] * 5) == -44.0
+
+    entries = _log_entries(tmp_path)
+    assert [e["accepted"] for e in entries] == [True, True]
+    assert entries[0]["old_offset_mm"] == -47.0
+    assert entries[0]["observed_offset_mm"] == -45.0
+
+
+def test_outliers_and_unsettled_readings_are_rejected(monkeypatch, tmp_path):
+    calibration, store = _load_calibration(monkeypatch, tmp_path, {"vl53l0x_0": -47.0})
+
+    assert calibration.observe_endstop("vl53l0x_0", [120] * 5) is None
+    assert calibration.observe_endstop("vl53l0x_0", [40, 47, 60, 47, 47]) is None
+    assert calibration.observe_endstop("vl53l0x_0", [None, None]) is None
+
+    assert store.offsets() == {"vl53l0x_0": -47.0}
+    assert not (tmp_path / "calibration.json").exists()
+    assert [e["reason"] for e in _log_entries(tmp_path)] == [
+        "outlier", "unsettled", "no readings"]
+
+
+def test_uncalibrated_sensor_takes_first_observation(monkeypatch, tmp_path):
+    calibration, store = _load_calibration(monkeypatch, tmp_path, {"vl53l0x_0": -47.0})
+
+    assert calibration.observe_endstop("vl53l0x_1", [91, 92, 91]) == -91.0
+    assert store.offsets() == {"vl53l0x_0": -47.0, "vl53l0x_1": -91.0}
@@ -0,0 +1,91 @@
+"""
+Tests for the motor controller packet encoder/decoder in hardware.protocol.
+"""
+
+import importlib
+import importlib.util
+import itertools
+import sys
+from pathlib import Path
+
+import pytest
+
+
+def _load_protocol():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    # Load the module file directly so the driver imports in
+    # hardware/__init__.py are not needed.
+    spec = importlib.util.spec_from_file_location(
+        "_protocol_under_test", src_dir / "hardware" / "protocol.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_encode_matches_config_packets():
+    protocol = _load_protocol()
+    import config
+
+    assert protocol.ALL_OFF == config.CMD_ALL_OFF
+    assert protocol.encode({}) == config.CMD_ALL_OFF
+    assert protocol.encode({1: "extend"}) == config.CMD_M1_EXTEND
+    assert protocol.encode({1: "retract"}) == config.CMD_M1_RETRACT
+    assert protocol.encode({2: "extend"}) == config.CMD_M2_EXTEND
+    assert protocol.encode({2: "retract"}) == config.CMD_M2_RETRACT
+    assert protocol.encode({3: "extend"}) == config.CMD_M3_EXTEND
+    assert protocol.encode({3: "retract"}) == config.CMD_M3_RETRACT
+
+
+def test_round_trip_all_27_combinations():
+    protocol = _load_protocol()
+    seen = set()
+    for combo in itertools.product(("off", "extend", "retract"), repeat=3):
+        directions = dict(zip((1, 2, 3), combo))
+        packet = protocol.encode(directions)
+        protocol.validate(packet)
+        assert packet[2] == (packet[0] + packet[1]) & 0xFF
+        assert protocol.decode(packet) == directions
+        seen.add(packet)
+    assert len(seen) == 27
+
+
+def test_encoded_packets_are_cached():
+    protocol = _load_protocol()
+    assert protocol.encode({2: "extend", 3: "retract"}) is \
+        protocol.encode({3: "retract", 2: "extend"})
+    assert protocol.combine([protocol.encode({2: "extend"}),
+                             protocol.encode({3: "retract"})]) is \
+        protocol.encode({2: "extend", 3: "retract"})
+
+
+def test_combine_ors_bits_and_recomputes_checksum():
+    protocol = _load_protocol()
+    packet = protocol.combine([b"\x5a\x04\x5e", b"\x5a\x20\x7a", b"\x5a\x01\x5b"])
+    assert packet == bytes([0x5a, 0x25, (0x5a + 0x25) & 0xFF])
+    assert protocol.combine([]) == protocol.ALL_OFF
+
+
+@pytest.mark.parametrize("packet, message", [
+    (b"\x5a\x04", "3 bytes"),
+    (b"\x5b\x04\x5f", "header"),
+    (b"\x5a\x04\x00", "checksum"),
+    (b"\x5a\x40\x9a", "Unknown command bits"),
+    (b"\x5a\x03\x5d", "extend and retract"),
+])
+def test_decode_rejects_malformed_packets(packet, message):
+    protocol = _load_protocol()
+    with pytest.raises(protocol.PacketError, match=message):
+        protocol.decode(packet)
+
+
+def test_encode_and_combine_reject_invalid_requests():
+    protocol = _load_protocol()
+    with pytest.raises(protocol.PacketError):
+        protocol.encode({4: "extend"})
+    with pytest.raises(protocol.PacketError):
+        protocol.encode({1: "sideways"})
+    with pytest.raises(protocol.PacketError):
+        protocol.combine([protocol.encode({1: "extend"}), protocol.encode({1: "retract"})])
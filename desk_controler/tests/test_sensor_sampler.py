@@ -0,0 +1,226 @@
+"""
+Tests for the background SensorSampler and its cache integration with
+get_sensor_value().
+"""
+
+import importlib
+import sys
+import time
+import types
+from pathlib import Path
+
+
+_DRIVER_MODULES = (
+    "board", "busio", "serial",
+    "adafruit_tca9548a", "adafruit_vl53l0x", "adafruit_adxl34x",
+)
+
+
+def _load_hardware():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+
+    # Stub the Blinka / Adafruit driver modules so the real hardware package
+    # imports without I2C hardware.
+    for name in _DRIVER_MODULES:
+        sys.modules.setdefault(name, types.ModuleType(name))
+
+    # Other tests replace "hardware" with a flat stub module; drop it so the
+    # real package is imported.
+    for name in [m for m in sys.modules if m == "hardware" or m.startswith("hardware.")]:
+        del sys.modules[name]
+
+    return importlib.import_module("hardware")
+
+
+class _CountingSensor:
+    def __init__(self, start=100):
+        self.value = start
+        self.reads = 0
+
+    @property
+    def range(self):
+        self.reads += 1
+        self.value += 1
+        return self.value
+
+
+def _wait_for(predicate, timeout=2.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def test_sampler_caches_latest_value_and_serves_get_sensor_value():
+    hardware = _load_hardware()
+    config = importlib.import_module("config")
+
+    sensor = _CountingSensor()
+    sensors = {config.SENSOR_VL53_0: sensor}
+    # Long period: the sampler reads once immediately and then idles.
+    sampler = hardware.SensorSampler(sensors, periods={config.SENSOR_VL53_0: 10.0})
+    sensors[config.SENSOR_SAMPLER] = sampler
+    sampler.start()
+    try:
+        assert _wait_for(lambda: sampler.latest(config.SENSOR_VL53_0) is not None)
+
+        for _ in range(5):
+            assert hardware.get_sensor_value(sensors, config.SENSOR_VL53_0) == 101
+        assert sensor.reads == 1
+    finally:
+        sampler.stop()
+
+
+def test_sampler_ring_buffer_window_is_bounded_and_ordered():
+    hardware = _load_hardware()
+    config = importlib.import_module("config")
+
+    sensor = _CountingSensor()
+    sensors = {config.SENSOR_VL53_0: sensor}
+    sampler = hardware.SensorSampler(
+        sensors, periods={config.SENSOR_VL53_0: 0.001}, buffer_size=4
+    )
+    sampler.start()
+    try:
+        assert _wait_for(lambda: len(sampler.window(config.SENSOR_VL53_0, 10)) == 4)
+        values = sampler.window(config.SENSOR_VL53_0, 3)
+        assert len(values) == 3
+        assert values == sorted(values)
+    finally:
+        sampler.stop()
+
+
+def test_stopped_sampler_falls_back_to_direct_read():
+    hardware = _load_hardware()
+    config = importlib.import_module("config")
+
+    sensor = _CountingSensor(start=200)
+    sensors = {config.SENSOR_VL53_0: sensor}
+    sampler = hardware.SensorSampler(sensors, periods={config.SENSOR_VL53_0: 0.005})
+    sensors[config.SENSOR_SAMPLER] = sampler
+
+    # Never started: no cached sample is served.
+    assert sampler.latest(config.SENSOR_VL53_0) is None
+    assert hardware.get_sensor_value(sensors, config.SENSOR_VL53_0) == 201
+    assert sensor.reads == 1
+
+
+def test_stale_samples_are_ignored():
+    hardware = _load_hardware()
+    config = importlib.import_module("config")
+
+    sensors = {config.SENSOR_VL53_0: _CountingSensor()}
+    sampler = hardware.SensorSampler(
+        sensors, periods={config.SENSOR_VL53_0: 10.0}, max_age=0.05
+    )
+    sampler.start()
+    try:
+        assert _wait_for(lambda: sampler.latest(config.SENSOR_VL53_0) is not None)
+        time.sleep(0.1)
+        assert sampler.latest(config.SENSOR_VL53_0) is None
+        assert sampler.window(config.SENSOR_VL53_0, 3) == []
+    finally:
+        sampler.stop()
+
+
+def test_sampler_survives_read_errors():
+    hardware = _load_hardware()
+    config = importlib.import_module("config")
+
+    class _FlakySensor:
+        calls = 0
+
+        @property
+        def range(self):
+            _FlakySensor.calls += 1
+            if _FlakySensor.calls % 2:
+                raise OSError("bus glitch")
+            return 123
+
+    sensors = {config.SENSOR_VL53_0: _FlakySensor()}
+    sampler = hardware.SensorSampler(sensors, periods={config.SENSOR_VL53_0: 0.001})
+    sampler.start()
+    try:
+        assert _wait_for(lambda: sampler.latest(config.SENSOR_VL53_0) is not None)
+        assert sampler.latest(config.SENSOR_VL53_0).value == 123
+        assert sampler.running
+    finally:
+        sampler.stop()
+
+
+def test_prioritised_sensor_is_polled_at_active_rate():
+    hardware = _load_hardware()
+    config = importlib.import_module("config")
+
+    moving, idle = _CountingSensor(), _CountingSensor()
+    sensors = {config.SENSOR_VL53_0: moving, config.SENSOR_VL53_1: idle}
+    periods = {config.SENSOR_VL53_0: 0.001, config.SENSOR_VL53_1: 0.001}
+    sampler = hardware.SensorSampler(
+        sensors, periods=periods, max_age=10.0, idle_period=5.0,
+        active_periods={config.SENSOR_VL53_0: 0.002},
+    )
+    assert sampler.period(config.SENSOR_VL53_0) == 5.0
+    sampler.start()
+    try:
+        # Both at the background rate: one read each, then idle
+        assert _wait_for(lambda: moving.reads == 1 and idle.reads == 1)
+        time.sleep(0.05)
+        assert moving.reads == 1
+
+        # Raised as soon as the move starts, without waiting out the idle slot
+        with sampler.prioritised(config.SENSOR_VL53_0):
+            assert sampler.period(config.SENSOR_VL53_0) == 0.002
+            assert _wait_for(lambda: moving.reads >= 10, timeout=1.0)
+        assert idle.reads == 1
+
+        reads_after_move = moving.reads
+        time.sleep(0.05)
+        assert moving.reads <= reads_after_move + 1
+        assert sampler.period(config.SENSOR_VL53_0) == 5.0
+    finally:
+        sampler.stop()
+
+
+def test_priority_is_off_without_idle_period():
+    hardware = _load_hardware()
+    config = importlib.import_module("config")
+
+    sensors = {config.SENSOR_VL53_0: _CountingSensor()}
+    sampler = hardware.SensorSampler(sensors, periods={config.SENSOR_VL53_0: 0.04})
+    with sampler.prioritised(config.SENSOR_VL53_0):
+        assert sampler.period(config.SENSOR_VL53_0) == 0.04
+    assert sampler.period(config.SENSOR_VL53_0) == 0.04
+
+
+def test_stale_cache_waits_for_the_sampler_instead_of_reading_the_bus(monkeypatch):
+    hardware = _load_hardware()
+    config = importlib.import_module("config")
+    sensors_module = importlib.import_module("hardware.sensors")
+
+    sensor = _CountingSensor()
+    sensors = {config.SENSOR_VL53_0: sensor}
+    # Long period: without the request the next poll would be 10 s away
+    sampler = hardware.SensorSampler(
+        sensors, periods={config.SENSOR_VL53_0: 10.0}, max_age=0.05
+    )
+    sensors[config.SENSOR_SAMPLER] = sampler
+    sampler.start()
+    try:
+        assert _wait_for(lambda: sampler.latest(config.SENSOR_VL53_0) is not None)
+        time.sleep(0.1)
+        assert sampler.latest(config.SENSOR_VL53_0) is None
+
+        def _direct_read(*_args):
+            raise AssertionError("read the bus next to the sampler")
+
+        monkeypatch.setattr(sensors_module, "read_sensor", _direct_read)
+        started = time.monotonic()
+        assert hardware.get_sensor_value(sensors, config.SENSOR_VL53_0) == 102
+        assert time.monotonic() - started < 0.5
+        assert sensor.reads == 2
+    finally:
+        sampler.stop()
@@ -0,0 +1,134 @@
+"""
+Tests for the opt-in VL53L0X continuous-ranging mode in hardware.sensors.
+"""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+
+_DRIVER_MODULES = (
+    "board", "busio", "serial",
+    "adafruit_tca9548a", "adafruit_vl53l0x", "adafruit_adxl34x",
+)
+
+
+def _load_sensors():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+
+    for name in _DRIVER_MODULES:
+        sys.modules.setdefault(name, types.ModuleType(name))
+    for name in [m for m in sys.modules if m == "hardware" or m.startswith("hardware.")]:
+        del sys.modules[name]
+
+    return importlib.import_module("hardware.sensors")
+
+
+class _FakeVL53:
+    """Minimal stand-in for adafruit_vl53l0x.VL53L0X."""
+
+    def __init__(self, value=150):
+        self.value = value
+        self.is_continuous_mode = False
+        self.data_ready = False
+        self.range_reads = 0
+        self.starts = 0
+        self.stops = 0
+
+    @property
+    def range(self):
+        self.range_reads += 1
+        self.data_ready = False
+        return self.value
+
+    def start_continuous(self):
+        self.starts += 1
+        self.is_continuous_mode = True
+
+    def stop_continuous(self):
+        self.stops += 1
+        self.is_continuous_mode = False
+
+
+def test_single_shot_mode_reads_every_time():
+    sensors_mod = _load_sensors()
+    config = sensors_mod.config
+    sensor = _FakeVL53()
+    sensors = {config.SENSOR_VL53_0: sensor}
+
+    for _ in range(3):
+        assert sensors_mod.read_sensor(sensors, config.SENSOR_VL53_0) == 150
+    assert sensor.range_reads == 3
+
+
+def test_continuous_mode_returns_last_result_until_data_ready():
+    sensors_mod = _load_sensors()
+    config = sensors_mod.config
+    sensor = _FakeVL53()
+    sensor.start_continuous()
+    sensors = {config.SENSOR_VL53_0: sensor}
+
+    # First read blocks for a measurement (no cached value yet).
+    assert sensors_mod.read_sensor(sensors, config.SENSOR_VL53_0) == 150
+    assert sensor.range_reads == 1
+
+    # No new measurement completed: cached value, no blocking range read.
+    sensor.value = 160
+    assert sensors_mod.read_sensor(sensors, config.SENSOR_VL53_0) == 150
+    assert sensor.range_reads == 1
+
+    # New measurement completed: it is fetched.
+    sensor.data_ready = True
+    assert sensors_mod.read_sensor(sensors, config.SENSOR_VL53_0) == 160
+    assert sensor.range_reads == 2
+
+
+def test_continuous_ranging_context_only_active_in_moves_mode(monkeypatch):
+    sensors_mod = _load_sensors()
+    config = sensors_mod.config
+    sensor = _FakeVL53()
+    sensors = {config.SENSOR_VL53_0: sensor}
+
+    monkeypatch.setattr(config, "VL53_RANGING_MODE", "single")
+    with sensors_mod.continuous_ranging(sensors, config.SENSOR_VL53_0):
+        assert not sensor.is_continuous_mode
+    assert sensor.starts == 0
+
+    monkeypatch.setattr(config, "VL53_RANGING_MODE", "moves")
+    with sensors_mod.continuous_ranging(sensors, config.SENSOR_VL53_0):
+        assert sensor.is_continuous_mode
+    assert (sensor.starts, sensor.stops) == (1, 1)
+    assert not sensor.is_continuous_mode
+
+
+def test_continuous_ranging_context_leaves_running_sensor_alone(monkeypatch):
+    sensors_mod = _load_sensors()
+    config = sensors_mod.config
+    sensor = _FakeVL53()
+    sensor.start_continuous()
+    sensors = {config.SENSOR_VL53_0: sensor}
+
+    monkeypatch.setattr(config, "VL53_RANGING_MODE", "moves")
+    with sensors_mod.continuous_ranging(sensors, config.SENSOR_VL53_0):
+        pass
+    # Already continuous before the move, so it must stay that way.
+    assert sensor.is_continuous_mode
+    assert sensor.stops == 0
+
+
+def test_continuous_ranging_context_stops_on_exception(monkeypatch):
+    sensors_mod = _load_sensors()
+    config = sensors_mod.config
+    sensor = _FakeVL53()
+    sensors = {config.SENSOR_VL53_1: sensor}
+
+    monkeypatch.setattr(config, "VL53_RANGING_MODE", "moves")
+    try:
+        with sensors_mod.continuous_ranging(sensors, config.SENSOR_VL53_1):
+            raise InterruptedError("stop")
+    except InterruptedError:
+        pass
+    assert not sensor.is_continuous_mode
@@ -0,0 +1,226 @@
+"""
+Tests for the CommandSerial and SerialWriter layers in hardware.serial_comm.
+"""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+
+_DRIVER_MODULES = (
+    "board", "busio", "serial",
+    "adafruit_tca9548a", "adafruit_vl53l0x", "adafruit_adxl34x",
+)
+
+
+def _load_serial_comm():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+
+    for name in _DRIVER_MODULES:
+        sys.modules.setdefault(name, types.ModuleType(name))
+    for name in [m for m in sys.modules if m == "hardware" or m.startswith("hardware.")]:
+        del sys.modules[name]
+
+    return importlib.import_module("hardware.serial_comm")
+
+
+class _RecordingPort:
+    def __init__(self):
+        self.packets = []
+        self.name = "/dev/fake"
+
+    def write(self, data):
+        self.packets.append(data)
+        return len(data)
+
+
+def test_repeated_command_is_written_once():
+    serial_comm = _load_serial_comm()
+    cfg = serial_comm.config
+    port = _RecordingPort()
+    ser = serial_comm.CommandSerial(port, keepalive_interval=None)
+
+    for _ in range(20):
+        ser.write(cfg.CMD_M2_EXTEND)
+    ser.write(cfg.CMD_M2_RETRACT)
+    ser.write(cfg.CMD_M2_RETRACT)
+
+    assert port.packets == [cfg.CMD_M2_EXTEND, cfg.CMD_M2_RETRACT]
+    assert (ser.sent, ser.suppressed) == (2, 20)
+
+
+def test_all_off_is_never_suppressed():
+    serial_comm = _load_serial_comm()
+    cfg = serial_comm.config
+    port = _RecordingPort()
+    ser = serial_comm.CommandSerial(port, keepalive_interval=None)
+
+    for _ in range(3):
+        ser.write(cfg.CMD_ALL_OFF)
+    ser.write(cfg.CMD_M1_EXTEND)
+
+    assert port.packets == [cfg.CMD_ALL_OFF] * 3 + [cfg.CMD_M1_EXTEND]
+
+
+def test_keepalive_refreshes_unchanged_command(monkeypatch):
+    serial_comm = _load_serial_comm()
+    cfg = serial_comm.config
+    clock = [100.0]
+    monkeypatch.setattr(serial_comm.time, "monotonic", lambda: clock[0])
+    port = _RecordingPort()
+    ser = serial_comm.CommandSerial(port, keepalive_interval=0.5)
+
+    ser.write(cfg.CMD_M3_EXTEND)
+    clock[0] += 0.3
+    ser.write(cfg.CMD_M3_EXTEND)
+    clock[0] += 0.3
+    ser.write(cfg.CMD_M3_EXTEND)
+
+    assert port.packets == [cfg.CMD_M3_EXTEND, cfg.CMD_M3_EXTEND]
+
+
+def test_failed_write_does_not_suppress_retry():
+    serial_comm = _load_serial_comm()
+    cfg = serial_comm.config
+
+    class _FlakyPort(_RecordingPort):
+        fail = True
+
+        def write(self, data):
+            if self.fail:
+                self.fail = False
+                super().write(data)
+                raise OSError("line error")
+            return super().write(data)
+
+    port = _FlakyPort()
+    ser = serial_comm.CommandSerial(port, keepalive_interval=None)
+    with pytest.raises(OSError):
+        ser.write(cfg.CMD_M2_EXTEND)
+    ser.write(cfg.CMD_M2_EXTEND)
+
+    assert port.packets == [cfg.CMD_M2_EXTEND, cfg.CMD_M2_EXTEND]
+
+
+def test_other_attributes_are_forwarded():
+    serial_comm = _load_serial_comm()
+    ser = serial_comm.CommandSerial(_RecordingPort())
+    assert ser.name == "/dev/fake"
+
+
+class _SlowPort(_RecordingPort):
+    """Port whose writes take line time, like a 2400-baud UART."""
+
+    def __init__(self, delay=0.02):
+        super().__init__()
+        self.delay = delay
+        self.resets = 0
+
+    def write(self, data):
+        import time
+        time.sleep(self.delay)
+        return super().write(data)
+
+    def reset_output_buffer(self):
+        self.resets += 1
+
+
+def test_writer_returns_immediately_and_sends_in_order():
+    import time
+    serial_comm = _load_serial_comm()
+    cfg = serial_comm.config
+    port = _SlowPort()
+    writer = serial_comm.SerialWriter(port).start()
+
+    started = time.monotonic()
+    writer.write(cfg.CMD_M1_EXTEND)
+    writer.write(cfg.CMD_M2_EXTEND)
+    assert time.monotonic() - started < 0.02
+    writer.stop()
+
+    assert port.packets == [cfg.CMD_M1_EXTEND, cfg.CMD_M2_EXTEND]
+    assert not writer.running
+
+
+def test_stop_packet_jumps_queue_and_discards_pending_packets():
+    serial_comm = _load_serial_comm()
+    cfg = serial_comm.config
+    port = _SlowPort(delay=0.05)
+    writer = serial_comm.SerialWriter(port).start()
+
+    for _ in range(10):
+        writer.write(cfg.CMD_M2_EXTEND)
+    writer.write(cfg.CMD_ALL_OFF)
+    writer.write(cfg.CMD_M3_RETRACT)   # queued after the stop: still sent
+    writer.stop()
+
+    # At most the packet already in flight precedes the stop
+    assert cfg.CMD_ALL_OFF in port.packets[:2]
+    assert port.packets.count(cfg.CMD_M2_EXTEND) <= 1
+    assert port.packets[-1] == cfg.CMD_M3_RETRACT
+    # Never flushed: a partly sent packet would desync the board's framing
+    assert port.resets == 0
+
+    stats = writer.stop_latency_stats()
+    assert stats["count"] == 1
+    assert stats["max"] < 0.2
+
+
+def test_writer_behind_command_serial_closes_cleanly():
+    serial_comm = _load_serial_comm()
+    cfg = serial_comm.config
+    port = _SlowPort(delay=0.0)
+    closed = []
+    port.close = lambda: closed.append(True)
+    ser = serial_comm.CommandSerial(serial_comm.SerialWriter(port).start())
+
+    ser.write(cfg.CMD_M2_EXTEND)
+    ser.write(cfg.CMD_M2_EXTEND)
+    ser.write(cfg.CMD_ALL_OFF)
+    ser.close()
+
+    assert port.packets == [cfg.CMD_M2_EXTEND, cfg.CMD_ALL_OFF] or \
+        port.packets == [cfg.CMD_ALL_OFF]
+    assert closed == [True]
+
+
+def test_writer_failure_resets_command_serial_and_reaches_the_caller(capsys):
+    import threading
+    serial_comm = _load_serial_comm()
+    cfg = serial_comm.config
+    failed = threading.Event()
+
+    class _FlakyPort(_RecordingPort):
+        fail = True
+
+        def write(self, data):
+            if self.fail:
+                self.fail = False
+                failed.set()
+                raise OSError("line error")
+            return super().write(data)
+
+    port = _FlakyPort()
+    writer = serial_comm.SerialWriter(port).start()
+    ser = serial_comm.CommandSerial(writer, keepalive_interval=None)
+
+    ser.write(cfg.CMD_M2_EXTEND)
+    assert failed.wait(1.0)
+    writer.stop()
+    writer.start()
+
+    # Not suppressed as a repeat of the failed packet; the error is reported
+    with pytest.raises(OSError, match="line error"):
+        ser.write(cfg.CMD_M2_EXTEND)
+    ser.write(cfg.CMD_ALL_OFF)
+    writer.stop()
+
+    assert port.packets == [cfg.CMD_M2_EXTEND, cfg.CMD_ALL_OFF] or \
+        port.packets == [cfg.CMD_ALL_OFF]
+    assert writer.errors == 1
+    assert "Serial write failed: line error" in capsys.readouterr().out
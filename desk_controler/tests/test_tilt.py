@@ -0,0 +1,144 @@
+"""
+Tests for the calibrated 3-axis tilt engine (utils.tilt_degrees) and its use
+in hardware.sensors and calibration.
+"""
+
+import importlib
+import math
+import struct
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+
+_DRIVER_MODULES = (
+    "board", "busio", "serial",
+    "adafruit_tca9548a", "adafruit_vl53l0x", "adafruit_adxl34x",
+)
+
+# Typical 2-point result: ~256 counts/g with a few counts of zero-g offset
+_CAL = {"x": (1 / 255.0, 0.02), "y": (1 / 258.0, -0.01), "z": (1 / 250.0, 0.03)}
+
+
+def _src_on_path():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    return src_dir
+
+
+def _load_sensors():
+    _src_on_path()
+    for name in _DRIVER_MODULES:
+        sys.modules.setdefault(name, types.ModuleType(name))
+    for name in [m for m in sys.modules if m == "hardware" or m.startswith("hardware.")]:
+        del sys.modules[name]
+    return importlib.import_module("hardware.sensors")
+
+
+def _counts_at(angle_deg, cal):
+    """Raw counts a calibrated sensor reports at angle_deg (rotation about X)."""
+    theta = math.radians(180.0 - angle_deg)
+    g = {"x": 0.0, "y": math.sin(theta), "z": math.cos(theta)}
+    return tuple((g[a] - cal[a][1]) / cal[a][0] for a in ("x", "y", "z"))
+
+
+class _FakeChannel:
+    def __init__(self, counts):
+        self.data = struct.pack("<hhh", *counts)
+
+    def try_lock(self):
+        return True
+
+    def unlock(self):
+        pass
+
+    def writeto_then_readfrom(self, addr, out_buffer, in_buffer):
+        in_buffer[:] = self.data
+
+
+class _FakeADXL:
+    def __init__(self, counts):
+        self._i2c = types.SimpleNamespace(i2c=_FakeChannel(counts), device_address=0x53)
+
+
+def test_tilt_matches_z_axis_convention():
+    _src_on_path()
+    from utils import tilt_degrees, z_axis_to_degrees
+
+    assert tilt_degrees(0.0, 0.0, 9.81) == pytest.approx(180.0)
+    assert tilt_degrees(0.0, 0.0, -9.81) == pytest.approx(0.0)
+    assert tilt_degrees(0.0, 9.81, 0.0) == pytest.approx(90.0)
+    for angle in (1.0, 30.0, 75.0, 120.0, 179.0):
+        theta = math.radians(180.0 - angle)
+        z = 9.81 * math.cos(theta)
+        assert tilt_degrees(0.0, 9.81 * math.sin(theta), z) == pytest.approx(angle)
+        assert z_axis_to_degrees(z) == pytest.approx(angle)
+
+
+def test_calibration_is_applied_and_gain_error_ignored():
+    _src_on_path()
+    from utils import apply_calibration, tilt_degrees
+
+    counts = _counts_at(100.0, _CAL)
+    assert apply_calibration(*counts, _CAL) == pytest.approx(
+        (0.0, math.sin(math.radians(80.0)), math.cos(math.radians(80.0))))
+    assert tilt_degrees(*counts, cal=_CAL) == pytest.approx(100.0)
+    # Uncalibrated the offsets bias the angle; a common gain does not
+    assert tilt_degrees(*counts) != pytest.approx(100.0, abs=0.5)
+    assert tilt_degrees(0.0, 300.0, -52.9) == pytest.approx(
+        tilt_degrees(0.0, 3.0, -0.529))
+
+
+def test_batch_matches_per_sample(monkeypatch):
+    _src_on_path()
+    from utils import misc
+
+    samples = [_counts_at(angle, _CAL) for angle in (2.0, 45.0, 90.0, 135.5, 178.0)]
+    expected = [misc.tilt_degrees(*s, cal=_CAL) for s in samples]
+    assert list(misc.tilt_degrees_batch(samples, _CAL)) == pytest.approx(expected)
+
+    # Pure-Python fallback without NumPy
+    monkeypatch.setattr(misc, "_numpy", lambda: None)
+    assert misc.tilt_degrees_batch(samples, _CAL) == pytest.approx(expected)
+
+
+def _memory_store(monkeypatch):
+    calibration_store = importlib.import_module("calibration_store")
+    store = calibration_store.CalibrationStore(None)
+    monkeypatch.setattr(calibration_store, "_store", store)
+    return store
+
+
+def test_read_sensor_applies_stored_calibration(monkeypatch):
+    sensors = _load_sensors()
+    _memory_store(monkeypatch).update_axes(sensors.config.SENSOR_ADXL, _CAL)
+    name = sensors.config.SENSOR_ADXL
+
+    counts = tuple(round(c) for c in _counts_at(95.0, _CAL))
+    assert sensors.read_sensor({name: _FakeADXL(counts)}, name) == pytest.approx(95.0, abs=0.3)
+
+
+def test_save_adxl_calibration_uses_calibration_store(monkeypatch, tmp_path):
+    _src_on_path()
+    for name in _DRIVER_MODULES:
+        sys.modules.setdefault(name, types.ModuleType(name))
+    sys.modules.pop("calibration", None)
+    calibration = importlib.import_module("calibration")
+    calibration_store = importlib.import_module("calibration_store")
+    store = _memory_store(monkeypatch)
+    store.path = str(tmp_path / "calibration.json")
+    config_before = (Path(calibration.config.__file__)).read_text()
+
+    calibration.save_adxl_calibration(_CAL)
+
+    adxl = calibration.config.SENSOR_ADXL
+    assert store.entry(adxl).axes == pytest.approx(_CAL)
+    reloaded = calibration_store.CalibrationStore(store.path)
+    assert reloaded.load()
+    assert reloaded.entry(adxl).axes == pytest.approx(_CAL)
+    assert reloaded.entry(adxl).meta["source"] == "calibration"
+    # config.py is no longer rewritten
+    assert Path(calibration.config.__file__).read_text() == config_before
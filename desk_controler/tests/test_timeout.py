@@ -0,0 +1,176 @@
+"""
+Tests for the thread-safe, sub-second deadlines in utils.timeout and their
+use in hardware.sensors.
+"""
+
+import importlib
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+
+_DRIVER_MODULES = (
+    "board", "busio", "serial",
+    "adafruit_tca9548a", "adafruit_vl53l0x", "adafruit_adxl34x",
+)
+
+
+def _load_timeout():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    return importlib.import_module("utils.timeout")
+
+
+def _load_sensors():
+    _load_timeout()
+    for name in _DRIVER_MODULES:
+        sys.modules.setdefault(name, types.ModuleType(name))
+    for name in [m for m in sys.modules if m == "hardware" or m.startswith("hardware.")]:
+        del sys.modules[name]
+    return importlib.import_module("hardware.sensors")
+
+
+def test_call_with_timeout_returns_result_and_propagates_errors():
+    timeout_mod = _load_timeout()
+    assert timeout_mod.call_with_timeout(lambda: 42, 0.5) == 42
+    with pytest.raises(ValueError):
+        timeout_mod.call_with_timeout(lambda: int("x"), 0.5)
+
+
+def test_call_with_timeout_is_sub_second_from_a_worker_thread():
+    timeout_mod = _load_timeout()
+    result = {}
+
+    def worker():
+        started = time.monotonic()
+        try:
+            timeout_mod.call_with_timeout(lambda: time.sleep(1.0), 0.05, "hung")
+        except timeout_mod.TimeoutError as e:
+            result["error"] = str(e)
+        result["elapsed"] = time.monotonic() - started
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join(2.0)
+
+    assert result["error"] == "hung"
+    assert result["elapsed"] < 0.5
+
+
+def test_timeout_context_interrupts_main_thread_below_one_second():
+    timeout_mod = _load_timeout()
+    started = time.monotonic()
+    with pytest.raises(timeout_mod.TimeoutError):
+        with timeout_mod.timeout(0.1, "too slow"):
+            time.sleep(1.0)
+    assert time.monotonic() - started < 0.5
+
+
+def test_deadline_reports_remaining_and_expiry():
+    timeout_mod = _load_timeout()
+    deadline = timeout_mod.Deadline(0.05)
+    assert 0 < deadline.remaining <= 0.05
+    assert not deadline.expired
+    time.sleep(0.06)
+    assert deadline.expired
+    assert deadline.remaining == 0.0
+    with pytest.raises(timeout_mod.TimeoutError, match="late"):
+        deadline.check("late")
+
+
+def test_read_with_timeout_abandons_a_hung_read():
+    sensors_mod = _load_sensors()
+    started = time.monotonic()
+    with pytest.raises(sensors_mod.TimeoutError):
+        sensors_mod.read_with_timeout(lambda: time.sleep(1.0), "hung sensor",
+                                      timeout_seconds=0.1)
+    assert time.monotonic() - started < 0.5
+
+
+def test_read_with_timeout_retries_failed_reads_until_success():
+    sensors_mod = _load_sensors()
+    attempts = {"n": 0}
+
+    def flaky():
+        attempts["n"] += 1
+        if attempts["n"] < 3:
+            raise OSError("NACK")
+        return 123
+
+    assert sensors_mod.read_with_timeout(flaky, "flaky", timeout_seconds=0.5) == 123
+    assert attempts["n"] == 3
+
+
+def test_vl53_read_timeout_never_shorter_than_two_budgets(monkeypatch):
+    sensors_mod = _load_sensors()
+    config = sensors_mod.config
+    monkeypatch.setattr(config, "READ_TIMEOUT", 0.05)
+    monkeypatch.setattr(config, "VL53_TIMING_BUDGET", 200000)
+    assert sensors_mod._vl53_read_timeout() == pytest.approx(0.4)
+
+
+def test_nested_call_with_timeout_runs_inline_on_the_same_worker():
+    timeout_mod = _load_timeout()
+
+    def outer():
+        here = threading.current_thread()
+        inner = timeout_mod.call_with_timeout(threading.current_thread, 0.5)
+        return here, inner
+
+    here, inner = timeout_mod.call_with_timeout(outer, 0.5)
+    assert inner is here
+
+
+def test_abandoned_call_keeps_the_lock_until_it_returns():
+    timeout_mod = _load_timeout()
+    lock = threading.Lock()
+    release = threading.Event()
+    ran = []
+
+    with pytest.raises(timeout_mod.TimeoutError):
+        timeout_mod.call_with_timeout(lambda: release.wait(2.0), 0.05, lock=lock)
+    assert lock.locked()
+
+    # The next user of the device gives up without running
+    with pytest.raises(timeout_mod.TimeoutError):
+        timeout_mod.call_with_timeout(lambda: ran.append(1), 0.05, lock=lock)
+    assert ran == []
+
+    release.set()
+    assert timeout_mod.call_with_timeout(lambda: ran.append(1) or "ok", 1.0,
+                                         lock=lock) == "ok"
+    assert ran == [1]
+
+
+def test_set_timing_budget_skips_while_a_read_holds_the_sensor(monkeypatch, capsys):
+    sensors_mod = _load_sensors()
+    monkeypatch.setattr(sensors_mod, "_vl53_read_timeout", lambda sensor=None: 0.05)
+    sensor = types.SimpleNamespace(measurement_timing_budget=33000)
+    lock = sensors_mod._vl53_locks["vl53l0x_0"]
+    with lock:
+        assert sensors_mod.set_timing_budget({"vl53l0x_0": sensor}, "vl53l0x_0",
+                                             20000) is False
+    assert sensor.measurement_timing_budget == 33000
+    assert "sensor busy" in capsys.readouterr().out
+
+
+def test_timeout_context_refuses_other_threads():
+    timeout_mod = _load_timeout()
+    result = {}
+
+    def worker():
+        try:
+            with timeout_mod.timeout(0.1):
+                pass
+        except RuntimeError as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join(1.0)
+    assert isinstance(result.get("error"), RuntimeError)
@@ -0,0 +1,194 @@
+"""
+Tests for the burst VL53L0X range reader in hardware.sensors.
+"""
+
+import importlib
+import importlib.util
+import sys
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+
+_DRIVER_MODULES = (
+    "board", "busio", "serial",
+    "adafruit_tca9548a", "adafruit_vl53l0x", "adafruit_adxl34x",
+)
+
+
+def _load_sensors():
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+
+    for name in _DRIVER_MODULES:
+        sys.modules.setdefault(name, types.ModuleType(name))
+    for name in [m for m in sys.modules if m == "hardware" or m.startswith("hardware.")]:
+        del sys.modules[name]
+
+    return importlib.import_module("hardware.sensors")
+
+
+@pytest.fixture(autouse=True)
+def fast_read(monkeypatch):
+    """The burst reader is opt-in; these tests exercise it."""
+    sensors = _load_sensors()
+    monkeypatch.setattr(sensors.config, "VL53_FAST_READ", True)
+
+
+class _FakeChannel:
+    """Mux channel with one VL53L0X that finishes after `polls_until_ready` polls."""
+
+    def __init__(self, range_mm=412, polls_until_ready=1):
+        self.range_mm = range_mm
+        self.polls_until_ready = polls_until_ready
+        self.registers = {}
+        self.locks = 0
+        self.transactions = 0
+        self.measuring = False
+        self.polls = 0
+        self.interrupt = False
+
+    def try_lock(self):
+        self.locks += 1
+        return True
+
+    def unlock(self):
+        pass
+
+    def writeto(self, addr, buffer):
+        self.transactions += 1
+        register, value = buffer
+        self.registers[register] = value
+        if register == 0x00 and value == 0x01:
+            self.measuring = True
+            self.polls = 0
+        if register == 0x0B and value == 0x01:
+            self.interrupt = False
+
+    def writeto_then_readfrom(self, addr, out_buffer, in_buffer):
+        self.transactions += 1
+        assert out_buffer[0] == 0x13 and len(in_buffer) == 13
+        self.polls += 1
+        if self.measuring and self.polls >= self.polls_until_ready:
+            self.measuring = False
+            self.interrupt = True
+        in_buffer[:] = bytes(13)
+        if self.interrupt:
+            in_buffer[0] = 0x04
+            in_buffer[11] = self.range_mm >> 8
+            in_buffer[12] = self.range_mm & 0xFF
+
+
+class _FakeDriver:
+    """Initialized driver object as left by adafruit_vl53l0x.VL53L0X()."""
+
+    def __init__(self, channel, continuous=False):
+        self._device = types.SimpleNamespace(i2c=channel, device_address=0x29)
+        self._stop_variable = 0x3C
+        self._measurement_timing_budget_us = 1000
+        self._continuous_mode = continuous
+        self.range_property_reads = 0
+
+    @property
+    def is_continuous_mode(self):
+        return self._continuous_mode
+
+    @property
+    def range(self):
+        self.range_property_reads += 1
+        return -1
+
+
+def test_single_shot_read_uses_two_channel_selects():
+    sensors = _load_sensors()
+    channel = _FakeChannel(range_mm=412)
+    name = sensors.config.SENSOR_VL53_0
+
+    driver = _FakeDriver(channel)
+    value = sensors.read_sensor({name: driver}, name)
+
+    assert value == 412 and isinstance(value, int)
+    assert driver.range_property_reads == 0
+    # Start sequence under one lock; one burst poll + interrupt clear under another
+    assert channel.locks == 2
+    assert channel.transactions == 8 + 1 + 1
+    assert channel.registers[0x91] == 0x3C
+    assert not channel.interrupt
+
+
+def test_slow_measurement_is_polled_until_ready():
+    sensors = _load_sensors()
+    channel = _FakeChannel(range_mm=95, polls_until_ready=4)
+    name = sensors.config.SENSOR_VL53_1
+
+    assert sensors.read_sensor({name: _FakeDriver(channel)}, name) == 95
+    assert channel.polls == 4
+
+
+def test_continuous_mode_skips_start_and_returns_last_result():
+    sensors = _load_sensors()
+    channel = _FakeChannel(range_mm=300)
+    name = sensors.config.SENSOR_VL53_0
+    driver = _FakeDriver(channel, continuous=True)
+
+    channel.interrupt = True
+    assert sensors.read_sensor({name: driver}, name) == 300
+    assert 0x91 not in channel.registers
+
+    # No new measurement yet → previous result without waiting
+    channel.range_mm = 310
+    assert sensors.read_sensor({name: driver}, name) == 300
+
+
+def test_driver_path_is_used_when_fast_read_is_off(monkeypatch):
+    sensors = _load_sensors()
+    monkeypatch.setattr(sensors.config, "VL53_FAST_READ", False)
+    name = sensors.config.SENSOR_VL53_0
+
+    driver = _FakeDriver(_FakeChannel())
+    assert sensors._read_range(driver, name) == -1
+    assert driver.range_property_reads == 1
+
+
+class _TimedChannel(_FakeChannel):
+    """VL53L0X whose measurement completes `conversion_s` after it is started."""
+
+    def __init__(self, conversion_s, range_mm=150):
+        super().__init__(range_mm=range_mm)
+        self.conversion_s = conversion_s
+        self.started = None
+
+    def writeto(self, addr, buffer):
+        super().writeto(addr, buffer)
+        if buffer[0] == 0x00 and buffer[1] == 0x01:
+            self.started = time.monotonic()
+
+    def writeto_then_readfrom(self, addr, out_buffer, in_buffer):
+        ready = self.started is not None and time.monotonic() - self.started >= self.conversion_s
+        self.polls_until_ready = self.polls + 1 if ready else float("inf")
+        super().writeto_then_readfrom(addr, out_buffer, in_buffer)
+
+
+def test_precise_budget_read_is_not_cut_short_by_read_timeout():
+    sensors = _load_sensors()
+    budget = sensors.config.VL53_BUDGET_PRECISE
+    assert budget / 1_000_000 >= sensors.config.READ_TIMEOUT
+    name = sensors.config.SENSOR_VL53_0
+
+    # Conversion plus I2C overhead runs a few percent over the budget
+    channel = _TimedChannel(conversion_s=budget * 1.05 / 1_000_000)
+    driver = _FakeDriver(channel)
+    driver._measurement_timing_budget_us = budget
+
+    assert sensors.read_sensor({name: driver}, name) == 150
+
+
+def test_driver_path_is_the_default():
+    path = Path(__file__).resolve().parents[1] / "src" / "config.py"
+    spec = importlib.util.spec_from_file_location("_default_config", path)
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    assert config.VL53_FAST_READ is False
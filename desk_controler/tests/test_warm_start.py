@@ -0,0 +1,193 @@
+"""
+Tests for the warm-start hardware cache in hardware.warm_start.
+"""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+
+_DRIVER_MODULES = (
+    "board", "busio", "serial",
+    "adafruit_tca9548a", "adafruit_vl53l0x", "adafruit_adxl34x",
+)
+
+
+def _load_warm_start(monkeypatch):
+    src_dir = Path(__file__).resolve().parents[1] / "src"
+    if str(src_dir) not in sys.path:
+        sys.path.insert(0, str(src_dir))
+    for name in _DRIVER_MODULES:
+        sys.modules.setdefault(name, types.ModuleType(name))
+    for name in [m for m in sys.modules if m == "hardware" or m.startswith("hardware.")]:
+        del sys.modules[name]
+    ws = importlib.import_module("hardware.warm_start")
+
+    fake_vl53 = types.ModuleType("adafruit_vl53l0x")
+    fake_vl53.VL53L0X = _FakeVL53L0X
+    fake_vl53.i2c_device = types.SimpleNamespace(I2CDevice=_FakeI2CDevice)
+    fake_adxl = types.ModuleType("adafruit_adxl34x")
+    fake_adxl.ADXL345 = lambda bus: ("adxl", bus)
+    # Drivers are imported inside the warm_init_* functions
+    monkeypatch.setitem(sys.modules, "adafruit_vl53l0x", fake_vl53)
+    monkeypatch.setitem(sys.modules, "adafruit_adxl34x", fake_adxl)
+    return ws
+
+
+class _FakeChannel:
+    """One mux channel with devices {address: {register: value}}."""
+
+    def __init__(self, devices):
+        self.devices = devices
+
+    def try_lock(self):
+        return True
+
+    def unlock(self):
+        pass
+
+    def writeto_then_readfrom(self, addr, out_buffer, in_buffer):
+        if addr not in self.devices:
+            raise OSError(121, "Remote I/O error")
+        in_buffer[0] = self.devices[addr].get(out_buffer[0], 0)
+
+
+class _FakeI2CDevice:
+    def __init__(self, bus, address):
+        if address not in bus.devices:
+            raise ValueError(f"No I2C device at address: 0x{address:x}")
+        self.registers = bus.devices[address]
+
+
+class _FakeVL53L0X:
+    """Stands in for the driver; full __init__ must never run on warm start."""
+
+    def __init__(self, *_args, **_kwargs):
+        raise AssertionError("full driver init on the warm path")
+
+    def _read_u8(self, register):
+        return self._device.registers.get(register, 0)
+
+    @property
+    def measurement_timing_budget(self):
+        return self._measurement_timing_budget_us
+
+    @measurement_timing_budget.setter
+    def measurement_timing_budget(self, budget_us):
+        # The real driver writes the budget to the device
+        assert not getattr(self, "continuous", False), "budget written while ranging"
+        self.programmed_budget = budget_us
+        self._measurement_timing_budget_us = budget_us
+
+    def stop_continuous(self):
+        # Like the driver: ends with a single-shot measurement
+        self.continuous = False
+        self.measurement_pending = True
+
+    def read_range(self):
+        self.measurement_pending = False
+        return 0
+
+    def start_continuous(self):
+        self.continuous = True
+
+
+class _FakeSensor:
+    _stop_variable = 0x3C
+
+
+def _mux(vl53_sequence_config=0xE8):
+    vl53 = {0xC0: 0xEE, 0x01: vl53_sequence_config}
+    return {
+        0: _FakeChannel({0x29: dict(vl53)}),
+        1: _FakeChannel({0x29: dict(vl53)}),
+        2: _FakeChannel({0x53: {0x00: 0xE5}}),
+    }
+
+
+def _saved_cache(ws, tmp_path):
+    cfg = ws.config
+    path = str(tmp_path / "cache.json")
+    sensors = {cfg.SENSOR_VL53_0: _FakeSensor(), cfg.SENSOR_VL53_1: _FakeSensor(),
+               cfg.SENSOR_ADXL: object()}
+    assert ws.save_hardware_cache(sensors, {1: 92.5, 2: 410.0, 3: None}, path=path)
+    return ws.load_hardware_cache(path), path
+
+
+def test_cache_round_trip_restores_vl53_without_full_init(monkeypatch, tmp_path):
+    ws = _load_warm_start(monkeypatch)
+    cfg = ws.config
+    cache, _ = _saved_cache(ws, tmp_path)
+
+    sensor = ws.warm_init_vl53l0x(_mux(), cfg.VL53_CHANNEL_0, "VL53L0X #0",
+                                  cfg.SENSOR_VL53_0, cache)
+    assert sensor is not None
+    assert sensor._stop_variable == 0x3C
+    assert sensor._measurement_timing_budget_us == cfg.VL53_TIMING_BUDGET
+    # Programmed on the device, in case a previous run left an adaptive budget
+    assert sensor.programmed_budget == cfg.VL53_TIMING_BUDGET
+    assert sensor.continuous is (cfg.VL53_RANGING_MODE == "continuous")
+    # Built through a driver subclass; no measurement left unread
+    assert isinstance(sensor, _FakeVL53L0X)
+    assert sensor.measurement_pending is False
+
+    assert ws.warm_init_adxl345(_mux(), cache) is not None
+    assert ws.cached_motor_positions(cache) == {1: 92.5, 2: 410.0}
+
+
+def test_power_cycled_or_missing_sensor_falls_back(monkeypatch, tmp_path):
+    ws = _load_warm_start(monkeypatch)
+    cfg = ws.config
+    cache, _ = _saved_cache(ws, tmp_path)
+
+    # Sequence config back at its power-on default → driver state is stale
+    assert ws.warm_init_vl53l0x(_mux(vl53_sequence_config=0xFF), cfg.VL53_CHANNEL_0,
+                                "VL53L0X #0", cfg.SENSOR_VL53_0, cache) is None
+    empty = {ch: _FakeChannel({}) for ch in range(3)}
+    assert ws.warm_init_vl53l0x(empty, cfg.VL53_CHANNEL_0, "VL53L0X #0",
+                                cfg.SENSOR_VL53_0, cache) is None
+    assert ws.warm_init_adxl345(empty, cache) is None
+
+
+def test_topology_or_tuning_change_invalidates_cache(monkeypatch, tmp_path):
+    ws = _load_warm_start(monkeypatch)
+    cfg = ws.config
+    cache, _ = _saved_cache(ws, tmp_path)
+
+    monkeypatch.setattr(cfg, "VL53_CHANNEL_0", 3)
+    assert ws.warm_init_vl53l0x(_mux(), cfg.VL53_CHANNEL_0, "VL53L0X #0",
+                                cfg.SENSOR_VL53_0, cache) is None
+    monkeypatch.setattr(cfg, "VL53_TIMING_BUDGET", 20000)
+    assert ws.warm_init_vl53l0x(_mux(), cfg.VL53_CHANNEL_1, "VL53L0X #1",
+                                cfg.SENSOR_VL53_1, cache) is None
+    assert ws.warm_init_vl53l0x(_mux(), cfg.VL53_CHANNEL_1, "VL53L0X #1",
+                                cfg.SENSOR_VL53_1, None) is None
+
+
+def test_motor_positions_update_and_bad_cache_files(monkeypatch, tmp_path):
+    ws = _load_warm_start(monkeypatch)
+    _, path = _saved_cache(ws, tmp_path)
+
+    assert ws.save_motor_positions({1: 80.0, 2: None, 3: 300.0}, path=path)
+    assert ws.cached_motor_positions(ws.load_hardware_cache(path)) == {1: 80.0, 3: 300.0}
+
+    (tmp_path / "bad.json").write_text("{not json")
+    assert ws.load_hardware_cache(str(tmp_path / "bad.json")) is None
+    (tmp_path / "old.json").write_text('{"version": 0}')
+    assert ws.load_hardware_cache(str(tmp_path / "old.json")) is None
+    assert ws.load_hardware_cache(str(tmp_path / "missing.json")) is None
+    assert not ws.save_motor_positions({1: 1.0}, path=str(tmp_path / "missing.json"))
+
+
+def test_default_cache_path_follows_config_not_cwd(monkeypatch, tmp_path):
+    ws = _load_warm_start(monkeypatch)
+    cfg = ws.config
+    assert cfg.HARDWARE_CACHE_FILE == str(Path(cfg.DATA_DIR) / "hardware_cache.json")
+
+    path = tmp_path / "cache.json"
+    monkeypatch.setattr(cfg, "HARDWARE_CACHE_FILE", str(path))
+    monkeypatch.chdir(tmp_path.parent)
+    assert ws.save_hardware_cache({}, {1: 90.0})
+    assert ws.save_motor_positions({1: 91.0})
+    assert ws.cached_motor_positions(ws.load_hardware_cache()) == {1: 91.0}